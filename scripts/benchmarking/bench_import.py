@@ -0,0 +1,75 @@
+'''
+Measure cold `import vietnamadminunits` and the first call of each mode, each in a fresh process.
+Exit with code 1 if the median cold import is slower than the threshold, so it can guard against regressions.
+
+Run from the repository root:
+    python scripts/benchmarking/bench_import.py [--repeat 7] [--threshold-ms 100]
+'''
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+CASES = {
+    'import vietnamadminunits': (
+        '',
+        'import vietnamadminunits',
+    ),
+    'first parse FROM_2025 level 1': (
+        'from vietnamadminunits import parse_address',
+        "parse_address('tan son, hcm', mode='FROM_2025', level=1)",
+    ),
+    'first parse FROM_2025 level 2': (
+        'from vietnamadminunits import parse_address',
+        "parse_address('70 nguyễn sỹ sách, tan son, hcm', mode='FROM_2025', level=2)",
+    ),
+    'first parse LEGACY level 3': (
+        'from vietnamadminunits import parse_address',
+        "parse_address('đường 15, long bình, quận 9, hcm', mode='LEGACY', level=3)",
+    ),
+    'first convert CONVERT_2025': (
+        'from vietnamadminunits import convert_address',
+        "convert_address('p15, tan binh, hcm')",
+    ),
+}
+
+
+def measure(setup: str, statement: str):
+    code = (
+        'import time\n'
+        f'{setup}\n'
+        't = time.perf_counter()\n'
+        f'{statement}\n'
+        'print(time.perf_counter() - t)\n'
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, check=True, capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--threshold-ms', type=float, default=100)
+    args = parser.parse_args()
+
+    print(f"{'Case':<32} | {'Median (ms)':>11} | {'Min (ms)':>9} | {'Max (ms)':>9}")
+    print('-' * 70)
+    medians = {}
+    for name, (setup, statement) in CASES.items():
+        timings = [measure(setup, statement) for _ in range(args.repeat)]
+        medians[name] = statistics.median(timings)
+        print(f'{name:<32} | {medians[name]:>11.1f} | {min(timings):>9.1f} | {max(timings):>9.1f}')
+
+    import_ms = medians['import vietnamadminunits']
+    if import_ms > args.threshold_ms:
+        print(f'\nFAILED: cold import {import_ms:.1f} ms > {args.threshold_ms:.0f} ms')
+        sys.exit(1)
+    print(f'\nOK: cold import {import_ms:.1f} ms <= {args.threshold_ms:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Compare the regex alternation used before with KeywordMatcher on the packaged test datasets.
+
+Run from the repository root:
+    python scripts/benchmarking/bench_matcher.py
+'''
+import csv
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from vietnamadminunits.parser import parser_from_2025, parser_legacy
+from vietnamadminunits.parser.matcher import KeywordMatcher
+from vietnamadminunits.parser.patterns import collect_keywords
+from vietnamadminunits.parser.utils import key_normalize, unicode_normalize
+
+
+INPUT_DIR = ROOT_DIR / 'scripts/testing_package/data/input'
+
+
+def compile_regex(keywords):
+    # Cách cũ: một alternation, từ khóa dài nhất trước
+    keywords = sorted(keywords, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(k) for k in keywords), flags=re.IGNORECASE)
+
+
+def find_last_regex(pattern, text):
+    return next((m.group() for m in reversed(list(pattern.finditer(text)))), None)
+
+
+def load_address_keys():
+    address_keys = []
+    for path in sorted(INPUT_DIR.glob('*.csv')):
+        with open(path, 'r') as f:
+            for row in csv.DictReader(f):
+                address = unicode_normalize(', '.join(v for v in [row['ward'], row['district'], row['province']] if v))
+                address_keys.append(key_normalize(address, keep=[',']))
+    return address_keys
+
+
+def bench(name, keywords, address_keys):
+    pattern = compile_regex(keywords)
+    matcher = KeywordMatcher(keywords)
+
+    start = time.perf_counter()
+    regex_results = [find_last_regex(pattern, k) for k in address_keys]
+    regex_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher_results = [matcher.find_last(k) for k in address_keys]
+    matcher_seconds = time.perf_counter() - start
+
+    assert regex_results == matcher_results, f'{name}: results are different'
+    print(f'{name:<44} | {len(keywords):>8} | {regex_seconds:>9.3f} | {matcher_seconds:>9.3f} | {regex_seconds / matcher_seconds:>7.1f}x')
+
+
+def main():
+    address_keys = load_address_keys()
+    print(f'{len(address_keys)} addresses from {INPUT_DIR.relative_to(ROOT_DIR)}/*.csv\n')
+    print(f"{'Tier':<44} | {'Keywords':>8} | {'Regex (s)':>9} | {'AC (s)':>9} | {'Speedup':>8}")
+    print('-' * 90)
+
+    bench('FROM_2025 province', collect_keywords(parser_from_2025.DICT_PROVINCE, 'provinceKeywords'), address_keys)
+    bench('FROM_2025 unique ward (no accented)', collect_keywords(parser_from_2025.DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED, 'wardKeywords'), address_keys)
+    bench('FROM_2025 ward of Hà Nội (no accented)', collect_keywords(parser_from_2025.DICT_PROVINCE_WARD_NO_ACCENTED['thanhphohanoi'], 'wardKeywords'), address_keys)
+    bench('LEGACY province', collect_keywords(parser_legacy.DICT_PROVINCE, 'provinceKeywords'), address_keys)
+    bench('LEGACY unique district', collect_keywords(parser_legacy.DICT_UNIQUE_DISTRICT_PROVINCE, 'districtKeywords'), address_keys)
+    bench('LEGACY district of Hồ Chí Minh', collect_keywords(parser_legacy.DICT_PROVINCE_DISTRICT['thanhphohochiminh'], 'districtKeywords'), address_keys)
+    bench('LEGACY ward of Quận Ba Đình (no accented)', collect_keywords(parser_legacy.DICT_PROVINCE_DISTRICT_WARD_NO_ACCENTED['thanhphohanoi']['quanbadinh'], 'wardKeywords'), address_keys)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+'''
+Compare `unicode_normalize()` + `key_normalize()` used before with the single-pass `normalize_address()` on the packaged test datasets.
+Outputs must be identical, the script fails otherwise.
+
+Run from the repository root:
+    python scripts/benchmarking/bench_normalizer.py
+'''
+import csv
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from vietnamadminunits.parser.normalizer import normalize_address, normalize_text, normalize_token
+from vietnamadminunits.parser.utils import key_normalize, unicode_normalize
+
+
+INPUT_DIR = ROOT_DIR / 'scripts/testing_package/data/input'
+
+# Các trường hợp khó: dấu tổ hợp, quote đặc biệt, dash, khoảng trắng lạ, ký tự ngoài tiếng Việt
+EDGE_CASES = [
+    '',
+    '   ',
+    None,
+    float('nan'),
+    unicodedata.normalize('NFD', 'Phường Tân Sơn Nhì, Quận Tân Phú, Hồ Chí Minh'),
+    'Xã Ea H’ Đinh,  huyện Cư M’gar -Đắk Lắk',
+    'Thôn “Đồng Tâm”\t\txã Hoà Bình\n Thuỷ Nguyên , Hải Phòng ',
+    "Buôn Ea ' Kly-xã Ea' Kênh",
+    '12/3A Ngõ 45-47 đường Láng　Đống Đa',
+    'ΑΣ ΒΣ, Phố İstanbul ½ № 5 – Ⅻ',
+    '-,-,-',
+    "' a '",
+]
+
+
+def normalize_address_before(address):
+    address = unicode_normalize(address)
+    return address, key_normalize(address, keep=[',']), key_normalize(address, keep=[','], decode=False)
+
+
+def load_addresses():
+    addresses = []
+    for path in sorted(INPUT_DIR.glob('*.csv')):
+        with open(path, 'r') as f:
+            for row in csv.DictReader(f):
+                values = [row['ward'], row['district'], row['province']]
+                addresses.append(', '.join(v for v in values if v))
+                addresses.append(' '.join(v.lower() for v in values if v)) # Không dấu phẩy, chữ thường
+    return addresses
+
+
+def assert_same(addresses):
+    for address in addresses:
+        before = normalize_address_before(address)
+        after = normalize_address(address)
+        assert repr(before) == repr(after), f'{address!r}: {before!r} != {after!r}'
+        assert repr(unicode_normalize(address)) == repr(normalize_text(address)), f'{address!r}: normalize_text is different'
+
+
+def bench(name, function, addresses):
+    start = time.perf_counter()
+    for address in addresses:
+        function(address)
+    return time.perf_counter() - start
+
+
+def main():
+    addresses = load_addresses()
+    assert_same(addresses + EDGE_CASES)
+    print(f'{len(addresses)} addresses from {INPUT_DIR.relative_to(ROOT_DIR)}/*.csv and {len(EDGE_CASES)} edge cases: outputs are identical\n')
+
+    print(f"{'Function':<22} | {'Before (s)':>10} | {'After (s)':>10} | {'Speedup':>8}")
+    print('-' * 60)
+    normalize_token.cache_clear()
+    before = bench('normalize_address', normalize_address_before, addresses)
+    after = bench('normalize_address', normalize_address, addresses)
+    print(f"{'normalize_address':<22} | {before:>10.3f} | {after:>10.3f} | {before / after:>7.1f}x")
+
+    before = bench('normalize_text', unicode_normalize, addresses)
+    after = bench('normalize_text', normalize_text, addresses)
+    print(f"{'normalize_text':<22} | {before:>10.3f} | {after:>10.3f} | {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+'''
+Benchmark suite over the packaged test datasets, results are saved as JSON so runs can be compared.
+
+- Throughput of `parse_address()` (cache disabled) and `parse_addresses()` for each input file, mode and level, and of the converter.
+- Cold import and first call of each mode, memory footprint after loading each mode, each in a fresh process.
+- Latency of worst-case long addresses, and per-province latency percentiles for Hà Nội and TP.HCM.
+
+Run from the repository root:
+    python scripts/benchmarking/bench_suite.py [--repeat 3] [--limit 5000] [--output results.json]
+    python scripts/benchmarking/bench_suite.py --compare scripts/benchmarking/results/<previous>.json [--tolerance 0.1] [--fail-on-regression]
+'''
+import argparse
+import csv
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench_import import CASES as IMPORT_CASES, measure as measure_import
+
+
+INPUT_DIR = ROOT_DIR / 'scripts/testing_package/data/input'
+RESULTS_DIR = Path(__file__).parent / 'results'
+DATASETS = ['s_legacy_2020-2025.csv', 't_legacy_2023-2025.csv']
+
+# (mode, level, columns of the address)
+PARSE_CASES = [
+    ('LEGACY', 1, ['province']),
+    ('LEGACY', 2, ['district', 'province']),
+    ('LEGACY', 3, ['ward', 'district', 'province']),
+    ('FROM_2025', 1, ['province']),
+    ('FROM_2025', 2, ['ward', 'province']),
+]
+
+PROVINCES = {
+    'Hà Nội': 'hanoi',
+    'TP.HCM': 'hochiminh',
+}
+
+LONG_PREFIX = 'Số 12A/34B Ngõ 56 Ngách 78 Hẻm 90 Tổ 5 Khu phố 3 Đường Nguyễn Văn Cừ nối dài, '
+
+MEMORY_CODE = '''
+import resource, sys
+def rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+before = rss_mb()
+{statement}
+print(rss_mb() - before)
+'''
+
+MEMORY_CASES = {
+    'FROM_2025': "from vietnamadminunits.parser import warmup; warmup('FROM_2025')",
+    'LEGACY': "from vietnamadminunits.parser import warmup; warmup('LEGACY')",
+    'CONVERT_2025': "from vietnamadminunits import convert_address; from vietnamadminunits.parser import warmup; warmup(); convert_address('p15, tan binh, hcm')",
+}
+
+
+def load_rows(name: str, limit: int=None):
+    with open(INPUT_DIR / name, 'r') as f:
+        rows = list(csv.DictReader(f))
+    return rows[:limit] if limit else rows
+
+
+def join_columns(row: dict, columns: list):
+    return ', '.join(row[c] for c in columns if row[c])
+
+
+def best_of(function, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def percentile(values: list, p: float):
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def bench_throughput(results: dict, repeat: int, limit: int):
+    from vietnamadminunits import parse_address, parse_addresses, convert_address, convert_addresses, cache_resize, cache_clear
+    from vietnamadminunits.cache import DEFAULT_MAXSIZE
+
+    cache_resize(0) # Đo parse thật, không đo cache
+    try:
+        for dataset in DATASETS:
+            rows = load_rows(dataset, limit)
+            name = dataset.split('_')[0]
+
+            for mode, level, columns in PARSE_CASES:
+                addresses = [join_columns(row, columns) for row in rows]
+                parse_address(addresses[0], mode=mode, level=level) # Load data trước khi đo
+                seconds = best_of(lambda: [parse_address(a, mode=mode, level=level) for a in addresses], repeat)
+                add_result(results, f'parse_address {name} {mode} level {level}', len(addresses) / seconds, 'addresses/s', 'higher')
+                seconds = best_of(lambda: parse_addresses(addresses, mode=mode, level=level), repeat)
+                add_result(results, f'parse_addresses {name} {mode} level {level}', len(addresses) / seconds, 'addresses/s', 'higher')
+
+            addresses = [join_columns(row, ['ward', 'district', 'province']) for row in rows]
+            convert_address(addresses[0])
+            seconds = best_of(lambda: [convert_address(a) for a in addresses], repeat)
+            add_result(results, f'convert_address {name} CONVERT_2025', len(addresses) / seconds, 'addresses/s', 'higher')
+            seconds = best_of(lambda: convert_addresses(addresses), repeat)
+            add_result(results, f'convert_addresses {name} CONVERT_2025', len(addresses) / seconds, 'addresses/s', 'higher')
+    finally:
+        cache_clear()
+        cache_resize(DEFAULT_MAXSIZE)
+
+
+def bench_latency(results: dict, repeat: int):
+    from vietnamadminunits import parse_address, convert_address, cache_resize, cache_clear
+    from vietnamadminunits.cache import DEFAULT_MAXSIZE
+    from vietnamadminunits.parser.utils import key_normalize
+
+    def latencies(function, addresses):
+        timings = []
+        for address in addresses:
+            timing = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                function(address)
+                timing.append(time.perf_counter() - start)
+            timings.append(min(timing) * 1e6)
+        return timings
+
+    cache_resize(0)
+    try:
+        # Địa chỉ dài: tiền tố số nhà/ngõ/hẻm lặp lại, có street
+        rows = load_rows(DATASETS[0], 200)
+        for n_prefixes in [1, 5, 20]:
+            addresses = [LONG_PREFIX * n_prefixes + join_columns(row, ['ward', 'district', 'province']) for row in rows]
+            timings = latencies(lambda a: parse_address(a, mode='LEGACY', level=3), addresses)
+            add_result(results, f'long address LEGACY level 3 ({len(addresses[0])} chars) p50', statistics.median(timings), 'us', 'lower')
+            timings = latencies(lambda a: parse_address(a, mode='FROM_2025', level=2), addresses)
+            add_result(results, f'long address FROM_2025 level 2 ({len(addresses[0])} chars) p50', statistics.median(timings), 'us', 'lower')
+
+        # Tỉnh lớn, nhiều ward nên pattern lớn nhất
+        rows = [row for dataset in DATASETS for row in load_rows(dataset)]
+        for province, province_key in PROVINCES.items():
+            addresses = [join_columns(row, ['ward', 'district', 'province']) for row in rows if province_key in key_normalize(row['province'] or '')][:1000]
+            for label, function in [
+                ('LEGACY level 3', lambda a: parse_address(a, mode='LEGACY', level=3)),
+                ('FROM_2025 level 2', lambda a: parse_address(a, mode='FROM_2025', level=2)),
+                ('CONVERT_2025', lambda a: convert_address(a)),
+            ]:
+                timings = latencies(function, addresses)
+                add_result(results, f'{province} {label} p50', statistics.median(timings), 'us', 'lower')
+                add_result(results, f'{province} {label} p95', percentile(timings, 0.95), 'us', 'lower')
+    finally:
+        cache_clear()
+        cache_resize(DEFAULT_MAXSIZE)
+
+
+def bench_cold(results: dict, repeat: int):
+    for name, (setup, statement) in IMPORT_CASES.items():
+        add_result(results, f'cold {name}', statistics.median(measure_import(setup, statement) for _ in range(repeat)), 'ms', 'lower')
+
+    try:
+        import resource # noqa: F401, Unix only
+    except ImportError:
+        return
+    for mode, statement in MEMORY_CASES.items():
+        code = MEMORY_CODE.format(statement=statement)
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, check=True, capture_output=True, text=True).stdout
+        add_result(results, f'memory after loading {mode}', float(output.strip().splitlines()[-1]), 'MB', 'lower')
+
+
+def add_result(results: dict, name: str, value: float, unit: str, better: str):
+    results[name] = {'value': value, 'unit': unit, 'better': better}
+    print(f'{name:<58} | {value:>12,.1f} {unit}', flush=True)
+
+
+def get_meta():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+
+
+def compare(results: dict, base_path: str, tolerance: float):
+    '''
+    :return: Names of the benchmarks that regressed by more than tolerance.
+    '''
+    with open(base_path, 'r') as f:
+        base = json.load(f)
+
+    print(f"\nCompared with {base_path} ({base['meta']['commit']}, {base['meta']['timestamp']})")
+    print(f"{'Benchmark':<58} | {'Before':>12} | {'After':>12} | {'Change':>8}")
+    print('-' * 100)
+    regressions = []
+    for name, result in results.items():
+        if name not in base['results']:
+            continue
+        before, after = base['results'][name]['value'], result['value']
+        change = (after - before) / before if before else 0
+        worse = change < -tolerance if result['better'] == 'higher' else change > tolerance
+        if worse:
+            regressions.append(name)
+        print(f"{name:<58} | {before:>12,.1f} | {after:>12,.1f} | {change:>+7.1%}{'  REGRESSION' if worse else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Repeats of each measurement, the best is kept.')
+    parser.add_argument('--limit', type=int, help='Rows per input file for throughput. Default all rows.')
+    parser.add_argument('--skip', nargs='*', default=[], choices=['throughput', 'latency', 'cold'], help='Groups to skip.')
+    parser.add_argument('--output', help=f'Result file. Default {RESULTS_DIR.relative_to(ROOT_DIR)}/<timestamp>-<commit>.json.')
+    parser.add_argument('--compare', help='Previous result file to compare with.')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Relative change counted as a regression. Default 0.1.')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with code 1 if a benchmark regressed.')
+    args = parser.parse_args()
+
+    results = {}
+    if 'cold' not in args.skip:
+        bench_cold(results, args.repeat)
+    if 'throughput' not in args.skip:
+        bench_throughput(results, args.repeat, args.limit)
+    if 'latency' not in args.skip:
+        bench_latency(results, args.repeat)
+
+    meta = get_meta()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{meta['timestamp'].replace(':', '').replace('-', '')}-{meta['commit'] or 'nocommit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'meta': meta, 'args': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f'\nSaved to {output}')
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions and args.fail_on_regression:
+            print(f'\nFAILED: {len(regressions)} regression(s)')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+'''
+Build binary snapshots `vietnamadminunits/data/*.pickle` from the JSON files generated by s7, s8, s9 and s11,
+and the spatial indexes of `locate()` derived from the parser JSON files.
+
+A snapshot keeps the data, the reverse indexes and the compiled patterns, with the checksum of its JSON source and the version of its build function.
+Run this script before packaging to ship fresh snapshots. Snapshots in the package are only read, a missing or stale one is rebuilt on first use
+into the user cache directory (`$XDG_CACHE_HOME/vietnamadminunits`), never into the installed package.
+
+Run from the repository root:
+    python scripts/generating_module_data/s10_building_snapshot.py
+'''
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from vietnamadminunits.snapshot import DATA_DIR, load_data, get_snapshot_path
+from vietnamadminunits.parser import parser_from_2025, parser_legacy, locator
+from vietnamadminunits.converter import converter_2025
+
+
+# Snapshot -> (JSON source, build, version)
+BUILDS = {
+    'parser_from_2025': (None, parser_from_2025.build_data, parser_from_2025.BUILD_VERSION),
+    'parser_legacy': (None, parser_legacy.build_data, parser_legacy.BUILD_VERSION),
+    'converter_2025': (None, converter_2025.build_data, converter_2025.BUILD_VERSION),
+    'converter_2025_street': (None, lambda street_data: street_data, 0),
+}
+
+DERIVED_BUILDS = {
+    f'locator_{source}': (source, locator.BUILDS[mode], locator.INDEX_VERSION) for mode, source in locator.SOURCES.items()
+}
+
+
+if __name__ == '__main__':
+    for name, (source, build, version) in {**BUILDS, **DERIVED_BUILDS}.items():
+        load_data(name, build, rebuild=True, source=source, version=version, directory=DATA_DIR)
+        snapshot_path = get_snapshot_path(name, DATA_DIR)
+        print(f'{snapshot_path.relative_to(ROOT_DIR)}: {snapshot_path.stat().st_size / 1e6:.1f} MB')
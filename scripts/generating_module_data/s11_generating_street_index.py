@@ -0,0 +1,229 @@
+'''
+Build `vietnamadminunits/data/converter_2025_street.json`, the offline street index used to convert divided wards.
+
+For each divided old ward, street keywords are allocated to its candidate new wards, following `scripts/_archived/allocate_streets_to_new_ward.ipynb`:
+1. Named ways inside the old ward are taken from OpenStreetMap with the Overpass query of the notebook, with the center of each way.
+   Each way goes to the candidate new ward whose square polygon contains its center, or the nearest one, the same rule as a geocoded address (`choose_new_wards_by_points()`).
+   A street is kept only if all its ways go to the same new ward. Responses are cached in `data/interim/osm_streets_divided_wards.csv`,
+   `--fetch` queries the old wards that are not in the cache yet (network required, about 1 request per second).
+2. The headquarters address (`trungtamhc`) of each new ward in `data/raw/sapnhap.bando.com.vn_ward_2025-07-17.csv`,
+   eg: "Số 2, phố Trúc Bạch, phường Ba Đình" gives `'photrucbach'` and `'trucbach'` to Phường Ba Đình.
+   Only named streets, roads and hamlets are kept, numbered hamlets ("Thôn 5", "Tổ dân phố 4") exist in every ward.
+
+A keyword allocated to several candidates of the same old ward is ambiguous and dropped.
+
+Run from the repository root, then run s10 to rebuild snapshots:
+    python scripts/generating_module_data/s11_generating_street_index.py [--fetch]
+'''
+import csv
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from vietnamadminunits.parser.parser_from_2025 import parse_address_from_2025
+from vietnamadminunits.parser.parser_legacy import get_unit as get_legacy_unit
+from vietnamadminunits.parser.utils import key_normalize, unicode_normalize
+from vietnamadminunits.converter.converter_2025 import DICT_PROVINCE_WARD_DIVIDED, choose_new_wards_by_points
+
+
+OSM_CACHE_PATH = ROOT_DIR / 'data/interim/osm_streets_divided_wards.csv'
+OVERPASS_URL = 'https://overpass-api.de/api/interpreter'
+
+# Tên đường thường được viết không kèm "phố", "đường"
+STREET_PREFIXES = ['phố', 'đường', 'đại lộ']
+# Tên thôn, ấp... phải kèm tiền tố, vì tên trần quá ngắn và dễ trùng
+PLACE_PREFIXES = ['quốc lộ', 'tỉnh lộ', 'khu phố', 'khu đô thị', 'tổ dân phố', 'thôn', 'ấp', 'bản', 'xóm', 'khóm', 'làng', 'buôn']
+
+# Các phần không phải tên đường: trụ sở, tên đơn vị hành chính...
+SKIP_WORDS = ['ubnd', 'trụ sở', 'hđnd', 'đảng ủy', 'đang cập nhật', 'cũ', 'hiện nay', 'xã', 'phường', 'thị trấn', 'đặc khu', 'huyện', 'quận', 'tỉnh', 'thành phố', 'thị xã']
+
+MIN_NAME_LENGTH = 5
+
+
+def extract_street_keywords(headquarters: str):
+    '''
+    :param headquarters: Headquarters address, eg: "Số 01 đường Bích Hòa - Cao Viên, thôn Mùi, xã Bình Minh".
+    :return: list, eg: `['duongbichhoacaovien', 'bichhoacaovien', 'thonmui']`.
+    '''
+    keywords = []
+    if not isinstance(headquarters, str):
+        return keywords
+
+    for part in unicode_normalize(headquarters).split(','):
+        part = part.strip().rstrip('.').lower()
+        part = re.sub(r'^(số\s*)?\d[\w/]*\s+', '', part) # Bỏ số nhà
+
+        prefix = next((p for p in STREET_PREFIXES + PLACE_PREFIXES if part.startswith(p + ' ')), None)
+        if not prefix:
+            continue
+        name = part[len(prefix) + 1:].strip()
+        if any(re.search(rf'\b{w}\b', name) for w in SKIP_WORDS):
+            continue
+        if prefix not in ['quốc lộ', 'tỉnh lộ'] and re.fullmatch(r'(số\s*)?[\d\s\-/]+\w?', name):
+            continue # Thôn 5, Tổ dân phố số 18
+
+        keywords.append(key_normalize(f'{prefix} {name}'))
+        if prefix in STREET_PREFIXES and len(key_normalize(name)) >= MIN_NAME_LENGTH:
+            keywords.append(key_normalize(name))
+
+    return list(dict.fromkeys(keywords))
+
+
+def extract_osm_street_keywords(name: str):
+    '''
+    Keywords of an OpenStreetMap way name, cleaned as `clean_street_name()` of the notebook.
+
+    :param name: Way name, eg: "Đường Bích Hòa - Cao Viên", "Phố Trúc Bạch", "Nguyễn Trãi".
+    :return: list, eg: `['duongbichhoacaovien', 'bichhoacaovien']`, empty for alleys ("Hẻm ...", "Ngõ ...").
+    '''
+    name = unicode_normalize(name).strip().lower()
+    if not name or re.match(r'(hẻm|ngõ|ngách|kiệt)\b', name):
+        return []
+
+    keywords = [key_normalize(name)]
+    prefix = next((p for p in STREET_PREFIXES if name.startswith(p + ' ')), None)
+    if prefix:
+        rest = name[len(prefix) + 1:].strip()
+        # Giữ tiền tố với đường số: "Đường số 5", "Đường 15"
+        if not re.match(r'(số\b|\d)', rest) and len(key_normalize(rest)) >= MIN_NAME_LENGTH:
+            keywords.append(key_normalize(rest))
+    return [k for k in dict.fromkeys(keywords) if len(k) >= MIN_NAME_LENGTH]
+
+
+def get_osm_area_names(old_province_district_ward_key: str):
+    '''
+    :param old_province_district_ward_key: Key of the old ward in `DICT_PROVINCE_WARD_DIVIDED`.
+    :return: (province, district, ward) names as in OpenStreetMap, the district type is lowercase like in the notebook, eg: `'quận Tân Bình'`.
+    '''
+    unit = get_legacy_unit(*old_province_district_ward_key.split('_'))
+    return unit.province, unit.district[0].lower() + unit.district[1:], unit.ward
+
+
+def fetch_osm_streets(province: str, district: str, ward: str):
+    '''
+    Query of `get_streets()` in the notebook, with the center of each way.
+
+    :return: list of (name, latitude, longitude).
+    '''
+    import requests
+
+    query = f"""
+    [out:json][timeout:25];
+    area["name"="{province}"]["boundary"="administrative"]["admin_level"="4"]->.tp;
+    area(area.tp)["name"="{district}"]["boundary"="administrative"]["admin_level"="6"]->.quan;
+    area(area.quan)["name"="{ward}"]["boundary"="administrative"]["admin_level"="8"]->.phuong;
+    way(area.phuong)["highway"]["name"];
+    out center;
+    """
+    response = requests.post(OVERPASS_URL, data={'data': query}, timeout=60)
+    response.raise_for_status()
+    return [(e['tags']['name'], e['center']['lat'], e['center']['lon']) for e in response.json()['elements'] if e['type'] == 'way' and 'center' in e]
+
+
+def read_osm_cache():
+    '''
+    :return: dict, old_province_district_ward_key -> list of (name, latitude, longitude). An old ward fetched without any street has an empty list.
+    '''
+    streets = {}
+    if OSM_CACHE_PATH.exists():
+        with open(OSM_CACHE_PATH, newline='') as f:
+            for row in csv.DictReader(f):
+                ways = streets.setdefault(row['old_ward_key'], [])
+                if row['street']:
+                    ways.append((row['street'], float(row['latitude']), float(row['longitude'])))
+    return streets
+
+
+def fetch_missing_osm_streets(streets: dict):
+    '''
+    Fetch the old wards missing from the cache and append them to it.
+    '''
+    new_file = not OSM_CACHE_PATH.exists()
+    with open(OSM_CACHE_PATH, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(['old_ward_key', 'street', 'latitude', 'longitude'])
+        for DICT_WARD_DIVIDED in DICT_PROVINCE_WARD_DIVIDED.values():
+            for old_province_district_ward_key in DICT_WARD_DIVIDED:
+                if old_province_district_ward_key in streets or old_province_district_ward_key.endswith('_'):
+                    continue
+                ways = fetch_osm_streets(*get_osm_area_names(old_province_district_ward_key))
+                streets[old_province_district_ward_key] = ways
+                if ways:
+                    writer.writerows([old_province_district_ward_key, *way] for way in ways)
+                else:
+                    writer.writerow([old_province_district_ward_key, '', '', '']) # Đã fetch, không có street
+                f.flush()
+                print(f'{old_province_district_ward_key}: {len(ways)} ways')
+                time.sleep(1)
+
+
+def allocate_osm_streets(new_province_key: str, old_province_district_ward_key: str, ways: list):
+    '''
+    :param ways: list of (name, latitude, longitude) inside the old ward.
+    :return: dict, keyword -> new_ward_key, or None if the ways of a keyword go to several new wards.
+    '''
+    if not ways:
+        return {}
+    new_ward_keys = choose_new_wards_by_points([(lat, lon) for _, lat, lon in ways], [(new_province_key, old_province_district_ward_key)] * len(ways))
+    allocation = {}
+    for (name, _, _), new_ward_key in zip(ways, new_ward_keys):
+        for keyword in extract_osm_street_keywords(name):
+            allocation[keyword] = new_ward_key if allocation.get(keyword, new_ward_key) == new_ward_key else None
+    return allocation
+
+
+def get_headquarters_keywords():
+    '''
+    :return: dict, (new_province_key, new_ward_key) -> list of keywords from the headquarters address.
+    '''
+    df = pd.read_csv(ROOT_DIR / 'data/raw/sapnhap.bando.com.vn_ward_2025-07-17.csv')
+
+    DICT_WARD_KEYWORDS = {}
+    for _, row in df.iterrows():
+        keywords = extract_street_keywords(row['trungtamhc'])
+        if not keywords:
+            continue
+
+        unit = parse_address_from_2025(f"{row['loai']} {row['tenhc']}, {row['tentinh']}", keep_street=False, level=2)
+        if not unit.ward_key:
+            raise Exception(f"Không tìm được ward: {row['loai']} {row['tenhc']}, {row['tentinh']}")
+
+        ward_keywords = DICT_WARD_KEYWORDS.setdefault((unit.province_key, unit.ward_key), [])
+        ward_keywords.extend(k for k in keywords if k not in ward_keywords)
+    return DICT_WARD_KEYWORDS
+
+
+if __name__ == '__main__':
+    osm_streets = read_osm_cache()
+    if '--fetch' in sys.argv[1:]:
+        fetch_missing_osm_streets(osm_streets)
+    DICT_WARD_KEYWORDS = get_headquarters_keywords()
+
+    DICT_PROVINCE_DIVIDED_WARD_STREET = {} # {new_province_key: {old_province_district_ward_key: {street_keyword: new_ward_key}}}
+    for new_province_key, DICT_WARD_DIVIDED in DICT_PROVINCE_WARD_DIVIDED.items():
+        for old_province_district_ward_key, new_wards in DICT_WARD_DIVIDED.items():
+            allocation = allocate_osm_streets(new_province_key, old_province_district_ward_key, osm_streets.get(old_province_district_ward_key, []))
+            for ward in new_wards:
+                for keyword in DICT_WARD_KEYWORDS.get((new_province_key, ward['newWardKey']), []):
+                    allocation[keyword] = ward['newWardKey'] if allocation.get(keyword, ward['newWardKey']) == ward['newWardKey'] else None
+
+            # Keyword thuộc nhiều ward mới thì không dùng được
+            allocation = {keyword: new_ward_key for keyword, new_ward_key in allocation.items() if new_ward_key}
+            if allocation:
+                DICT_PROVINCE_DIVIDED_WARD_STREET.setdefault(new_province_key, {})[old_province_district_ward_key] = dict(sorted(allocation.items()))
+
+    n_divided = sum(len(v) for v in DICT_PROVINCE_WARD_DIVIDED.values())
+    n_indexed = sum(len(v) for v in DICT_PROVINCE_DIVIDED_WARD_STREET.values())
+    n_osm = sum(1 for ways in osm_streets.values() if ways)
+    print(f'Divided old wards with OSM streets: {n_osm}/{n_divided}, with an index: {n_indexed}/{n_divided}')
+
+    with open(ROOT_DIR / 'vietnamadminunits/data/converter_2025_street.json', 'w') as f:
+        json.dump({'DICT_PROVINCE_DIVIDED_WARD_STREET': DICT_PROVINCE_DIVIDED_WARD_STREET}, f)
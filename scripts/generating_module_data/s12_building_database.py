@@ -0,0 +1,131 @@
+'''
+Build `vietnamadminunits/data/dataset.db`, the SQLite database read by `vietnamadminunits.database`.
+
+Tables `admin_units` (34-province) and `admin_units_legacy` (63-province) have one row per ward, built from the JSON files generated by s7 and s8.
+Codes, names and keys are indexed, so lookups by code, province or name do not scan the table.
+
+The database is a build artifact, it is not committed. Run this script before building the package (sdist or wheel), which ships it.
+The build is deterministic: the same JSON files give the same database byte for byte.
+`--check` builds into a temporary file and compares it with the existing database, use it to check that a database is up to date with the JSON files and this script.
+
+Run from the repository root:
+    python scripts/generating_module_data/s12_building_database.py [--check]
+'''
+import filecmp
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from vietnamadminunits.parser.utils import key_normalize
+
+
+DATA_DIR = ROOT_DIR / 'vietnamadminunits/data'
+DATABASE_PATH = DATA_DIR / 'dataset.db'
+
+PROVINCE_COLUMNS = ['province', 'provinceShort', 'provinceCode', 'provinceLat', 'provinceLon']
+DISTRICT_COLUMNS = ['district', 'districtShort', 'districtType', 'districtCode', 'districtLat', 'districtLon']
+WARD_COLUMNS = ['ward', 'wardShort', 'wardType', 'wardCode', 'wardLat', 'wardLon']
+
+# Các cột được đánh index, tra cứu theo code và key không phải quét cả bảng
+INDEXES = {
+    'admin_units': [['provinceCode'], ['wardCode'], ['provinceKey'], ['provinceShortKey'], ['wardKey'], ['wardShortKey']],
+    'admin_units_legacy': [['provinceCode'], ['districtCode'], ['wardCode'], ['provinceKey'], ['provinceShortKey'], ['districtKey'], ['districtShortKey'], ['wardKey'], ['wardShortKey']],
+}
+
+
+def get_province_row(province_key: str, province: dict):
+    row = {c: province[c] for c in PROVINCE_COLUMNS}
+    row['provinceKey'] = province_key
+    row['provinceShortKey'] = key_normalize(province['provinceShort'])
+    row['provinceKeywords'] = json.dumps(province['provinceKeywords'], ensure_ascii=False)
+    return row
+
+
+def get_ward_row(ward_key: str, ward: dict, accented: bool):
+    if not isinstance(ward['ward'], str):
+        return {} # Huyện đảo có một ward rỗng
+    row = {c: ward[c] for c in WARD_COLUMNS}
+    row['wardKey'] = ward_key
+    row['wardShortKey'] = key_normalize(ward['wardShort'], decode=not accented) # Ward trùng key khi bỏ dấu thì giữ dấu, như wardKey
+    row['wardKeywords'] = json.dumps(ward['wardKeywords'], ensure_ascii=False)
+    return row
+
+
+def iter_wards(DICT_WARD_NO_ACCENTED: dict, DICT_WARD_ACCENTED: dict):
+    yield from ((ward_key, ward, False) for ward_key, ward in DICT_WARD_NO_ACCENTED.items())
+    yield from ((ward_key, ward, True) for ward_key, ward in DICT_WARD_ACCENTED.items())
+
+
+def build_rows_from_2025(parser_data: dict):
+    rows = []
+    for province_key, province in parser_data['DICT_PROVINCE'].items():
+        province_row = get_province_row(province_key, province)
+        for ward_key, ward, accented in iter_wards(parser_data['DICT_PROVINCE_WARD_NO_ACCENTED'].get(province_key, {}), parser_data['DICT_PROVINCE_WARD_ACCENTED'].get(province_key, {})):
+            rows.append({**province_row, **get_ward_row(ward_key, ward, accented)})
+    return rows
+
+
+def build_rows_legacy(parser_data: dict):
+    rows = []
+    for province_key, province in parser_data['DICT_PROVINCE'].items():
+        province_row = get_province_row(province_key, province)
+        for district_key, district in parser_data['DICT_PROVINCE_DISTRICT'][province_key].items():
+            district_row = {c: district[c] for c in DISTRICT_COLUMNS}
+            district_row['districtKey'] = district_key
+            district_row['districtShortKey'] = key_normalize(district['districtShort'])
+            district_row['districtKeywords'] = json.dumps(district['districtKeywords'], ensure_ascii=False)
+
+            DICT_WARD_NO_ACCENTED = parser_data['DICT_PROVINCE_DISTRICT_WARD_NO_ACCENTED'].get(province_key, {}).get(district_key, {})
+            DICT_WARD_ACCENTED = parser_data['DICT_PROVINCE_DISTRICT_WARD_ACCENTED'].get(province_key, {}).get(district_key, {})
+            wards = list(iter_wards(DICT_WARD_NO_ACCENTED, DICT_WARD_ACCENTED))
+            if not wards:
+                rows.append({**province_row, **district_row}) # Huyện đảo không có ward
+            for ward_key, ward, accented in wards:
+                rows.append({**province_row, **district_row, **get_ward_row(ward_key, ward, accented)})
+    return rows
+
+
+def write_table(connection, table: str, rows: list):
+    columns = list(dict.fromkeys(c for row in rows for c in row))
+    connection.execute(f'DROP TABLE IF EXISTS [{table}]')
+    connection.execute(f"CREATE TABLE [{table}] ({', '.join(f'[{c}]' for c in columns)})")
+    connection.executemany(f"INSERT INTO [{table}] VALUES ({', '.join('?' * len(columns))})", [[row.get(c) for c in columns] for row in rows])
+    for index_columns in INDEXES[table]:
+        connection.execute(f"CREATE INDEX [{table}_{'_'.join(index_columns)}] ON [{table}] ({', '.join(index_columns)})")
+    print(f'{table}: {len(rows)} rows, {len(columns)} columns')
+
+
+def build_database(path: Path):
+    with open(DATA_DIR / 'parser_from_2025.json', 'r') as f:
+        rows_from_2025 = build_rows_from_2025(json.load(f))
+    with open(DATA_DIR / 'parser_legacy.json', 'r') as f:
+        rows_legacy = build_rows_legacy(json.load(f))
+
+    path.unlink(missing_ok=True)
+    connection = sqlite3.connect(path)
+    with connection:
+        write_table(connection, 'admin_units', rows_from_2025)
+        write_table(connection, 'admin_units_legacy', rows_legacy)
+    connection.execute('ANALYZE')
+    connection.execute('VACUUM')
+    connection.close()
+    print(f'{path.name}: {path.stat().st_size / 1e6:.1f} MB')
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'dataset.db'
+            build_database(path)
+            if not DATABASE_PATH.exists():
+                sys.exit(f'{DATABASE_PATH.relative_to(ROOT_DIR)} is missing, build it without --check.')
+            if not filecmp.cmp(path, DATABASE_PATH, shallow=False):
+                sys.exit(f'{DATABASE_PATH.relative_to(ROOT_DIR)} is stale, rebuild it without --check.')
+            print(f'{DATABASE_PATH.relative_to(ROOT_DIR)} is up to date.')
+    else:
+        build_database(DATABASE_PATH)
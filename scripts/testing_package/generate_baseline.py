@@ -0,0 +1,62 @@
+'''
+Write the expected results of `tests/test_baseline.py`: units parsed and converted from `data/input/*.csv` as dicts of their attributes,
+one gzipped JSON Lines output file per input file, same row order.
+
+Older releases geocode divided wards online, if that fails the expected converted unit is `null` and is not compared.
+
+Run it against the package version that results must stay equal to, eg: a checkout of an older release:
+    python scripts/testing_package/generate_baseline.py [package_root]
+'''
+import csv
+import gzip
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(Path(sys.argv[1]).resolve() if len(sys.argv) > 1 else ROOT_DIR))
+
+from vietnamadminunits import parse_address, convert_address
+
+
+INPUT_DIR = ROOT_DIR / 'scripts/testing_package/data/input'
+OUTPUT_DIR = ROOT_DIR / 'tests/data/baseline'
+
+KEYS = ['legacy', 'from_2025', 'convert']
+
+
+def get_addresses(row: dict):
+    '''
+    :param row: Row of an input file.
+    :return: (legacy address, 34-province address), the same as `tests/test_baseline.py` builds.
+    '''
+    return ', '.join(row[c] for c in ['ward', 'district', 'province'] if row[c]), ', '.join(row[c] for c in ['ward', 'province'] if row[c])
+
+
+def get_output_path(input_path: Path):
+    return OUTPUT_DIR / f'{input_path.stem}.jsonl.gz'
+
+
+def get_units(row: dict):
+    '''
+    :return: dict, `KEYS` -> attributes of the unit, `vars()` works on every release.
+    '''
+    legacy_address, address_2025 = get_addresses(row)
+    try:
+        converted = vars(convert_address(legacy_address))
+    except Exception:
+        converted = None # Divided ward, không geocode được
+    units = [vars(parse_address(legacy_address, mode='LEGACY', level=3)), vars(parse_address(address_2025, mode='FROM_2025', level=2)), converted]
+    return dict(zip(KEYS, units))
+
+
+if __name__ == '__main__':
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    for input_path in sorted(INPUT_DIR.glob('*.csv')):
+        with open(input_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        # mtime=0 để file ra giống nhau mỗi lần chạy
+        with gzip.GzipFile(get_output_path(input_path), 'wb', mtime=0) as f:
+            for row in rows:
+                f.write((json.dumps(get_units(row), ensure_ascii=False, sort_keys=True) + '\n').encode())
+        print(f'{input_path.name}: {len(rows)} rows')
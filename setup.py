@@ -16,8 +16,10 @@ setup(
     url="https://github.com/tranngocminhhieu/vietnamadminunits",
     packages=find_packages(),
     include_package_data=True,
+    # dataset.db and the *.pickle snapshots are not committed, build them with
+    # scripts/generating_module_data/s12_building_database.py and s10_building_snapshot.py before packaging
     package_data={
-        "vietnamadminunits": ["data/*.json", "data/*.db"],
+        "vietnamadminunits": ["data/*.json", "data/*.db", "data/*.pickle"],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -31,7 +33,16 @@ setup(
     install_requires=[
         "shapely",
         "geopy",
+        "numpy",
         "unidecode",
         "tqdm"
-    ]
+    ],
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
+    entry_points={
+        "console_scripts": [
+            "vietnamadminunits=vietnamadminunits.cli:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,62 @@
+import asyncio
+
+from vietnamadminunits import convert_addresses, convert_addresses_async, convert_addresses_as_completed
+
+# Phường Ngọc Hà cũ được chia cho Phường Ba Đình (mặc định) và Phường Ngọc Hà, street không có trong street index nên phải geocode
+DIVIDED = [f'{i} Khutrucbach, Phường Ngọc Hà, Quận Ba Đình, Hà Nội' for i in range(1, 9)]
+NOT_DIVIDED = ['Trúc Bạch, Ba Đình, Hà Nội', 'p12, Tân Bình, HCM']
+ADDRESSES = [DIVIDED[0], NOT_DIVIDED[0], DIVIDED[1], NOT_DIVIDED[1]] + DIVIDED[2:] + [DIVIDED[0]]
+
+NGOC_HA = (21.0381, 105.816)
+
+
+def geocode(address):
+    # Số nhà chẵn nằm ở Phường Ngọc Hà mới, số lẻ không tìm được
+    return NGOC_HA if int(address.split()[0]) % 2 == 0 else None
+
+
+class AsyncGeocoder:
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, address):
+        self.calls.append(address)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Địa chỉ số 1 (DIVIDED[0]) xong sau cùng, để thứ tự hoàn thành khác thứ tự đầu vào. Geocoder nhận địa chỉ cũ đã chuẩn hóa
+        await asyncio.sleep(0.1 if address.split()[0] == '1' else 0.005)
+        self.in_flight -= 1
+        return geocode(address)
+
+
+def test_async_matches_sync_order():
+    expected = convert_addresses(ADDRESSES, geocoder=geocode)
+    assert {unit.ward for unit in expected} >= {'Phường Ba Đình', 'Phường Ngọc Hà'}
+
+    assert asyncio.run(convert_addresses_async(ADDRESSES, geocoder=AsyncGeocoder())) == expected
+    assert asyncio.run(convert_addresses_async(ADDRESSES, geocoder=geocode, max_concurrency=3)) == expected
+
+
+def test_concurrency_is_bounded():
+    geocoder = AsyncGeocoder()
+    asyncio.run(convert_addresses_async(ADDRESSES, geocoder=geocoder, max_concurrency=2))
+
+    assert geocoder.max_in_flight == 2
+    assert sorted(geocoder.calls) == sorted(set(geocoder.calls)) # Mỗi địa chỉ chỉ geocode một lần
+    assert len(geocoder.calls) == len(DIVIDED)
+
+
+def test_as_completed_yields_every_index_once():
+    async def collect():
+        return [item async for item in convert_addresses_as_completed(ADDRESSES, geocoder=AsyncGeocoder(), max_concurrency=4)]
+
+    results = asyncio.run(collect())
+    expected = convert_addresses(ADDRESSES, geocoder=geocode)
+
+    assert sorted(i for i, _ in results) == list(range(len(ADDRESSES)))
+    assert all(unit == expected[i] for i, unit in results)
+    # Không cần geocode thì ra trước, địa chỉ chậm nhất ra sau cùng
+    assert {i for i, _ in results[:len(NOT_DIVIDED)]} == {ADDRESSES.index(a) for a in NOT_DIVIDED}
+    assert {i for i, _ in results[-2:]} == {0, len(ADDRESSES) - 1}
@@ -0,0 +1,49 @@
+'''
+Results on the packaged test datasets must stay equal to `tests/data/baseline`, see `scripts/testing_package/generate_baseline.py`.
+'''
+import csv
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from vietnamadminunits import parse_addresses, convert_addresses
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'scripts/testing_package'))
+
+from generate_baseline import INPUT_DIR, get_addresses, get_output_path
+
+
+@pytest.fixture(scope='module', params=sorted(INPUT_DIR.glob('*.csv')), ids=lambda path: path.stem)
+def dataset(request):
+    with open(request.param, newline='') as f:
+        rows = list(csv.DictReader(f))
+    with gzip.open(get_output_path(request.param), 'rt') as f:
+        expected = [json.loads(line) for line in f]
+    assert len(rows) == len(expected)
+    return rows, expected
+
+
+def test_parse_legacy(dataset):
+    rows, expected = dataset
+    units = parse_addresses([get_addresses(row)[0] for row in rows], mode='LEGACY', level=3)
+
+    assert [unit.to_dict() for unit in units] == [e['legacy'] for e in expected]
+
+
+def test_parse_from_2025(dataset):
+    rows, expected = dataset
+    units = parse_addresses([get_addresses(row)[1] for row in rows], mode='FROM_2025', level=2)
+
+    assert [unit.to_dict() for unit in units] == [e['from_2025'] for e in expected]
+
+
+def test_convert(dataset):
+    rows, expected = dataset
+    units = convert_addresses([get_addresses(row)[0] for row in rows])
+
+    # None: bản cũ phải geocode online mới ra kết quả
+    assert [unit.to_dict() if e['convert'] is not None else None for unit, e in zip(units, expected)] == [e['convert'] for e in expected]
@@ -0,0 +1,54 @@
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+from vietnamadminunits import parse_address, parse_addresses, convert_address, convert_addresses
+from vietnamadminunits.parser import utils
+from vietnamadminunits.parser.objects import AdminUnit
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'scripts/testing_package'))
+
+from generate_baseline import INPUT_DIR, get_addresses
+
+STREETS = ['12 Nguyễn Trãi', 'số 5 ngõ 133 thái hà', '169/8A Thoại Ngọc Hầu']
+
+
+@pytest.fixture(scope='module')
+def addresses():
+    with open(sorted(INPUT_DIR.glob('*.csv'))[0], newline='') as f:
+        rows = list(csv.DictReader(f))[:2000]
+    return [f'{STREETS[i % len(STREETS)]}, {get_addresses(row)[0]}' for i, row in enumerate(rows)]
+
+
+def test_batch_equals_single(addresses):
+    assert parse_addresses(addresses, mode='LEGACY', level=3) == [parse_address(address, mode='LEGACY', level=3) for address in addresses]
+    assert convert_addresses(addresses) == [convert_address(address) for address in addresses]
+
+
+def test_bounded_memos(addresses, monkeypatch):
+    expected = parse_addresses(addresses, mode='LEGACY', level=3)
+
+    # Các dòng trùng nằm xa nhau, entry đã bị bỏ khỏi memo thì parse lại
+    monkeypatch.setattr(utils, 'BATCH_MEMO_SIZE', 3)
+    assert parse_addresses(addresses + addresses, mode='LEGACY', level=3) == expected + expected
+
+
+def test_whitespace_variants_share_a_street():
+    units = parse_addresses(['12 Nguyễn Trãi, Thanh Xuân Trung, Thanh Xuân, Hà Nội', '12  Nguyễn Trãi,  Thanh Xuân Trung, Thanh Xuân, Hà Nội '], mode='LEGACY')
+    assert units[0] == units[1] and units[0].street == '12 Nguyễn Trãi'
+
+
+@pytest.mark.parametrize('mode', ['FROM_2025', 'LEGACY'])
+def test_empty_batch(mode):
+    empty = AdminUnit(show_district=mode == 'LEGACY')
+    assert parse_addresses(['', ''], mode=mode) == [empty, empty]
+    assert parse_addresses([], mode=mode) == []
+
+
+def test_empty_convert():
+    assert convert_address('') == AdminUnit()
+    assert convert_addresses(['']) == [AdminUnit()]
+    assert convert_addresses([]) == []
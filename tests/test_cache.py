@@ -0,0 +1,64 @@
+import pytest
+
+from vietnamadminunits import parse_address, convert_address, cache_info, cache_clear, cache_resize
+from vietnamadminunits.cache import DEFAULT_MAXSIZE
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache_clear()
+    yield
+    cache_resize(DEFAULT_MAXSIZE)
+    cache_clear()
+
+
+def test_hit_on_same_normalized_address():
+    unit = parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM')
+    assert parse_address('70  Nguyễn Sỹ Sách,  Tân Sơn, HCM ') is unit
+    assert cache_info('FROM_2025')[:2] == (1, 1)
+    assert cache_info('LEGACY').currsize == 0
+
+
+def test_options_are_part_of_the_key():
+    parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM')
+    unit = parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM', keep_street=False, level=1)
+
+    assert unit.street is None and unit.ward is None
+    assert cache_info('FROM_2025').misses == 2
+
+
+def test_clear_and_resize():
+    convert_address('59 Nguyễn Sỹ Sách, P4, Tân Bình, HCM')
+    assert cache_info('CONVERT_2025').currsize == 1
+
+    cache_clear('CONVERT_2025')
+    assert cache_info('CONVERT_2025') == (0, 0, DEFAULT_MAXSIZE, 0)
+
+    cache_resize(1)
+    parse_address('Ba Đình, Hà Nội')
+    parse_address('Hoàn Kiếm, Hà Nội')
+    assert cache_info('FROM_2025').currsize == 1
+
+    cache_resize(0)
+    unit = parse_address('Ba Đình, Hà Nội')
+    assert parse_address('Ba Đình, Hà Nội') == unit
+    assert cache_info('FROM_2025').currsize == 0
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        cache_info('CONVERT_2026')
+
+
+def test_unhashable_geocoder_is_not_cached():
+    class Geocoder:
+        # __eq__ sans __hash__: instance không hash được
+        def __eq__(self, other):
+            return self is other
+
+        def __call__(self, address):
+            return None
+
+    address = '12 Khutrucbach, Phường Ngọc Hà, Quận Ba Đình, Hà Nội'
+    assert convert_address(address, geocoder=Geocoder()) == convert_address(address)
+    assert cache_info('CONVERT_2025').currsize == 1
@@ -0,0 +1,118 @@
+import csv
+import json
+import warnings
+
+import pytest
+
+from vietnamadminunits import parse_addresses, convert_addresses
+from vietnamadminunits.cli import main
+
+ADDRESSES = [
+    '70 Nguyễn Sỹ Sách, P15, Tân Bình, HCM',
+    'Trúc Bạch, Ba Đình, Hà Nội',
+    '59 Nguyễn Sỹ Sách, P4, Tân Bình, HCM',
+    '',
+    'Trúc Bạch, Ba Đình, Hà Nội',
+    'Xã Xuân Đình, Huyện Phúc Thọ, Hà Nội',
+    '12 Nguyễn Trãi, Thanh Xuân Trung, Thanh Xuân, Hà Nội',
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def input_path(tmp_path):
+    return write_csv(tmp_path / 'input.csv', [{'id': str(i), 'address': address} for i, address in enumerate(ADDRESSES)])
+
+
+# chunk 2 hàng để có nhiều chunk, -j 2 để các chunk chạy song song mà vẫn giữ thứ tự
+@pytest.mark.parametrize('options', [[], ['--chunk-size', '2'], ['--chunk-size', '2', '-j', '2']])
+def test_parse(input_path, tmp_path, options):
+    output_path = str(tmp_path / 'output.csv')
+    assert main(['parse', input_path, '--mode', 'LEGACY', '--fields', 'street,ward,district,province', '-o', output_path] + options) == 0
+
+    rows = read_csv(output_path)
+    units = parse_addresses(ADDRESSES, mode='LEGACY')
+    assert [row['id'] for row in rows] == [str(i) for i in range(len(ADDRESSES))]
+    assert [(row['parsed_street'], row['parsed_ward'], row['parsed_district'], row['parsed_province']) for row in rows] == [(u.street or '', u.ward or '', u.district or '', u.province or '') for u in units]
+
+
+@pytest.mark.parametrize('options', [[], ['--chunk-size', '2', '-j', '2']])
+def test_convert(input_path, tmp_path, options):
+    output_path = str(tmp_path / 'output.jsonl')
+    assert main(['convert', input_path, '--fields', 'ward,province,address', '--output-format', 'jsonl', '-o', output_path] + options) == 0
+
+    with open(output_path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    units = convert_addresses(ADDRESSES)
+    assert [row['id'] for row in rows] == [str(i) for i in range(len(ADDRESSES))]
+    assert [(row['converted_ward'], row['converted_province'], row['converted_address']) for row in rows] == [(u.ward, u.province, u.get_address(short_name=True)) for u in units]
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(district='district', ward='ward', parse_mode='LEGACY'),
+    dict(district='district', ward='ward', parse_mode='FROM_2025'),
+    dict(ward='ward', parse_mode='FROM_2025'),
+    dict(district='district', ward='ward', convert_mode='CONVERT_2025'),
+])
+def test_standardize_matches_pandas(tmp_path, kwargs):
+    pd = pytest.importorskip('pandas')
+    from vietnamadminunits.pandas import standardize_admin_unit_columns
+
+    df = pd.DataFrame({
+        'ward': ['Trúc Bạch', 'Xã Xuân Đình', 'p12', '', 'Trúc Bạch'],
+        'district': ['Ba Đình', 'Huyện Phúc Thọ', 'Tân Bình', 'Ba Đình', 'Ba Đình'],
+        'province': ['Hà Nội', 'Hà Nội', 'HCM', 'Hà Nội', 'Hà Nội'],
+    })
+    input_path = write_csv(tmp_path / 'input.csv', df.to_dict('records'))
+    output_path = str(tmp_path / 'output.csv')
+
+    options = ['--province', 'province', '--chunk-size', '2', '-j', '2']
+    for column in ['district', 'ward']:
+        if column in kwargs:
+            options += [f'--{column}', column]
+    options += ['--convert-mode', kwargs['convert_mode']] if 'convert_mode' in kwargs else ['--mode', kwargs['parse_mode']]
+    # FROM_2025 với cột district cảnh báo ở cả hai nơi
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        assert main(['standardize', input_path, '-o', output_path] + options) == 0
+        expected = standardize_admin_unit_columns(df, province='province', show_progress=False, **kwargs)
+
+    assert pd.read_csv(output_path, dtype=str, keep_default_na=False).equals(expected.fillna('').astype(str))
+
+
+def test_jsonl_to_csv_header_is_the_union_of_the_first_chunk(tmp_path):
+    input_path = tmp_path / 'input.jsonl'
+    input_path.write_text('{"address": "Trúc Bạch, Ba Đình, Hà Nội"}\n{"address": "Ba Đình, Hà Nội", "note": "x"}\n', encoding='utf-8')
+    output_path = str(tmp_path / 'output.csv')
+
+    assert main(['parse', str(input_path), '--output-format', 'csv', '--fields', 'ward', '-o', output_path]) == 0
+    assert [list(row) for row in read_csv(output_path)] == [['address', 'parsed_ward', 'note']] * 2
+    assert read_csv(output_path)[1]['note'] == 'x'
+
+
+def test_jsonl_to_csv_new_column_in_a_later_chunk_fails(tmp_path, capsys):
+    input_path = tmp_path / 'input.jsonl'
+    input_path.write_text('{"address": "Trúc Bạch, Ba Đình, Hà Nội"}\n{"address": "Ba Đình, Hà Nội", "note": "x"}\n', encoding='utf-8')
+
+    with pytest.raises(SystemExit) as e:
+        main(['parse', str(input_path), '--output-format', 'csv', '--chunk-size', '1', '-o', str(tmp_path / 'output.csv')])
+    assert e.value.code == 2
+    assert "['note']" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('argv', [['--level', '4'], ['--level', '3', '--mode', 'FROM_2025']])
+def test_invalid_level(input_path, argv):
+    with pytest.raises(SystemExit):
+        main(['parse', input_path] + argv)
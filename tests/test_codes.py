@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from vietnamadminunits import parse_address, parse_addresses, convert_addresses, lookup_by_code, lookup_by_codes, convert_code, convert_codes
+from vietnamadminunits.parser.codes import BUILDS, LEVELS
+from vietnamadminunits.converter.codes_2025 import iter_new_units
+
+
+@pytest.mark.parametrize('mode, level', [(mode, level) for mode in LEVELS for level in LEVELS[mode]])
+def test_lookup_matches_parse_address(mode, level):
+    code_units = list(BUILDS[mode](level))
+    codes = [code for code, _ in code_units]
+    addresses = [unit.get_address() for _, unit in code_units]
+
+    units = lookup_by_codes(codes, mode=mode, level=level)
+    assert units == parse_addresses(addresses, mode=mode, keep_street=False, level=level)
+    assert units == [lookup_by_code(int(code), mode=mode, level=level) for code in codes]
+    assert lookup_by_code(codes[0], mode=mode, level=level) == parse_address(addresses[0], mode=mode, keep_street=False, level=level)
+
+
+@pytest.mark.parametrize('level', [1, 2, 3])
+def test_convert_codes_match_convert_address(level):
+    code_units = list(BUILDS['LEGACY'](level))
+    codes = [code for code, _ in code_units]
+    # Không có street: ward cũ bị chia về ward mới mặc định. convert_address() có thể giữ một phần tên ward cũ làm street, eg: 'Xãvănlang'
+    new_units = convert_addresses([unit.get_address() for _, unit in code_units])
+    assert convert_codes(codes, level=level) == [unit.with_street(None) for unit in new_units]
+    assert convert_code(codes[-1], level=level) == dict(iter_new_units(level))[codes[-1]]
+
+
+def test_float_codes():
+    assert lookup_by_code(4.0) == lookup_by_code('00004') == lookup_by_code(4)
+    assert lookup_by_code(4.5) is None
+    assert lookup_by_codes(np.array([4.0, 4.5, np.nan, np.inf])) == [lookup_by_code(4), None, None, None]
+    assert lookup_by_codes(np.array([4, -4, 10 ** 9])) == [lookup_by_code(4), None, None]
+
+
+def test_missing_codes():
+    assert lookup_by_code(None) is None
+    assert lookup_by_codes([None, float('nan'), '', 'abc', 99999999]) == [None] * 5
+    assert convert_code(float('nan')) is None
+    assert convert_codes([None, float('nan')]) == [None, None]
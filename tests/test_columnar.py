@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from vietnamadminunits import parse_addresses, parse_addresses_columnar, convert_addresses, convert_addresses_columnar, locate_many, lookup_by_codes
+from vietnamadminunits.parser.columnar import units_to_columns, format_codes, CODE_COLUMNS
+
+
+def test_none_unit_is_a_missing_row():
+    units = [parse_addresses(['Phường Ba Đình, Hà Nội'])[0], None]
+    columns = units_to_columns(units)
+
+    assert columns['province_code'].tolist() == [1, -1]
+    assert columns['ward_code'].tolist() == [4, -1]
+    assert columns['latitude'][1] != columns['latitude'][1] # NaN
+    assert columns['ward'].codes.tolist()[1] == -1
+    assert columns['ward'].to_numpy().tolist() == ['Phường Ba Đình', None]
+    assert columns['street'].codes.tolist() == [-1, -1]
+
+
+def test_locate_many_and_lookup_by_codes_misses():
+    columns = units_to_columns(locate_many([21.03, None], [105.83, None]))
+    assert columns['ward_code'][0] > 0 and columns['ward_code'][1] == -1
+
+    columns = units_to_columns(lookup_by_codes(['00004', 'unknown']), columns=['ward', 'ward_code'])
+    assert columns['ward_code'].tolist() == [4, -1]
+    assert columns['ward'].to_pandas().isna().tolist() == [False, True]
+
+
+def test_all_none():
+    columns = units_to_columns([None, None], columns=['province', 'province_code'])
+    assert columns['province_code'].tolist() == [-1, -1]
+    assert columns['province'].codes.tolist() == [-1, -1]
+    assert len(columns['province'].categories) == 0
+
+
+ADDRESSES = ['12 Nguyễn Trãi, P. Trúc Bạch, Ba Đình, Hà Nội', 'Trúc Bạch, Ba Đình, Hà Nội', '59 Nguyễn Sỹ Sách, P4, Tân Bình, HCM', '', '12  Nguyễn Trãi,  P. Trúc Bạch, Ba Đình, Hà Nội']
+
+
+def assert_same_columns(columns, expected):
+    assert columns.keys() == expected.keys()
+    for column, values in expected.items():
+        if hasattr(values, 'codes'):
+            assert columns[column].to_numpy().tolist() == values.to_numpy().tolist()
+        else:
+            np.testing.assert_array_equal(columns[column], values)
+
+
+@pytest.mark.parametrize('mode', ['FROM_2025', 'LEGACY'])
+def test_parse_addresses_columnar_matches_units(mode):
+    expected = units_to_columns(parse_addresses(ADDRESSES, mode=mode))
+    assert_same_columns(parse_addresses_columnar(ADDRESSES, mode=mode), expected)
+
+
+def test_convert_addresses_columnar_matches_units():
+    expected = units_to_columns(convert_addresses(ADDRESSES))
+    assert_same_columns(convert_addresses_columnar(ADDRESSES), expected)
+
+
+def test_format_codes():
+    units = parse_addresses(ADDRESSES, mode='LEGACY')
+    columns = parse_addresses_columnar(ADDRESSES, mode='LEGACY')
+    for column in CODE_COLUMNS:
+        assert format_codes(columns[column], column).tolist() == [getattr(unit, column) for unit in units]
+
+    with pytest.raises(ValueError):
+        format_codes(columns['ward_code'], 'ward')
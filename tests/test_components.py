@@ -0,0 +1,50 @@
+import csv
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+from vietnamadminunits import parse_address, parse_addresses, parse_components, parse_components_many
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts/testing_package'))
+
+from generate_baseline import INPUT_DIR, get_addresses
+
+
+def test_parse_components():
+    unit = parse_components(ward='P. Ba Đình', province='Hà Nội')
+    assert unit == parse_address('Phường Ba Đình, Thành phố Hà Nội')
+
+    unit = parse_components(ward='Trúc Bạch', district='Ba Đình', province='Hà Nội', mode='LEGACY')
+    assert unit.ward_code == '00004'
+
+
+@pytest.mark.parametrize('input_path', sorted(INPUT_DIR.glob('*.csv')), ids=lambda path: path.stem)
+def test_parse_components_legacy(input_path):
+    with open(input_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    units = parse_components_many(wards=[row['ward'] for row in rows], districts=[row['district'] for row in rows], provinces=[row['province'] for row in rows], mode='LEGACY', level=3)
+    assert units == parse_addresses([get_addresses(row)[0] for row in rows], mode='LEGACY', keep_street=False, level=3)
+
+
+def test_no_field_raises():
+    with pytest.raises(ValueError, match='At least one field'):
+        parse_components()
+    with pytest.raises(ValueError, match='At least one field'):
+        parse_components_many()
+
+
+def test_empty_fields_give_empty_unit():
+    assert parse_components(ward=None, province='') == parse_address('', keep_street=False)
+    units = parse_components_many(wards=[None, 'Ba Đình'], provinces=[math.nan, 'Hà Nội'])
+    assert units[0] == parse_address('', keep_street=False)
+    assert units[1].ward == 'Phường Ba Đình'
+
+    units = parse_components_many(wards=[None], districts=[None], provinces=[None], mode='LEGACY')
+    assert units == [parse_address('', mode='LEGACY', keep_street=False)]
+
+
+def test_fields_must_have_same_length():
+    with pytest.raises(ValueError):
+        parse_components_many(wards=['a', 'b'], provinces=['c'])
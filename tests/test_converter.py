@@ -0,0 +1,82 @@
+import pytest
+
+from vietnamadminunits import convert_address, convert_addresses, reverse_convert_address, reverse_convert_addresses, convert_code, parse_addresses, ConvertMode
+from vietnamadminunits.converter.reverse_2025 import reverse_unit
+from vietnamadminunits.database import get_data
+from vietnamadminunits.converter.converter_2025 import DICT_PROVINCE_WARD_DIVIDED, get_street_index, get_street_token_keys, match_street_index
+
+
+def test_street_token_keys_on_word_boundaries():
+    keys = get_street_token_keys('Số 12 phố Trúc Bạch, Q. Ba Đình')
+
+    assert {'photrucbach', 'trucbach', 'badinh'} <= keys
+    assert 'rucbach' not in keys and 'ucba' not in keys
+    assert 'trucbachq' not in keys # Không nối qua dấu phẩy
+
+
+def test_street_index_matches_whole_words_only():
+    old_ward_key = 'thanhphohanoi_quanbadinh_phuongngocha'
+
+    assert match_street_index('thanhphohanoi', old_ward_key, '12 phố Trúc Bạch') == 'phuongbadinh'
+    assert match_street_index('thanhphohanoi', old_ward_key, '12 phố Trúc Bạchh') is None
+    assert match_street_index('thanhphohanoi', old_ward_key, '12 Khutrucbach') is None
+
+
+def test_geocoding_is_opt_in():
+    address = '12 Khutrucbach, Phường Ngọc Hà, Quận Ba Đình, Hà Nội'
+    default = convert_address(address)
+
+    calls = []
+    def geocoder(query):
+        calls.append(query)
+        return None
+
+    assert convert_address(address, geocoder=geocoder) == default
+    assert calls
+    assert convert_address('12 phố Trúc Bạch, Phường Ngọc Hà, Quận Ba Đình, Hà Nội').ward == 'Phường Ba Đình'
+
+
+def test_street_index_is_per_divided_old_ward():
+    DICT_PROVINCE_DIVIDED_WARD_STREET = get_street_index()
+    for new_province_key, DICT_WARD_DIVIDED in DICT_PROVINCE_WARD_DIVIDED.items():
+        for old_province_district_ward_key, DICT_STREET in DICT_PROVINCE_DIVIDED_WARD_STREET.get(new_province_key, {}).items():
+            candidates = {ward['newWardKey'] for ward in DICT_WARD_DIVIDED[old_province_district_ward_key]}
+            assert set(DICT_STREET.values()) <= candidates
+
+
+def test_reverse_convert_address():
+    old_wards = [u.ward for u in reverse_convert_address('Phường Ba Đình, Hà Nội')]
+    assert old_wards[:6] == ['Phường Trúc Bạch', 'Phường Quán Thánh', 'Phường Điện Biên', 'Phường Đội Cấn', 'Phường Kim Mã', 'Phường Ngọc Hà']
+    assert {'Phường Cửa Đông', 'Phường Cửa Nam', 'Phường Đồng Xuân', 'Phường Thụy Khuê'} <= set(old_wards)
+
+    old_units = reverse_convert_address('12 Nguyễn Trãi, Phường Sài Gòn, TP.HCM')
+    assert [u.get_address() for u in old_units] == [
+        '12 Nguyễn Trãi, Phường Bến Nghé, Quận 1, Thành phố Hồ Chí Minh',
+        '12 Nguyễn Trãi, Phường Đa Kao, Quận 1, Thành phố Hồ Chí Minh',
+        '12 Nguyễn Trãi, Phường Nguyễn Thái Bình, Quận 1, Thành phố Hồ Chí Minh',
+    ]
+    assert [u.get_address() for u in reverse_convert_address('Hà Nội')] == ['Thành phố Hà Nội']
+    assert [u.get_address() for u in reverse_convert_address('Đặc khu Bạch Long Vĩ, Hải Phòng')] == ['Huyện Bạch Long Vĩ, Thành phố Hải Phòng']
+    assert reverse_convert_addresses(['xyz', 'Phường Ba Đình, Hà Nội'])[0] == ()
+
+
+def test_reverse_contains_every_converted_old_ward():
+    rows = get_data(['ward', 'district', 'province'], table='admin_units_legacy')
+    addresses = [f"{row['ward']}, {row['district']}, {row['province']}" for row in rows if row['ward']]
+    get_keys = lambda unit: (unit.province_key, unit.district_key, unit.ward_key)
+
+    for old_unit, new_unit in zip(parse_addresses(addresses, mode='LEGACY', level=3), convert_addresses(addresses)):
+        assert get_keys(old_unit) in [get_keys(u) for u in reverse_unit(new_unit)]
+
+
+@pytest.mark.parametrize('function, mode, hint', [
+    (convert_address, 'REVERSE_2025', 'reverse_convert_address()'),
+    (convert_addresses, 'CONVERT_2026', None),
+    (reverse_convert_address, ConvertMode.CONVERT_2025, 'convert_address()'),
+    (convert_code, 'LEGACY', None),
+])
+def test_invalid_mode(function, mode, hint):
+    with pytest.raises(ValueError) as e:
+        function('Ba Đình, Hà Nội' if function is not convert_addresses else ['Ba Đình, Hà Nội'], mode=mode)
+    assert str(getattr(mode, 'value', mode)) in str(e.value)
+    assert (hint in str(e.value)) if hint else 'Use ' not in str(e.value)
@@ -0,0 +1,34 @@
+import pytest
+
+from vietnamadminunits.database import get_data, find_units
+from vietnamadminunits.database.main import build_select
+
+
+def test_fields_with_alias():
+    assert get_data('provinceCode as code', where={'provinceCode': '01'}) == [{'code': '01'}]
+    assert get_data(['[province] AS name', 'provinceCode'], where={'provinceCode': '01'}) == [{'name': 'Thành phố Hà Nội', 'provinceCode': '01'}]
+
+
+def test_aggregate_fields():
+    assert get_data('COUNT(*) AS n', where={'provinceCode': '01'}) == [{'n': 126}]
+    assert get_data(['MIN(wardCode) AS first', 'max([wardCode]) AS last'], where={'provinceCode': '01'}) == [{'first': '00004', 'last': '10489'}]
+
+
+@pytest.mark.parametrize('fields', ['MIN(*)', 'SUM(wardCode)', 'COUNT(unknown)', 'provinceCode; DROP TABLE admin_units', 'unknown AS alias', 'provinceCode AS a b'])
+def test_invalid_fields(fields):
+    with pytest.raises(ValueError):
+        build_select(fields)
+
+
+def test_invalid_table_and_where():
+    with pytest.raises(ValueError):
+        build_select(table='sqlite_master')
+    with pytest.raises(ValueError):
+        build_select(where={'1=1 OR provinceCode': '01'})
+
+
+def test_find_units_accented():
+    assert find_units(name='Sa Pả', province='Lào Cai', fields='ward') == []
+    assert find_units(name='Sa Pa', province='Lào Cai', fields='ward') == [{'ward': 'Phường Sa Pa'}]
+    assert find_units(name='sa pa', province='lao cai', fields='ward') == [{'ward': 'Phường Sa Pa'}]
+    assert find_units(name='Hoà Bình', province='Hồ Chí Minh', fields='ward') == [{'ward': 'Phường Hòa Bình'}]
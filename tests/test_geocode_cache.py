@@ -0,0 +1,128 @@
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from vietnamadminunits.converter import geocode_cache
+from vietnamadminunits.converter.geocode_cache import GeocodeCache, CachedGeocoder
+
+
+class Clock:
+    def __init__(self, now: float=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(geocode_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'geocode.db')
+
+
+def test_query_key_and_not_found(path):
+    cache = GeocodeCache(path)
+    cache.set('12 Nguyễn Trãi, Hà Nội', (21.0, 105.8))
+    cache.set('Không có', None)
+
+    assert cache.get('12  NGUYỄN TRÃI, Hà Nội') == (True, (21.0, 105.8))
+    assert cache.get('Không có') == (True, None)
+    assert cache.get('Chưa geocode') == (False, None)
+    assert cache.info() == (2, 1, None, 2)
+
+
+def test_ttl_expiry(path, clock):
+    cache = GeocodeCache(path, ttl=60)
+    cache.set('old', (1.0, 1.0))
+    clock.now += 30
+    cache.set('new', (2.0, 2.0))
+
+    clock.now += 40 # old: 70 giây, new: 40 giây
+    assert cache.get('old') == (False, None)
+    assert cache.get('new') == (True, (2.0, 2.0))
+    assert cache.purge() == 1
+    assert cache.info().currsize == 1
+
+
+def test_lru_eviction(path, clock):
+    cache = GeocodeCache(path, max_entries=10)
+    for i in range(10):
+        clock.now += 1
+        cache.set(f'address {i}', (i, i))
+
+    clock.now += 1
+    assert cache.get('address 0')[0] # address 0 vừa được dùng, address 1 và 2 cũ nhất
+
+    clock.now += 1
+    cache.set('address 10', (10, 10))
+    # Vượt max_entries: xóa phần vượt và thêm EVICTION_RATIO * max_entries
+    assert cache.info().currsize == 9
+    assert cache.get('address 0')[0] and cache.get('address 10')[0]
+    assert not cache.get('address 1')[0] and not cache.get('address 2')[0]
+
+
+def test_export_import_round_trip(path, tmp_path, clock):
+    cache = GeocodeCache(path, ttl=100)
+    cache.set_many([('a', (1.0, 2.0)), ('b', None)], created_at=clock.now - 50)
+    cache.set_many([('expired', (3.0, 4.0))], created_at=clock.now - 200)
+
+    export_path = str(tmp_path / 'geocodes.jsonl')
+    assert cache.export_entries(export_path) == 2
+    with open(export_path, encoding='utf-8') as f:
+        assert [json.loads(line)['query'] for line in f] == ['a', 'b']
+
+    other = GeocodeCache(str(tmp_path / 'other.db'), ttl=100)
+    other.set('a', (9.0, 9.0))
+    assert other.import_entries(export_path) == 1 # a đã có, giữ lại
+    assert other.get('a') == (True, (9.0, 9.0))
+    assert other.get('b') == (True, None)
+
+    assert other.import_entries(export_path, overwrite=True) == 2
+    assert other.get('a') == (True, (1.0, 2.0))
+
+    # Giữ created_at gốc: hết hạn theo thời điểm geocode, không theo thời điểm import
+    clock.now += 60
+    assert other.get('a') == (False, None)
+
+
+def write_entries(path: str, worker: int, n: int=50):
+    cache = GeocodeCache(path, max_entries=10000)
+    for i in range(n):
+        cache.set(f'worker {worker} address {i}', (worker, i))
+    return [cache.get(f'worker {worker} address {i}') for i in range(n)]
+
+
+@pytest.mark.parametrize('executor_class', [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_concurrent_writers(path, executor_class):
+    cache = GeocodeCache(path)
+    cache.set('before', (0.0, 0.0)) # Connection của process cha mở trước khi fork
+
+    with executor_class(4) as executor:
+        results = list(executor.map(write_entries, [path] * 4, range(4)))
+
+    assert results == [[(True, (worker, i)) for i in range(50)] for worker in range(4)]
+    assert cache.info().currsize == 4 * 50 + 1
+    assert cache._connect().execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_cached_geocoder(path):
+    calls = []
+
+    def geocoder(address):
+        calls.append(address)
+        return None if 'unknown' in address else (21.0, 105.8)
+
+    cached = CachedGeocoder(geocoder, path)
+    assert [cached('known'), cached('unknown'), cached('Known'), cached('unknown')] == [(21.0, 105.8), None, (21.0, 105.8), None]
+    assert calls == ['known', 'unknown']
+
+    # Cache trên đĩa dùng lại được ở lần chạy sau
+    assert CachedGeocoder(geocoder, GeocodeCache(path))('known') == (21.0, 105.8)
+    assert len(calls) == 2
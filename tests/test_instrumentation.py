@@ -0,0 +1,87 @@
+import pytest
+
+from vietnamadminunits import instrumentation, parse_address, parse_addresses, convert_address, cache_clear
+
+ADDRESSES = ['70 Nguyễn Sỹ Sách, P15, Tân Bình, HCM', 'Trúc Bạch, Ba Đình, Hà Nội', 'Ba Đình, Hà Nội']
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    # Kết quả đã cache thì không đi qua parser, không có gì để đo
+    cache_clear()
+    yield
+    instrumentation.disable()
+    cache_clear()
+
+
+def test_disabled_by_default():
+    parse_address(ADDRESSES[0], mode='LEGACY')
+    assert not instrumentation.is_enabled()
+    assert instrumentation.get_stats() == {}
+    assert instrumentation.get_slow_log() == []
+
+
+def test_enable_records_stages():
+    expected = parse_addresses(ADDRESSES, mode='LEGACY')
+
+    instrumentation.enable()
+    assert parse_addresses(ADDRESSES + ADDRESSES, mode='LEGACY') == expected + expected # Không đổi kết quả
+    convert_address(ADDRESSES[0])
+    stats = instrumentation.get_stats()
+
+    # Các dòng trùng chỉ được đo lần đầu
+    assert stats['LEGACY.total']['calls'] == len(ADDRESSES) + 1
+    assert stats['LEGACY.normalize']['calls'] == len(ADDRESSES) + 1
+    assert stats['CONVERT_2025.total']['calls'] == 1
+    assert all(s['hits'] <= s['calls'] and s['seconds'] >= 0 for s in stats.values())
+    assert stats['LEGACY.total']['mean_us'] == pytest.approx(stats['LEGACY.total']['seconds'] / stats['LEGACY.total']['calls'] * 1e6)
+
+
+def test_disable_and_reset():
+    instrumentation.enable(slow_threshold_ms=0)
+    parse_address(ADDRESSES[0], mode='LEGACY')
+    assert instrumentation.get_stats() and instrumentation.get_slow_log()
+
+    instrumentation.reset()
+    assert instrumentation.is_enabled()
+    assert instrumentation.get_stats() == {} and instrumentation.get_slow_log() == []
+
+    parse_address(ADDRESSES[1], mode='LEGACY')
+    assert instrumentation.get_stats()['LEGACY.total']['calls'] == 1
+
+    instrumentation.disable()
+    assert instrumentation.get_stats() == {}
+    cache_clear()
+    parse_address(ADDRESSES[2], mode='LEGACY')
+    assert instrumentation.get_stats() == {}
+
+    # enable() bỏ số liệu cũ
+    instrumentation.enable()
+    assert instrumentation.get_stats() == {}
+
+
+def test_slow_log_threshold():
+    instrumentation.enable(slow_threshold_ms=60_000)
+    parse_addresses(ADDRESSES, mode='LEGACY')
+    assert instrumentation.get_slow_log() == []
+
+    instrumentation.enable(slow_threshold_ms=0, slow_log_size=2)
+    parse_addresses(ADDRESSES, mode='LEGACY')
+    slow_log = instrumentation.get_slow_log()
+    # Chỉ giữ slow_log_size địa chỉ mới nhất
+    assert [entry['address'] for entry in slow_log] == ADDRESSES[1:]
+    assert all(entry['dataset'] == 'LEGACY' and entry['ms'] >= 0 for entry in slow_log)
+
+    instrumentation.enable()
+    parse_addresses(ADDRESSES, mode='LEGACY')
+    assert instrumentation.get_slow_log() == []
+
+
+def test_hook():
+    events = []
+    instrumentation.enable(hook=events.append)
+    parse_address(ADDRESSES[0], mode='FROM_2025')
+
+    assert events and set(events[0]) == {'dataset', 'stage', 'seconds', 'hit'}
+    assert [e['stage'] for e in events if e['stage'] == 'total'] == ['total']
+    assert sum(s['calls'] for s in instrumentation.get_stats().values()) == len(events)
@@ -0,0 +1,36 @@
+import pickle
+
+from vietnamadminunits import locate, locate_many
+from vietnamadminunits.parser import locator
+from vietnamadminunits.snapshot import DATA_DIR, get_snapshot_path
+
+
+def test_locate_nearest_centroid():
+    assert locate(21.0285, 105.8542).ward == 'Phường Hoàn Kiếm'
+    assert locate(21.0285, 105.8542, mode='LEGACY').ward == 'Phường Lý Thái Tổ'
+    assert locate_many([21.0285, None, 48.85], [105.8542, None, 2.35])[1:] == [None, None]
+
+
+def test_missing_coordinates():
+    assert locate(None, None) is None
+    assert locate(float('nan'), 105.8) is None
+    assert locate(21.0285, float('nan'), mode='LEGACY') is None
+    assert locate_many([float('nan'), 21.0285], [105.8, None]) == [None, None]
+
+
+def test_max_distance_km_limits_distance_to_centroid():
+    unit = locate(21.0285, 105.8542)
+    assert locate(unit.latitude, unit.longitude, max_distance_km=0.001) == unit
+    assert locate(unit.latitude + 0.1, unit.longitude, max_distance_km=1) is None # Cách mọi centroid hơn 1 km
+
+
+def test_grid_constants_in_snapshot_header():
+    locator.get_index('FROM_2025')
+    path = get_snapshot_path('locator_parser_from_2025', DATA_DIR)
+    if not path.exists():
+        path = get_snapshot_path('locator_parser_from_2025')
+    with open(path, 'rb') as f:
+        header = pickle.load(f)
+    assert header['build'] == locator.INDEX_VERSION
+    assert header['build']['CELL_SIZE_KM'] == locator.CELL_SIZE_KM
+    assert header['build']['GRID_MARGIN_KM'] == locator.GRID_MARGIN_KM
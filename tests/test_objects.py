@@ -0,0 +1,57 @@
+import copy
+import pickle
+
+import pytest
+
+from vietnamadminunits import parse_address
+from vietnamadminunits.parser.objects import AdminUnit
+
+
+def test_admin_unit_is_immutable():
+    unit = parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM')
+
+    with pytest.raises(AttributeError):
+        unit.street = 'Đường 15'
+    with pytest.raises(AttributeError):
+        del unit.ward
+
+    assert unit.with_street('Đường 15').street == 'Đường 15'
+    assert unit.replace(ward='Phường Tân Sơn Nhì').ward == 'Phường Tân Sơn Nhì'
+    assert copy.deepcopy(unit) is unit
+
+
+def test_vars_returns_a_copy():
+    unit = parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM')
+
+    assert vars(unit) == unit.__dict__ == unit.to_dict()
+    vars(unit)['street'] = None
+    assert unit.street == '70 Nguyễn Sỹ Sách'
+
+
+def test_pickle_round_trip_shares_base():
+    units = [parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM'), parse_address('59 Nguyễn Sỹ Sách, Tân Sơn, HCM'), AdminUnit()]
+    restored = pickle.loads(pickle.dumps(units))
+
+    assert restored == units
+    assert restored[0]._base is restored[1]._base is units[0]._base
+    assert [unit.street for unit in restored] == ['70 Nguyễn Sỹ Sách', '59 Nguyễn Sỹ Sách', None]
+
+
+def test_only_package_units_are_interned():
+    from vietnamadminunits.parser.objects import BASES
+
+    units = [parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM'), parse_address('59 Nguyễn Sỹ Sách, Tân Sơn, HCM')]
+    assert units[0]._base is units[1]._base
+
+    n_bases = len(BASES)
+    custom = AdminUnit(province='Tỉnh Không Có', ward='Phường 1')
+    pickle.loads(pickle.dumps(custom.replace(ward='Phường 2')))
+    assert len(BASES) == n_bases
+
+
+def test_equality_is_by_value():
+    unit = parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM')
+    copy_unit = AdminUnit(**unit.to_dict())
+
+    assert copy_unit is not unit and copy_unit == unit and hash(copy_unit) == hash(unit)
+    assert len({unit, copy_unit, unit.with_street(None)}) == 2
@@ -0,0 +1,85 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from vietnamadminunits import parse_address
+from vietnamadminunits.pandas import standardize_admin_unit_columns, convert_address_column
+from vietnamadminunits.pandas.main import factorize_columns
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'ward': ['Trúc Bạch', None, 'p12', 'Trúc Bạch', None],
+        'district': ['Ba Đình', 'Ba Đình', 'Tân Bình', 'Ba Đình', 'Ba Đình'],
+        'province': ['Hà Nội', 'Hà Nội', 'HCM', 'Hà Nội', 'Hà Nội'],
+    }, index=[10, 11, 12, 13, 14])
+
+
+def test_factorize_columns_keeps_nan_as_a_value(df):
+    row_codes, first_rows = factorize_columns(df, ['ward', 'district', 'province'])
+    assert row_codes.tolist() == [0, 1, 2, 0, 1]
+    assert first_rows.tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(district='district', ward='ward', parse_mode='LEGACY'),
+    dict(district='district', ward='ward', parse_mode='LEGACY', inplace=True),
+    dict(district='district', ward='ward', convert_mode='CONVERT_2025'),
+])
+def test_low_memory_matches_default(df, kwargs):
+    expected = standardize_admin_unit_columns(df, province='province', show_progress=False, **kwargs)
+    result = standardize_admin_unit_columns(df, province='province', show_progress=False, low_memory=True, **kwargs)
+    assert result.index.tolist() == df.index.tolist()
+    assert result.reset_index(drop=True).equals(expected)
+
+    result = standardize_admin_unit_columns(df, province='province', show_progress=False, low_memory=True, dtype='category', **kwargs)
+    assert result.astype(object).reset_index(drop=True).equals(expected.astype(object))
+
+
+def test_code_dtype(df):
+    result = standardize_admin_unit_columns(df, province='province', district='district', ward='ward', parse_mode='LEGACY', show_progress=False, low_memory=True, dtype='code')
+    assert result['standardized_ward'].tolist() == [4, -1, 26971, 4, -1]
+    assert result['standardized_province'].tolist() == [1, 1, 79, 1, 1]
+
+
+def test_convert_address_column_low_memory(df):
+    df['address'] = ['Trúc Bạch, Ba Đình, Hà Nội', None, 'p12, Tân Bình, HCM', 'Trúc Bạch, Ba Đình, Hà Nội', None]
+    expected = convert_address_column(df, 'address', show_progress=False)
+    result = convert_address_column(df, 'address', show_progress=False, low_memory=True)
+    assert result.reset_index(drop=True).equals(expected)
+
+
+def test_from_2025_with_district_column_matches_joined_address():
+    df = pd.DataFrame({'ward': ['Xã Xuân Đình'], 'district': ['Huyện Phúc Thọ'], 'province': ['Hà Nội']})
+    with pytest.warns(UserWarning, match='FROM_2025 mode is not support with the district level'):
+        result = standardize_admin_unit_columns(df, province='province', district='district', ward='ward', parse_mode='FROM_2025', show_progress=False)
+    expected = parse_address(',Xã Xuân Đình,Huyện Phúc Thọ,Hà Nội', mode='FROM_2025', level=2, keep_street=False)
+    assert result['standardized_ward'].tolist() == [expected.short_ward]
+    assert result['standardized_province'].tolist() == [expected.short_province]
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(district='district', ward='ward', parse_mode='LEGACY'),
+    dict(ward='ward', parse_mode='FROM_2025'),
+    dict(district='district', ward='ward', convert_mode='CONVERT_2025'),
+])
+def test_n_jobs_and_executor_match_serial(df, kwargs):
+    from concurrent.futures import ProcessPoolExecutor
+    from vietnamadminunits.pandas import init_worker
+
+    expected = standardize_admin_unit_columns(df, province='province', show_progress=False, **kwargs)
+    assert standardize_admin_unit_columns(df, province='province', show_progress=False, n_jobs=2, **kwargs).equals(expected)
+
+    initargs = (kwargs.get('parse_mode'), kwargs.get('convert_mode'))
+    with ProcessPoolExecutor(2, initializer=init_worker, initargs=initargs) as executor:
+        assert standardize_admin_unit_columns(df, province='province', show_progress=False, executor=executor, n_jobs=2, **kwargs).equals(expected)
+        # Không có n_jobs: chia chunk theo số CPU
+        assert standardize_admin_unit_columns(df, province='province', show_progress=False, executor=executor, **kwargs).equals(expected)
+
+
+def test_convert_address_column_n_jobs_matches_serial(df):
+    df['address'] = ['Trúc Bạch, Ba Đình, Hà Nội', None, 'p12, Tân Bình, HCM', 'Trúc Bạch, Ba Đình, Hà Nội', None]
+    expected = convert_address_column(df, 'address', show_progress=False)
+    assert convert_address_column(df, 'address', show_progress=False, n_jobs=2).equals(expected)
+    assert convert_address_column(df, 'address', show_progress=False, n_jobs=2, low_memory=True).reset_index(drop=True).equals(expected)
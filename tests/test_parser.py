@@ -0,0 +1,23 @@
+import pytest
+
+from vietnamadminunits import parse_address
+from vietnamadminunits.parser.objects import AdminUnit
+
+
+def test_parse_address():
+    unit = parse_address('70 Nguyễn Sỹ Sách, Tân Sơn, HCM')
+    assert (unit.street, unit.ward, unit.province) == ('70 Nguyễn Sỹ Sách', 'Phường Tân Sơn', 'Thành phố Hồ Chí Minh')
+
+    unit = parse_address('70 Nguyễn Sỹ Sách, P15, Tân Bình, HCM', mode='LEGACY')
+    assert (unit.street, unit.ward, unit.district) == ('70 Nguyễn Sỹ Sách', 'Phường 15', 'Quận Tân Bình')
+
+
+@pytest.mark.parametrize('mode', ['FROM_2025', 'LEGACY'])
+def test_empty_address(mode):
+    assert parse_address('', mode=mode) == AdminUnit(show_district=mode == 'LEGACY')
+    assert parse_address(' , , ', mode=mode).province is None
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        parse_address('Ba Đình, Hà Nội', mode='FROM_2026')
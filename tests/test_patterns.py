@@ -0,0 +1,23 @@
+from vietnamadminunits import parse_address
+from vietnamadminunits.parser.patterns import PatternRegistry, PATTERN_REGISTRY
+
+
+def test_pattern_registry_hit_and_eviction():
+    registry = PatternRegistry(maxsize=1)
+    DICT_UNIT = {'phuongbadinh': {'wardKeywords': ['badinh']}, 'phuonghoankiem': {'wardKeywords': ['hoankiem']}}
+
+    pattern = registry.get(('TEST', None, None, 'A'), DICT_UNIT, 'wardKeywords')
+    assert registry.get(('TEST', None, None, 'A'), DICT_UNIT, 'wardKeywords') is pattern
+
+    registry.get(('TEST', None, None, 'B'), DICT_UNIT, 'wardKeywords')
+    assert ('TEST', None, None, 'A') not in registry and len(registry) == 1
+
+    registry.clear()
+    assert len(registry) == 0
+    assert registry.get(('TEST', None, None, 'A'), DICT_UNIT, 'wardKeywords') is not pattern
+
+
+def test_pattern_registry_is_filled_on_demand():
+    PATTERN_REGISTRY.clear()
+    parse_address('Ba Đình, Hà Nội', mode='LEGACY')
+    assert len(PATTERN_REGISTRY) > 0
@@ -0,0 +1,41 @@
+import pytest
+
+from vietnamadminunits import snapshot
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('VIETNAMADMINUNITS_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv('VIETNAMADMINUNITS_CACHE_DIR', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert snapshot.get_cache_dir() == tmp_path / 'vietnamadminunits'
+
+
+def test_build_version_invalidates_snapshot(cache_dir):
+    calls = []
+
+    def build(street_data):
+        calls.append(1)
+        return {'size': len(street_data)}
+
+    data = snapshot.load_data('converter_2025_street', build, version='test-1')
+    assert (cache_dir / 'converter_2025_street.pickle').exists()
+    assert snapshot.load_data('converter_2025_street', build, version='test-1') == data
+    assert len(calls) == 1 # Đọc từ snapshot trong cache
+
+    snapshot.load_data('converter_2025_street', build, version='test-2')
+    assert len(calls) == 2
+
+
+def test_unwritable_cache_warns(tmp_path, monkeypatch):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setenv('VIETNAMADMINUNITS_CACHE_DIR', str(blocker / 'cache'))
+
+    with pytest.warns(RuntimeWarning):
+        data = snapshot.load_data('converter_2025_street', lambda street_data: street_data, version='test-unwritable')
+    assert 'DICT_PROVINCE_DIVIDED_WARD_STREET' in data
@@ -1,2 +1,3 @@
-from .parser import parse_address, ParseMode
-from .converter import convert_address, ConvertMode
\ No newline at end of file
+from .parser import parse_address, parse_addresses, parse_addresses_columnar, parse_components, parse_components_many, locate, locate_many, lookup_by_code, lookup_by_codes, ParseMode
+from .converter import convert_address, convert_addresses, convert_addresses_columnar, convert_addresses_async, convert_addresses_as_completed, reverse_convert_address, reverse_convert_addresses, convert_code, convert_codes, ConvertMode
+from .cache import cache_info, cache_clear, cache_resize
\ No newline at end of file
@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+from .parser.normalizer import normalize_text
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+DEFAULT_MAXSIZE = 4096
+
+
+def is_hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class ResultCache:
+    '''
+    Thread-safe LRU cache of AdminUnit results.
+
+    Key is `(normalized_address, options)`, eg: options is `(level, keep_street)` for parsers, one cache per mode.
+    AdminUnit is immutable, so cached results are returned as is and a caller cannot change a cached entry.
+    '''
+
+    def __init__(self, maxsize: int=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, address: str, options: tuple, parse):
+        '''
+        :param address: Raw address.
+        :param options: Options that change the result of parse, eg: `(level, keep_street)`. Results of unhashable options are not cached.
+        :param parse: Function that takes the address and returns an AdminUnit.
+        :return: AdminUnit object.
+        '''
+        if self.maxsize == 0 or not is_hashable(options):
+            # Options không hash được, eg: một geocoder là object callable không hash được: không cache
+            return parse(address)
+
+        unit = self.lookup(address, options)
+        if unit is None:
+            # Parse ngoài lock để các thread khác không phải chờ
+            unit = parse(address)
+            self.store(address, options, unit)
+        return unit
+
+    def lookup(self, address: str, options: tuple):
+        '''
+        :param address: Raw address.
+        :param options: See `get_or_parse()`.
+        :return: Cached AdminUnit object, or None (counted as a miss).
+        '''
+        key = (normalize_text(address), options)
+        with self._lock:
+            unit = self._results.get(key)
+            if unit is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return unit
+            self.misses += 1
+        return None
+
+    def store(self, address: str, options: tuple, unit):
+        '''
+        :param address: Raw address.
+        :param options: See `get_or_parse()`.
+        :param unit: AdminUnit object.
+        '''
+        if self.maxsize == 0:
+            return
+        key = (normalize_text(address), options)
+        with self._lock:
+            self._results[key] = unit
+            self._results.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        if self.maxsize is not None:
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def info(self):
+        '''
+        :return: CacheInfo(hits, misses, maxsize, currsize)
+        '''
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def resize(self, maxsize: int):
+        '''
+        :param maxsize: Max number of results, `0` to disable, `None` for unbounded.
+        '''
+        with self._lock:
+            self.maxsize = maxsize
+            if maxsize == 0:
+                self._results.clear()
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+RESULT_CACHES = {
+    'FROM_2025': ResultCache(),
+    'LEGACY': ResultCache(),
+    'CONVERT_2025': ResultCache(),
+}
+
+
+def get_result_caches(mode=None):
+    '''
+    :param mode: `'FROM_2025'`, `'LEGACY'`, `'CONVERT_2025'` or their enums. Default `None` for all modes.
+    :return: dict, mode -> ResultCache
+    '''
+    if mode is None:
+        return RESULT_CACHES
+    mode = getattr(mode, 'value', mode)
+    if mode not in RESULT_CACHES:
+        raise ValueError(f"Invalid mode. Available modes are {list(RESULT_CACHES)}.")
+    return {mode: RESULT_CACHES[mode]}
+
+
+def cache_info(mode=None):
+    '''
+    Statistics of the result cache of `parse_address()` and `convert_address()`.
+
+    :param mode: `'FROM_2025'`, `'LEGACY'` or `'CONVERT_2025'`. Default `None` for all modes.
+    :return: CacheInfo(hits, misses, maxsize, currsize) of the mode, or a dict of them if mode is None.
+    '''
+    infos = {m: cache.info() for m, cache in get_result_caches(mode).items()}
+    return infos if mode is None else next(iter(infos.values()))
+
+
+def cache_clear(mode=None):
+    '''
+    Remove all cached results and reset statistics.
+
+    :param mode: `'FROM_2025'`, `'LEGACY'` or `'CONVERT_2025'`. Default `None` for all modes.
+    '''
+    for cache in get_result_caches(mode).values():
+        cache.clear()
+
+
+def cache_resize(maxsize: int, mode=None):
+    '''
+    Set the max number of cached results, least recently used results are evicted first.
+
+    :param maxsize: Max number of results per mode, `0` to disable the cache, `None` for unbounded.
+    :param mode: `'FROM_2025'`, `'LEGACY'` or `'CONVERT_2025'`. Default `None` for all modes.
+    '''
+    for cache in get_result_caches(mode).values():
+        cache.resize(maxsize)
@@ -0,0 +1,352 @@
+'''
+Command line interface, see `python -m vietnamadminunits --help`.
+
+Rows are streamed from a CSV or JSONL file (or stdin) in chunks and written after each chunk, so memory use does not depend on the input size.
+'''
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .cache import ResultCache
+from .converter import ConvertMode
+from .parser import ParseMode
+from .parser.objects import FIELDS
+
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_CACHE_SIZE = 100000
+
+# `address` là địa chỉ đầy đủ từ get_address(), show_district chỉ dùng để hiển thị
+OUTPUT_FIELDS = [f for f in FIELDS if f not in ['address', 'show_district']] + ['address']
+
+DEFAULT_FIELDS = {
+    'FROM_2025': ['street', 'ward', 'province'],
+    'LEGACY': ['street', 'ward', 'district', 'province'],
+}
+
+
+# WORKERS
+
+def run_job(values: list, job: tuple):
+    '''
+    :param values: Distinct addresses.
+    :param job: `(kind, mode, level, keep_street, geocoder)`, kind is `'parse'` or `'convert'`.
+    :return: List of AdminUnit objects.
+    '''
+    from . import parse_addresses, convert_addresses
+
+    kind, mode, level, keep_street, geocoder = job
+    if kind == 'convert':
+        return convert_addresses(values, mode=mode, geocoder=geocoder)
+    return parse_addresses(values, mode=mode, keep_street=keep_street, level=level)
+
+
+# INPUT / OUTPUT
+
+def detect_format(path: str):
+    return 'jsonl' if os.path.splitext(path)[1].lower() in ['.jsonl', '.ndjson'] else 'csv'
+
+
+def open_stream(path: str, mode: str, encoding: str):
+    if path == '-':
+        stream = sys.stdin if mode == 'r' else sys.stdout
+        return io.TextIOWrapper(stream.buffer, encoding=encoding, newline='')
+    return open(path, mode, encoding=encoding, newline='')
+
+
+class RowReader:
+    '''
+    Iterate rows of a CSV or JSONL stream as dicts.
+    '''
+
+    def __init__(self, stream, fmt: str):
+        self.fmt = fmt
+        if fmt == 'csv':
+            self._rows = csv.DictReader(stream)
+            self.fieldnames = self._rows.fieldnames or []
+        else:
+            self._rows = (json.loads(line) for line in stream if line.strip())
+            self.fieldnames = None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class RowWriter:
+    '''
+    Write rows to a CSV or JSONL stream, the CSV header is written with the first chunk.
+    Without fieldnames (JSONL input), the header is the union of the columns of the first chunk, a column first seen in a later chunk raises ValueError.
+    '''
+
+    def __init__(self, stream, fmt: str, fieldnames: list=None):
+        self.stream = stream
+        self.fmt = fmt
+        self.fieldnames = fieldnames
+        self._writer = None
+        self._n_rows = 0
+        # Chỉ kiểm tra khi header lấy từ dòng (JSONL input); với CSV input, trường thừa của dòng lỗi (key None của DictReader) được bỏ qua như trước
+        self._columns = None
+
+    def write(self, rows: list):
+        if self.fmt == 'jsonl':
+            self.stream.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        else:
+            if self._writer is None:
+                if self.fieldnames is None:
+                    self.fieldnames = list(dict.fromkeys(column for row in rows for column in row))
+                    self._columns = set(self.fieldnames)
+                self._writer = csv.DictWriter(self.stream, fieldnames=self.fieldnames, extrasaction='ignore', lineterminator='\n')
+                self._writer.writeheader()
+            for i, row in enumerate(rows if self._columns is not None else []):
+                # Header đã ghi rồi, không thể thêm cột: báo lỗi thay vì bỏ mất dữ liệu
+                if not self._columns.issuperset(row):
+                    extra = [column for column in row if column not in self._columns]
+                    raise ValueError(f'Row {self._n_rows + i + 1} has columns {extra} that are not in the CSV header {self.fieldnames}. Use --output-format jsonl or a larger --chunk-size.')
+            self._writer.writerows(rows)
+        self._n_rows += len(rows)
+        self.stream.flush()
+
+
+def iter_chunks(rows, chunk_size: int):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_chunks(rows, get_value, job: tuple, chunk_size: int, cache: ResultCache, executor=None, max_pending: int=1):
+    '''
+    Resolve an AdminUnit for every row, chunk by chunk. Distinct values of a chunk that are not in cache are processed once,
+    in executor if provided. With an executor, up to max_pending chunks are in flight, a value repeated in two of them may be processed twice.
+
+    :return: Generator of `(chunk, units)` in input order.
+    '''
+    pending = deque()
+
+    def finish(item):
+        chunk, values, units, misses, results = item
+        if executor:
+            results = results.result()
+        for value, unit in zip(misses, results):
+            units[value] = unit
+            cache.store(value, job, unit)
+        return chunk, [units[value] for value in values]
+
+    for chunk in iter_chunks(rows, chunk_size):
+        values = [get_value(row) for row in chunk]
+        units = {}
+        misses = []
+        for value in dict.fromkeys(values):
+            unit = cache.lookup(value, job)
+            if unit is None:
+                misses.append(value)
+            else:
+                units[value] = unit
+
+        if executor:
+            results = executor.submit(run_job, misses, job)
+        else:
+            results = run_job(misses, job) if misses else []
+        pending.append((chunk, values, units, misses, results))
+
+        while len(pending) >= max_pending:
+            yield finish(pending.popleft())
+
+    while pending:
+        yield finish(pending.popleft())
+
+
+# COMMANDS
+
+def get_cell(row: dict, column: str):
+    value = row.get(column)
+    return value if isinstance(value, str) else '' if value is None else str(value)
+
+
+def get_attribute(field: str, short_name: bool):
+    if field == 'address':
+        return lambda unit: unit.get_address(short_name=short_name)
+    return lambda unit: getattr(unit, field)
+
+
+def build_task(args, parser):
+    '''
+    :return: (job, get_value, outputs, drop_columns). outputs is a list of `(column, function(AdminUnit) -> value)`.
+    '''
+    short_name = not args.full_name
+
+    if args.command in ['parse', 'convert']:
+        if args.command == 'parse':
+            mode = ParseMode(args.mode).value
+            if mode == ParseMode.FROM_2025.value and args.level > 2:
+                parser.error('argument --level: FROM_2025 mode accepts 0, 1 or 2.')
+            job = ('parse', mode, args.level, not args.no_street, None)
+            fields = args.fields or DEFAULT_FIELDS[mode]
+        else:
+            job = ('convert', ConvertMode(args.mode).value, None, True, args.geocoder)
+            fields = args.fields or DEFAULT_FIELDS['FROM_2025']
+
+        for field in fields:
+            if field not in OUTPUT_FIELDS:
+                parser.error(f"Invalid field {field!r}. Available fields are {OUTPUT_FIELDS}.")
+        outputs = [(f'{args.prefix}{field}{args.suffix}', get_attribute(field, short_name)) for field in fields]
+        return job, lambda row: get_cell(row, args.column), outputs, []
+
+    # standardize, giống standardize_admin_unit_columns()
+    from .pandas.main import get_level
+
+    if args.convert_mode:
+        if not args.district or not args.ward:
+            warnings.warn('The names of the District or Ward columns are not provided. Therefore, only the Province level will be converted.', UserWarning)
+        job = ('convert', ConvertMode(args.convert_mode).value, None, False, None)
+    else:
+        mode = ParseMode(args.mode).value
+        if mode == ParseMode.FROM_2025.value and args.district:
+            warnings.warn('FROM_2025 mode is not support with the district level.', UserWarning)
+        if mode == ParseMode.LEGACY.value and args.ward and not args.district:
+            parser.error('The name of the district column must be provided in order to parse the ward data.')
+        job = ('parse', mode, get_level(parse_mode=mode, convert_mode=None, district=args.district, ward=args.ward), False, None)
+
+    admin_unit_columns = [c for c in [args.ward, args.district, args.province] if c]
+    outputs = []
+    for col_type, col_name in zip(['province', 'district', 'ward'], [args.province, args.district, args.ward]):
+        if not col_name or (col_type == 'district' and args.convert_mode):
+            continue
+        target_col = col_name if args.inplace else f'{args.prefix}{col_name}{args.suffix}'
+        outputs.append((target_col, get_attribute(f"{'short_' if short_name else ''}{col_type}", short_name)))
+
+    get_value = lambda row: ''.join(',' + get_cell(row, c) for c in admin_unit_columns)
+    drop_columns = [c for c in admin_unit_columns if c not in [target_col for target_col, _ in outputs]] if args.inplace else []
+    return job, get_value, outputs, drop_columns
+
+
+def run(args, parser):
+    job, get_value, outputs, drop_columns = build_task(args, parser)
+
+    fmt = args.format or ('csv' if args.input == '-' else detect_format(args.input))
+    output_format = args.output_format or fmt
+
+    input_stream = open_stream(args.input, 'r', args.encoding)
+    output_stream = open_stream(args.output, 'w', args.encoding)
+    executor = None
+    try:
+        reader = RowReader(input_stream, fmt)
+        fieldnames = None
+        if reader.fieldnames is not None:
+            fieldnames = [c for c in reader.fieldnames if c not in drop_columns]
+            fieldnames += [c for c, _ in outputs if c not in fieldnames]
+        writer = RowWriter(output_stream, output_format, fieldnames)
+
+        if args.jobs > 1:
+            from .pandas.main import init_worker
+            initargs = (None, job[1]) if job[0] == 'convert' else (job[1], None)
+            executor = ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=initargs)
+
+        progress_bar = None
+        if args.progress:
+            from tqdm import tqdm
+            progress_bar = tqdm(desc='Rows', unit=' rows', file=sys.stderr)
+
+        cache = ResultCache(maxsize=args.cache_size)
+        for chunk, units in process_chunks(reader, get_value, job, args.chunk_size, cache, executor, max_pending=args.jobs * 2 if executor else 1):
+            for row, unit in zip(chunk, units):
+                for column in drop_columns:
+                    row.pop(column, None)
+                for column, get_output in outputs:
+                    row[column] = get_output(unit)
+            writer.write(chunk)
+            if progress_bar is not None:
+                progress_bar.update(len(chunk))
+
+        if progress_bar is not None:
+            progress_bar.close()
+    finally:
+        if executor:
+            executor.shutdown()
+        if args.input != '-':
+            input_stream.close()
+        if args.output != '-':
+            output_stream.close()
+        else:
+            output_stream.detach() # Không đóng sys.stdout
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m vietnamadminunits', description='Parse, convert and standardize Vietnamese addresses in CSV or JSONL files.')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    io_parser = argparse.ArgumentParser(add_help=False)
+    io_parser.add_argument('input', nargs='?', default='-', help='Input file, `-` for stdin. Default `-`.')
+    io_parser.add_argument('-o', '--output', default='-', help='Output file, `-` for stdout. Default `-`.')
+    io_parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format. Default from the file extension, csv for stdin.')
+    io_parser.add_argument('--output-format', choices=['csv', 'jsonl'], help='Output format. Default the input format.')
+    io_parser.add_argument('--encoding', default='utf-8', help='Encoding of input and output. Default utf-8.')
+    io_parser.add_argument('--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE, help=f'Rows per chunk. Default {DEFAULT_CHUNK_SIZE}.')
+    io_parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help=f'Max distinct values remembered across chunks. Default {DEFAULT_CACHE_SIZE}.')
+    io_parser.add_argument('-j', '--jobs', type=positive_int, default=1, help='Number of worker processes. Default 1.')
+    io_parser.add_argument('--full-name', action='store_true', help='Use full names instead of short names for `address` and standardized columns.')
+    io_parser.add_argument('--suffix', default='', help='Added to new column names.')
+    io_parser.add_argument('--progress', action='store_true', help='Display a progress bar on stderr.')
+
+    fields_help = f'Comma-separated AdminUnit attributes to output, available: {", ".join(OUTPUT_FIELDS)}.'
+
+    parse_parser = subparsers.add_parser('parse', parents=[io_parser], help='Parse an address column.')
+    parse_parser.add_argument('-c', '--column', default='address', help='Address column. Default `address`.')
+    parse_parser.add_argument('--mode', choices=ParseMode.available(value=True), default=ParseMode.latest().value, help=f'Default {ParseMode.latest().value}.')
+    parse_parser.add_argument('--level', type=int, choices=[0, 1, 2, 3], default=0, help='1 or 2 for FROM_2025, 1, 2 or 3 for LEGACY. Default 0 for highest level automatically.')
+    parse_parser.add_argument('--no-street', action='store_true', help='Do not extract streets.')
+    parse_parser.add_argument('--fields', type=comma_list, help=fields_help + ' Default street, ward, (district), province.')
+    parse_parser.add_argument('--prefix', default='parsed_', help='Added to new column names. Default `parsed_`.')
+
+    convert_parser = subparsers.add_parser('convert', parents=[io_parser], help='Convert a 63-province address column to 34-province.')
+    convert_parser.add_argument('-c', '--column', default='address', help='Address column. Default `address`.')
+    convert_parser.add_argument('--mode', choices=[m.value for m in ConvertMode.forward()], default=ConvertMode.CONVERT_2025.value, help='Default CONVERT_2025.')
+    convert_parser.add_argument('--geocoder', choices=['ARCGIS'], help='Geocode divided wards online. Default offline.')
+    convert_parser.add_argument('--fields', type=comma_list, help=fields_help + ' Default street, ward, province.')
+    convert_parser.add_argument('--prefix', default='converted_', help='Added to new column names. Default `converted_`.')
+
+    standardize_parser = subparsers.add_parser('standardize', parents=[io_parser], help='Standardize province, district and ward columns, like `standardize_admin_unit_columns()`.')
+    standardize_parser.add_argument('--province', required=True, help='Province column.')
+    standardize_parser.add_argument('--district', help='District column.')
+    standardize_parser.add_argument('--ward', help='Ward column.')
+    standardize_parser.add_argument('--mode', choices=ParseMode.available(value=True), default=ParseMode.latest().value, help=f'Parse mode. Default {ParseMode.latest().value}.')
+    standardize_parser.add_argument('--convert-mode', choices=[m.value for m in ConvertMode.forward()], help='Convert instead of parse, ignores --mode.')
+    standardize_parser.add_argument('--inplace', action='store_true', help='Replace the original columns.')
+    standardize_parser.add_argument('--prefix', default='standardized_', help='Added to new column names. Default `standardized_`.')
+
+    return parser
+
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError('must be a positive integer')
+    return value
+
+
+def comma_list(value):
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        run(args, parser)
+    except ValueError as e:
+        parser.exit(2, f'{parser.prog}: error: {e}\n')
+    except BrokenPipeError:
+        # Output bị đóng sớm, eg: `| head`
+        sys.stderr.close()
+        return 1
+    return 0
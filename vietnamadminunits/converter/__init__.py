@@ -1,10 +1,35 @@
-from .converter_2025 import convert_address_2025
 from enum import Enum
 from typing import Union
 
+from ..cache import RESULT_CACHES
+
+
+# Dữ liệu converter chỉ được load khi dùng lần đầu, để import vietnamadminunits nhanh
+def __getattr__(name):
+    if name == 'convert_address_2025':
+        from .converter_2025 import convert_address_2025
+        return convert_address_2025
+    if name == 'convert_addresses_2025':
+        from .converter_2025 import convert_addresses_2025
+        return convert_addresses_2025
+    if name == 'reverse_address_2025':
+        from .reverse_2025 import reverse_address_2025
+        return reverse_address_2025
+    if name == 'reverse_addresses_2025':
+        from .reverse_2025 import reverse_addresses_2025
+        return reverse_addresses_2025
+    if name == 'convert_code_2025':
+        from .codes_2025 import convert_code_2025
+        return convert_code_2025
+    if name == 'convert_codes_2025':
+        from .codes_2025 import convert_codes_2025
+        return convert_codes_2025
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class ConvertMode(Enum):
     CONVERT_2025 = "CONVERT_2025"  # From LEGACY → MERGER_2025
+    REVERSE_2025 = "REVERSE_2025"  # From MERGER_2025 → LEGACY, see reverse_convert_address()
 
     @classmethod
     def available(cls, value=False):
@@ -13,17 +38,190 @@ class ConvertMode(Enum):
             attrs = [a.value for a in attrs]
         return attrs
 
+    @classmethod
+    def forward(cls):
+        '''
+        :return: Modes from 63-province to 34-province, accepted by `convert_address()` and the other `convert_*` functions.
+        '''
+        return [m for m in cls if m.name.startswith('CONVERT_')]
+
+    @classmethod
+    def reverse(cls):
+        '''
+        :return: Modes from 34-province to 63-province, accepted by `reverse_convert_address()` and `reverse_convert_addresses()`.
+        '''
+        return [m for m in cls if m.name.startswith('REVERSE_')]
+
 
-def convert_address(address: str, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025):
+def invalid_mode_error(mode, modes: list):
+    '''
+    :param mode: Mode given by the caller.
+    :param modes: ConvertMode members accepted by the function, eg: `ConvertMode.forward()`.
+    :return: ValueError to raise.
+    '''
+    value = getattr(mode, 'value', mode)
+    message = f"Invalid mode {value!r}. Available modes are {[m.value for m in modes]}."
+    # Mode có tồn tại nhưng sai chiều chuyển đổi
+    if value in [m.value for m in ConvertMode.reverse() if m not in modes]:
+        message += ' Use reverse_convert_address() for REVERSE modes.'
+    elif value in [m.value for m in ConvertMode.forward() if m not in modes]:
+        message += ' Use convert_address() for CONVERT modes.'
+    return ValueError(message)
+
+
+def convert_address(address: str, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, geocoder=None):
     '''
     Converts an address from the 63-province format to a standardized 34-province `AdminUnit`.
 
     :param address: Best format *"(street), ward, district, province"*. Case is ignored, accents are usually ignored except in rare cases.
     :param mode: Currently, only `'CONVERT_2025'` is supported.
-    :return: AdminUnit object.
+    :param geocoder: Locate the street of a divided old ward. Default `None` is offline: a packaged street index, then the default new ward. `'ARCGIS'` or a function `address -> (latitude, longitude)` enables network geocoding.
+    :return: AdminUnit object. Results are cached, see `cache_info()`.
+    '''
+
+    if mode in [ConvertMode.CONVERT_2025, ConvertMode.CONVERT_2025.value]:
+        from .converter_2025 import convert_address_2025
+        return RESULT_CACHES['CONVERT_2025'].get_or_parse(address, (geocoder,), lambda x: convert_address_2025(x, geocoder=geocoder))
+    else:
+        raise invalid_mode_error(mode, ConvertMode.forward())
+
+
+def convert_addresses(addresses, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, geocoder=None):
+    '''
+    Converts many addresses from the 63-province format to standardized 34-province `AdminUnit` objects.
+    Duplicated addresses are parsed, geocoded and converted only once.
+
+    :param addresses: Iterable of addresses, see `convert_address()`.
+    :param mode: Currently, only `'CONVERT_2025'` is supported.
+    :param geocoder: Locate the street of a divided old ward. Default `None` is offline: a packaged street index, then the default new ward. `'ARCGIS'` or a function `address -> (latitude, longitude)` enables network geocoding.
+    :return: List of AdminUnit objects, in the same order as addresses.
+    '''
+
+    if mode in [ConvertMode.CONVERT_2025, ConvertMode.CONVERT_2025.value]:
+        from .converter_2025 import convert_addresses_2025
+        return convert_addresses_2025(addresses, geocoder=geocoder)
+    else:
+        raise invalid_mode_error(mode, ConvertMode.forward())
+
+
+async def convert_addresses_async(addresses, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, geocoder=None, max_concurrency: int=10):
+    '''
+    Async version of `convert_addresses()`, geocoding does not block the event loop.
+
+    :param addresses: Iterable of addresses, see `convert_address()`.
+    :param mode: Currently, only `'CONVERT_2025'` is supported.
+    :param geocoder: See `convert_address()`, coroutine functions are also accepted. Sync functions run in a thread.
+    :param max_concurrency: Max number of geocodes in flight. Default `10`.
+    :return: List of AdminUnit objects, in the same order as addresses.
+    '''
+
+    if mode in [ConvertMode.CONVERT_2025, ConvertMode.CONVERT_2025.value]:
+        from .converter_2025 import convert_addresses_2025_async
+        return await convert_addresses_2025_async(addresses, geocoder=geocoder, max_concurrency=max_concurrency)
+    else:
+        raise invalid_mode_error(mode, ConvertMode.forward())
+
+
+def convert_addresses_as_completed(addresses, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, geocoder=None, max_concurrency: int=10):
+    '''
+    Convert many addresses, yielding results as soon as they are ready: addresses that need no geocoding first, then the others as their geocode finishes.
+
+    :param addresses: Iterable of addresses, see `convert_address()`.
+    :param mode: Currently, only `'CONVERT_2025'` is supported.
+    :param geocoder: See `convert_addresses_async()`.
+    :param max_concurrency: Max number of geocodes in flight. Default `10`.
+    :return: Async generator of `(index, AdminUnit)`, index is the position in addresses.
+    '''
+
+    if mode in [ConvertMode.CONVERT_2025, ConvertMode.CONVERT_2025.value]:
+        from .converter_2025 import convert_addresses_2025_as_completed
+        return convert_addresses_2025_as_completed(addresses, geocoder=geocoder, max_concurrency=max_concurrency)
+    else:
+        raise invalid_mode_error(mode, ConvertMode.forward())
+
+
+def convert_addresses_columnar(addresses, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, geocoder=None, columns: list=None, arrow: bool=False):
+    '''
+    Convert many addresses to columns instead of AdminUnit objects, see `convert_addresses()`.
+
+    :param addresses: Iterable of addresses, see `convert_address()`.
+    :param mode: Currently, only `'CONVERT_2025'` is supported.
+    :param geocoder: See `convert_address()`.
+    :param columns: AdminUnit attributes to output. Default `None` for all attributes.
+    :param arrow: Return a `pyarrow.Table` (requires pyarrow). Default `False`.
+    :return: See `parse_addresses_columnar()`.
+    '''
+    from ..parser.columnar import units_to_columns
+
+    if mode in [ConvertMode.CONVERT_2025, ConvertMode.CONVERT_2025.value]:
+        from .converter_2025 import convert_unique_addresses_2025
+        # Các dòng dùng chung unit của địa chỉ cũ phân biệt, không tạo AdminUnit cho từng dòng
+        old_keys, new_units = convert_unique_addresses_2025(addresses, geocoder=geocoder)
+        return units_to_columns((new_units[old_key] for old_key in old_keys), columns=columns, arrow=arrow)
+    else:
+        raise invalid_mode_error(mode, ConvertMode.forward())
+
+
+def reverse_convert_address(address: str, mode: Union[str, ConvertMode]=ConvertMode.REVERSE_2025):
+    '''
+    Converts an address from the 34-province format back to the 63-province units it was made of, eg: to join new addresses to legacy-keyed history.
+    Candidates come from a precomputed new ward -> old wards index, no old address is parsed.
+
+    :param address: Best format *"(street), ward, province"*, see `parse_address()`.
+    :param mode: Currently, only `'REVERSE_2025'` is supported.
+    :return: tuple of AdminUnit objects (level 3), the street of the address is kept. Old wards merged whole come first, then old wards only partly merged (divided between several new wards).
+    If no ward is found, the old provinces (level 1) of the new province. Empty if no province is found.
+    '''
+
+    if mode in [ConvertMode.REVERSE_2025, ConvertMode.REVERSE_2025.value]:
+        from .reverse_2025 import reverse_address_2025
+        return reverse_address_2025(address)
+    else:
+        raise invalid_mode_error(mode, ConvertMode.reverse())
+
+
+def reverse_convert_addresses(addresses, mode: Union[str, ConvertMode]=ConvertMode.REVERSE_2025):
+    '''
+    Converts many addresses from the 34-province format back to 63-province units, duplicated addresses are parsed only once.
+
+    :param addresses: Iterable of addresses, see `reverse_convert_address()`.
+    :param mode: Currently, only `'REVERSE_2025'` is supported.
+    :return: List of tuples of AdminUnit objects, in the same order as addresses.
+    '''
+
+    if mode in [ConvertMode.REVERSE_2025, ConvertMode.REVERSE_2025.value]:
+        from .reverse_2025 import reverse_addresses_2025
+        return reverse_addresses_2025(addresses)
+    else:
+        raise invalid_mode_error(mode, ConvertMode.reverse())
+
+
+def convert_code(code, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, level: int=3):
+    '''
+    Converts a 63-province GSO code to the standardized 34-province `AdminUnit`, without parsing any text.
+
+    :param code: Code of the old unit at level, leading zeros are optional. Eg: `'00004'`, `4`.
+    :param mode: Currently, only `'CONVERT_2025'` is supported.
+    :param level: Level of the old code, `1` (province), `2` (district) or `3` (ward). Default `3`.
+    :return: AdminUnit object, the same as `convert_address()` of that old unit without street: a divided old ward gets its default new ward. None if the code is unknown.
+    '''
+    return convert_codes([code], mode=mode, level=level)[0]
+
+
+def convert_codes(codes, mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, level: int=3):
+    '''
+    Converts many 63-province GSO codes in one vectorized lookup, see `convert_code()`.
+
+    :param codes: Array-like of old codes, eg: a list, a numpy array or a pandas Series.
+    :param mode: Currently, only `'CONVERT_2025'` is supported.
+    :param level: Level of the old codes, `1` (province), `2` (district) or `3` (ward). Default `3`.
+    :return: List of AdminUnit objects or None, in the same order as codes.
     '''
 
     if mode in [ConvertMode.CONVERT_2025, ConvertMode.CONVERT_2025.value]:
-        return convert_address_2025(address)
+        if level not in [1, 2, 3]:
+            raise ValueError('Invalid level. Available levels are [1, 2, 3].')
+        from .codes_2025 import convert_codes_2025
+        return convert_codes_2025(codes, level=level)
     else:
-        raise Exception(f"Invalid mode. Available modes are {ConvertMode.available(value=True)}.")
\ No newline at end of file
+        raise invalid_mode_error(mode, ConvertMode.forward())
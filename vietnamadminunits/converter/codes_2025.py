@@ -0,0 +1,35 @@
+from ..parser.codes import iter_units_legacy, lookup_code, lookup_codes
+from ..parser.parser_from_2025 import get_unit as get_new_unit
+from .converter_2025 import get_new_keys
+
+
+def iter_new_units(level: int):
+    '''
+    :param level: Level of the old codes, `1` (province), `2` (district) or `3` (ward).
+    :return: Generator of (old_code, new AdminUnit), the same unit as `convert_address_2025()` of that old unit without street.
+    '''
+    for old_code, old_unit in iter_units_legacy(level):
+        # Ward cũ bị chia thì dùng ward mới mặc định, như convert một địa chỉ không có street
+        yield old_code, get_new_unit(*get_new_keys(old_unit))
+
+
+# MAIN FUNCTION
+def convert_code_2025(code, level: int=3):
+    '''
+    Convert a 63-province code to the 34-province unit, without parsing any text.
+    :param code: Old code, eg: `'00004'`, `4`
+    :param level: `1` (province), `2` (district) or `3` (ward)
+
+    :return: AdminUnit object or None if the code is unknown
+    '''
+    return lookup_code(code, 'CONVERT_2025', level, build=iter_new_units)
+
+
+def convert_codes_2025(codes, level: int=3):
+    '''
+    Convert many 63-province codes in one vectorized lookup.
+    :param codes: Array-like of old codes
+
+    :return: List of AdminUnit objects or None, in the same order as codes
+    '''
+    return lookup_codes(codes, 'CONVERT_2025', level, build=iter_new_units)
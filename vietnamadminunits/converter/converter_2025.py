@@ -1,97 +1,452 @@
-import json
-import sys
-from pathlib import Path
+from ..parser.parser_from_2025 import parse_address_from_2025, parse_addresses_from_2025
+from ..parser.parser_legacy import parse_address_legacy, parse_addresses_legacy, iter_addresses_legacy
+from ..parser.objects import AdminUnit
+from ..parser.utils import key_normalize, geocode_arcgis, compute_square_bounds, check_points_in_bounds, approximate_geodesic_distances
+from ..snapshot import load_data
+from .. import instrumentation
+from time import perf_counter
 import re
 
 
-MODULE_DIR = Path(__file__).parent.parent
+DATASET = 'CONVERT_2025'
 
 
-from ..parser import parse_address, ParseMode
-from ..parser.objects import AdminUnit
-from ..parser.utils import get_geo_location, check_point_in_polygon, find_nearest_point
+# Tăng khi build_data() thay đổi, snapshot cũ sẽ được build lại
+BUILD_VERSION = 1
 
 
-# LOAD DATA
-with open(MODULE_DIR / 'data/converter_2025.json', 'r') as f:
-    converter_data = json.load(f)
+def build_data(converter_data: dict):
+    '''
+    Derive indexes from `converter_2025.json`, the result is kept in a binary snapshot.
+
+    :param converter_data: Content of `converter_2025.json`.
+    :return: dict
+    '''
+    # CREATE INDEXES: old key -> new key
+    DICT_OLD_NEW_PROVINCE = {}
+    for new_province_key, old_province_keys in converter_data['DICT_PROVINCE'].items():
+        for old_province_key in old_province_keys:
+            DICT_OLD_NEW_PROVINCE.setdefault(old_province_key, new_province_key)
+
+    DICT_PROVINCE_OLD_NEW_WARD = {} # {new_province_key: {old_province_district_ward_key: new_ward_key}}
+    for new_province_key, DICT_WARD_NO_DIVIDED in converter_data['DICT_PROVINCE_WARD_NO_DIVIDED'].items():
+        DICT_OLD_NEW_WARD = DICT_PROVINCE_OLD_NEW_WARD[new_province_key] = {}
+        for new_ward_key, old_province_district_ward_keys in DICT_WARD_NO_DIVIDED.items():
+            for old_province_district_ward_key in old_province_district_ward_keys:
+                DICT_OLD_NEW_WARD.setdefault(old_province_district_ward_key, new_ward_key)
+
+    # REVERSE INDEX: new key -> old keys, ward cũ nhập nguyên vẹn đứng trước, ward cũ chỉ nhập một phần (bị chia) đứng sau
+    DICT_PROVINCE_NEW_OLD_WARDS = {} # {new_province_key: {new_ward_key: [old_province_district_ward_key]}}
+    for new_province_key, DICT_WARD_NO_DIVIDED in converter_data['DICT_PROVINCE_WARD_NO_DIVIDED'].items():
+        DICT_PROVINCE_NEW_OLD_WARDS[new_province_key] = {new_ward_key: list(old_province_district_ward_keys) for new_ward_key, old_province_district_ward_keys in DICT_WARD_NO_DIVIDED.items()}
+    for new_province_key, DICT_WARD_DIVIDED in converter_data['DICT_PROVINCE_WARD_DIVIDED'].items():
+        DICT_NEW_OLD_WARDS = DICT_PROVINCE_NEW_OLD_WARDS.setdefault(new_province_key, {})
+        for old_province_district_ward_key, new_wards in DICT_WARD_DIVIDED.items():
+            for ward in new_wards:
+                old_province_district_ward_keys = DICT_NEW_OLD_WARDS.setdefault(ward['newWardKey'], [])
+                if old_province_district_ward_key not in old_province_district_ward_keys:
+                    old_province_district_ward_keys.append(old_province_district_ward_key)
+
+    # CANDIDATE GEOMETRY: bounds của polygon vuông quanh mỗi ward mới, không phụ thuộc địa chỉ nên tính sẵn
+    DICT_DIVIDED_WARD_CANDIDATES = {} # {(new_province_key, old_province_district_ward_key): (start, size)}
+    CANDIDATE_POINTS = [] # (newWardLat, newWardLon)
+    CANDIDATE_BOUNDS = [] # (south, north, west, east)
+    CANDIDATE_NEW_WARD_KEYS = []
+    for new_province_key, DICT_WARD_DIVIDED in converter_data['DICT_PROVINCE_WARD_DIVIDED'].items():
+        for old_province_district_ward_key, new_wards in DICT_WARD_DIVIDED.items():
+            DICT_DIVIDED_WARD_CANDIDATES[(new_province_key, old_province_district_ward_key)] = (len(CANDIDATE_POINTS), len(new_wards))
+            for ward in new_wards:
+                new_point = (ward['newWardLat'], ward['newWardLon'])
+                CANDIDATE_POINTS.append(new_point)
+                CANDIDATE_BOUNDS.append(compute_square_bounds(center=new_point, area_km2=ward['newWardAreaKm2']))
+                CANDIDATE_NEW_WARD_KEYS.append(ward['newWardKey'])
+
+    converter_data['DICT_OLD_NEW_PROVINCE'] = DICT_OLD_NEW_PROVINCE
+    converter_data['DICT_PROVINCE_OLD_NEW_WARD'] = DICT_PROVINCE_OLD_NEW_WARD
+    converter_data['DICT_PROVINCE_NEW_OLD_WARDS'] = DICT_PROVINCE_NEW_OLD_WARDS
+    converter_data['DICT_DIVIDED_WARD_CANDIDATES'] = DICT_DIVIDED_WARD_CANDIDATES
+    converter_data['CANDIDATE_POINTS'] = CANDIDATE_POINTS
+    converter_data['CANDIDATE_BOUNDS'] = CANDIDATE_BOUNDS
+    converter_data['CANDIDATE_NEW_WARD_KEYS'] = CANDIDATE_NEW_WARD_KEYS
+    return converter_data
 
 
+# LOAD DATA
+converter_data = load_data('converter_2025', build_data, version=BUILD_VERSION)
+
 DICT_PROVINCE = converter_data['DICT_PROVINCE']
 DICT_PROVINCE_WARD_NO_DIVIDED = converter_data['DICT_PROVINCE_WARD_NO_DIVIDED']
 DICT_PROVINCE_WARD_DIVIDED = converter_data['DICT_PROVINCE_WARD_DIVIDED']
 
 
+# INDEXES: old key -> new key
+DICT_OLD_NEW_PROVINCE = converter_data['DICT_OLD_NEW_PROVINCE']
+DICT_PROVINCE_OLD_NEW_WARD = converter_data['DICT_PROVINCE_OLD_NEW_WARD']
+
+
+# CANDIDATES OF DIVIDED WARDS: (new_province_key, old_province_district_ward_key) -> (start, size) trong các mảng candidate
+DICT_DIVIDED_WARD_CANDIDATES = converter_data['DICT_DIVIDED_WARD_CANDIDATES']
+CANDIDATE_NEW_WARD_KEYS = converter_data['CANDIDATE_NEW_WARD_KEYS']
+CANDIDATE_ARRAYS = None
+
+
+def get_candidate_arrays():
+    '''
+    :return: (points, bounds) - numpy arrays of shape (n, 2) and (n, 4), created on first use.
+    '''
+    global CANDIDATE_ARRAYS
+    if CANDIDATE_ARRAYS is None:
+        import numpy as np
+        CANDIDATE_ARRAYS = (
+            np.array(converter_data['CANDIDATE_POINTS'], dtype=float).reshape(-1, 2),
+            np.array(converter_data['CANDIDATE_BOUNDS'], dtype=float).reshape(-1, 4),
+        )
+    return CANDIDATE_ARRAYS
+
+
+# STREET INDEX: {new_province_key: {old_province_district_ward_key: {street_keyword: new_ward_key}}}, chỉ load khi gặp ward bị chia có street
+DICT_PROVINCE_DIVIDED_WARD_STREET = None
+
+
+def get_street_index():
+    '''
+    :return: dict, `{new_province_key: {old_province_district_ward_key: {street_keyword: new_ward_key}}}` built by `s11_generating_street_index.py`.
+    '''
+    global DICT_PROVINCE_DIVIDED_WARD_STREET
+    if DICT_PROVINCE_DIVIDED_WARD_STREET is None:
+        DICT_PROVINCE_DIVIDED_WARD_STREET = load_data('converter_2025_street', lambda street_data: street_data)['DICT_PROVINCE_DIVIDED_WARD_STREET']
+    return DICT_PROVINCE_DIVIDED_WARD_STREET
+
+
+# GEOCODERS: geocoding là network request nên chỉ dùng khi được chọn
+GEOCODERS = {
+    'ARCGIS': geocode_arcgis,
+}
+
+
+def get_geocoder(geocoder, allow_async: bool=False):
+    '''
+    :param geocoder: None, a name in `GEOCODERS` or a function that takes an address and returns (latitude, longitude) or None.
+    :param allow_async: Accept coroutine functions, only async APIs can await them.
+    :return: Function or None.
+    '''
+    if callable(geocoder) and not allow_async:
+        from .geocoders import is_async_geocoder
+        if is_async_geocoder(geocoder):
+            raise ValueError("Async geocoders are only supported by convert_addresses_async() and convert_addresses_as_completed().")
+    if geocoder is None or callable(geocoder):
+        return geocoder
+    if geocoder in GEOCODERS:
+        return GEOCODERS[geocoder]
+    raise ValueError(f"Invalid geocoder. Available geocoders are {list(GEOCODERS)} or a function.")
+
+
 # MAIN FUNCTION
-def convert_address_2025(address: str):
+def convert_address_2025(address: str, geocoder=None):
     '''
     Convert address from old format to new format based on the Vietnam administrative unit changes in 2025
     :param address: str - The old address to convert
+    :param geocoder: None (offline), `'ARCGIS'` or a function - Used to locate the street of a divided ward, see `choose_divided_ward()`
 
     :return: AdminUnit object
     '''
 
-    new_ward_key = None
+    geocoder = get_geocoder(geocoder)
+
+    recorder = instrumentation.RECORDER
+    if recorder:
+        start = perf_counter()
 
     # Parse địa chỉ cũ trước
-    old_unit = parse_address(address, mode=ParseMode.LEGACY, keep_street=True, level=3)
+    old_unit = parse_address_legacy(address, keep_street=True, level=3)
+    if recorder:
+        recorder.record(DATASET, 'parse_old', start, old_unit.province_key)
+
+    new_address, level = get_new_address(old_unit, geocoder=geocoder)
+
+    if recorder:
+        parse_start = perf_counter()
+    new_unit = parse_address_from_2025(new_address, keep_street=True, level=level)
+    if recorder:
+        recorder.record(DATASET, 'parse_new', parse_start, new_unit.province_key)
+        recorder.record_address(DATASET, address, start)
+
+    return new_unit
+
+
+def convert_addresses_2025(addresses, geocoder=None):
+    '''
+    Convert many addresses from old format to new format, duplicated addresses are parsed, geocoded and converted only once.
+    :param addresses: Iterable of old addresses
+    :param geocoder: None (offline), `'ARCGIS'` or a function - See `convert_address_2025()`
+
+    :return: List of AdminUnit objects, in the same order as addresses
+    '''
+
+    old_keys, new_units = convert_unique_addresses_2025(addresses, geocoder=geocoder)
+    return [new_units[old_key] for old_key in old_keys]
+
+
+def convert_unique_addresses_2025(addresses, geocoder=None):
+    '''
+    Convert each distinct old address once, without an AdminUnit per address.
+    :param addresses: Iterable of old addresses
+    :param geocoder: None (offline), `'ARCGIS'` or a function - See `convert_address_2025()`
+
+    :return: (old_keys, new_units): list of the old key of each address, see `get_old_unit_key()`, and dict old_key -> new AdminUnit
+    '''
+
+    geocoder = get_geocoder(geocoder)
+
+    old_keys = []
+    unique_old_units = {}
+    for old_unit, street in iter_addresses_legacy(addresses, keep_street=True, level=3):
+        old_key = (street, old_unit.province_key, old_unit.district_key, old_unit.ward_key) # Như get_old_unit_key() của unit có street
+        if old_key not in unique_old_units:
+            unique_old_units[old_key] = old_unit.with_street(street)
+        old_keys.append(old_key)
+
+    recorder = instrumentation.RECORDER
+
+    # Geocode các ward bị chia mà street index không giải quyết được, rồi chọn ward mới cho tất cả trong một lần
+    divided_new_ward_keys = {}
+    if geocoder:
+        pending = get_pending_geocodes(unique_old_units)
+
+        points = {}
+        for _, old_address in pending.values():
+            if old_address not in points:
+                if recorder:
+                    start = perf_counter()
+                points[old_address] = geocoder(old_address)
+                if recorder:
+                    recorder.record(DATASET, 'geocode', start, points[old_address])
+
+        divided_new_ward_keys = choose_pending_new_wards(pending, points)
+
+    new_addresses = [get_new_address(old_unit, divided_new_ward_key=divided_new_ward_keys.get(old_key)) for old_key, old_unit in unique_old_units.items()]
+    return old_keys, dict(zip(unique_old_units, parse_new_addresses(new_addresses)))
+
+
+async def convert_addresses_2025_as_completed(addresses, geocoder=None, max_concurrency: int=10):
+    '''
+    Convert many addresses, yielding each result as soon as it is ready.
+    Addresses that need no geocoding are yielded first, then the others as their geocode finishes. Each distinct address is geocoded once, at most max_concurrency at a time.
+    :param addresses: Iterable of old addresses
+    :param geocoder: None (offline), `'ARCGIS'`, a function or a coroutine function - Sync functions run in a thread, so the event loop is not blocked
+    :param max_concurrency: int - Max number of geocodes in flight
+
+    :return: Async generator of (index, AdminUnit)
+    '''
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from .geocoders import is_async_geocoder, to_async_geocoder
+
+    geocoder = get_geocoder(geocoder, allow_async=True)
+    old_units = parse_addresses_legacy(addresses, keep_street=True, level=3)
+    unique_old_units = get_unique_old_units(old_units)
+    pending = get_pending_geocodes(unique_old_units) if geocoder else {}
+
+    indexes = {} # old_key -> các vị trí trong addresses
+    for i, old_unit in enumerate(old_units):
+        indexes.setdefault(get_old_unit_key(old_unit), []).append(i)
+
+    # Không cần geocode: trả về ngay
+    ready_keys = [old_key for old_key in unique_old_units if old_key not in pending]
+    new_units = parse_new_addresses([get_new_address(unique_old_units[old_key]) for old_key in ready_keys])
+    for old_key, new_unit in zip(ready_keys, new_units):
+        for i in indexes[old_key]:
+            yield i, new_unit
+
+    if not pending:
+        return
+
+    # Cần geocode: mỗi địa chỉ một task, giới hạn số request cùng lúc
+    old_keys_by_address = {}
+    for old_key, (_, old_address) in pending.items():
+        old_keys_by_address.setdefault(old_address, []).append(old_key)
+
+    # Geocoder sync chạy trong thread pool riêng, đủ thread cho max_concurrency request
+    executor = None if is_async_geocoder(geocoder) else ThreadPoolExecutor(max_workers=max_concurrency)
+    ageocode = to_async_geocoder(geocoder, executor=executor)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def locate(old_address):
+        async with semaphore:
+            recorder = instrumentation.RECORDER
+            if recorder:
+                start = perf_counter()
+            point = await ageocode(old_address)
+            if recorder:
+                recorder.record(DATASET, 'geocode', start, point)
+            return old_address, point
+
+    tasks = [asyncio.ensure_future(locate(old_address)) for old_address in old_keys_by_address]
+    try:
+        for task in asyncio.as_completed(tasks):
+            old_address, point = await task
+            old_keys = old_keys_by_address[old_address]
+            divided_new_ward_keys = choose_pending_new_wards({old_key: pending[old_key] for old_key in old_keys}, {old_address: point})
+            new_units = parse_new_addresses([get_new_address(unique_old_units[old_key], divided_new_ward_key=divided_new_ward_keys.get(old_key)) for old_key in old_keys])
+            for old_key, new_unit in zip(old_keys, new_units):
+                for i in indexes[old_key]:
+                    yield i, new_unit
+    finally:
+        for task in tasks:
+            task.cancel()
+        if executor:
+            executor.shutdown(wait=False)
+
+
+async def convert_addresses_2025_async(addresses, geocoder=None, max_concurrency: int=10):
+    '''
+    Async version of `convert_addresses_2025()`, see `convert_addresses_2025_as_completed()`.
+
+    :return: List of AdminUnit objects, in the same order as addresses
+    '''
+    addresses = list(addresses)
+    new_units = [None] * len(addresses)
+    async for i, new_unit in convert_addresses_2025_as_completed(addresses, geocoder=geocoder, max_concurrency=max_concurrency):
+        new_units[i] = new_unit
+    return new_units
+
+
+def get_old_unit_key(old_unit: AdminUnit):
+    # Các địa chỉ cũ có cùng street và key chỉ cần suy địa chỉ mới một lần, tránh geocode lặp lại
+    return old_unit.street, old_unit.province_key, old_unit.district_key, old_unit.ward_key
+
+
+def get_unique_old_units(old_units: list):
+    '''
+    :param old_units: List of AdminUnit objects parsed in LEGACY mode, level 3
+
+    :return: dict, old_key -> first AdminUnit of that key, see `get_old_unit_key()`
+    '''
+    unique_old_units = {}
+    for old_unit in old_units:
+        unique_old_units.setdefault(get_old_unit_key(old_unit), old_unit)
+    return unique_old_units
+
+
+def get_pending_geocodes(unique_old_units: dict):
+    '''
+    :param unique_old_units: See `get_unique_old_units()`
+
+    :return: dict, old_key -> (divided_key, old_address) of divided wards with a street that the street index does not resolve
+    '''
+    pending = {}
+    for old_key, old_unit in unique_old_units.items():
+        divided_key = get_divided_key(old_unit)
+        if divided_key and old_unit.street and not match_street_index(*divided_key, street=old_unit.street):
+            pending[old_key] = (divided_key, old_unit.get_address())
+    return pending
+
+
+def choose_pending_new_wards(pending: dict, points: dict):
+    '''
+    :param pending: See `get_pending_geocodes()`
+    :param points: dict, old_address -> (latitude, longitude) or None
+
+    :return: dict, old_key -> new_ward_key for the located addresses
+    '''
+    located = [(old_key, divided_key, points[old_address]) for old_key, (divided_key, old_address) in pending.items() if points[old_address]]
+    if not located:
+        return {}
+    old_keys, divided_keys, old_points = zip(*located)
+    return dict(zip(old_keys, choose_new_wards_by_points(old_points, divided_keys)))
+
+
+def parse_new_addresses(new_address_levels: list):
+    '''
+    :param new_address_levels: List of (new_address, level) from `get_new_address()`
+
+    :return: List of AdminUnit objects, in the same order
+    '''
+    # Parse lại theo từng level, rồi trả về đúng thứ tự ban đầu
+    new_units = [None] * len(new_address_levels)
+    for level in [1, 2]:
+        positions = [i for i, (_, new_level) in enumerate(new_address_levels) if new_level == level]
+        level_units = parse_addresses_from_2025([new_address_levels[i][0] for i in positions], keep_street=True, level=level)
+        for i, new_unit in zip(positions, level_units):
+            new_units[i] = new_unit
+    return new_units
+
+
+def get_divided_key(old_unit: AdminUnit):
+    '''
+    :param old_unit: AdminUnit object parsed in LEGACY mode, level 3
+
+    :return: (new_province_key, old_province_district_ward_key) if the old ward is divided, else None
+    '''
+    new_province_key, old_province_district_ward_key = get_old_ward_key(old_unit)
+    if old_province_district_ward_key and DICT_DIVIDED_WARD_CANDIDATES.get((new_province_key, old_province_district_ward_key), (0, 0))[1]:
+        return new_province_key, old_province_district_ward_key
+    return None
+
+
+def get_old_ward_key(old_unit: AdminUnit):
+    '''
+    :param old_unit: AdminUnit object parsed in LEGACY mode, level 3
+
+    :return: (new_province_key, old_province_district_ward_key) - old_province_district_ward_key is None if there is no ward
+    '''
 
     # Suy province_key cũ ra province_key mới
-    new_province_key = next((k for k, v in DICT_PROVINCE.items() if old_unit.province_key and old_unit.province_key in v), None)
+    new_province_key = DICT_OLD_NEW_PROVINCE.get(old_unit.province_key)
 
     # Tạo old_province_district_ward_key để suy ra ward_key mới
-    # Vẫn cho phép trả về province nếu như không có ward_key mới, thay vì raise error
     special_zone = ['huyenbachlongvi', 'huyenconco', 'huyenhoangsa', 'huyenlyson', 'huyencondao'] # Mấy cái đảo thì không có ward
     if old_unit.ward_key or old_unit.district_key in special_zone:
-        
         # Ghép các key trong admin unit cũ lại thành old_province_district_ward_key
-        old_province_district_ward_key = f"{old_unit.province_key}_{old_unit.district_key}_{old_unit.ward_key if old_unit.ward_key else ''}"
+        return new_province_key, f"{old_unit.province_key}_{old_unit.district_key}_{old_unit.ward_key if old_unit.ward_key else ''}"
 
-        # 1st attempt: Suy từ old_province_district_ward_key ra new_ward_key, phần lớn các ward cũ không bị chia
-        DICT_WARD_NO_DIVIDED = DICT_PROVINCE_WARD_NO_DIVIDED[new_province_key]
-        new_ward_key = next((k for k, v in DICT_WARD_NO_DIVIDED.items() if old_province_district_ward_key and old_province_district_ward_key in v), None)
+    return new_province_key, None
 
 
-        # 2nd attampt: Các ward cũ bị chia thành nhiều ward mới
-        if not new_ward_key:
-            new_wards = DICT_PROVINCE_WARD_DIVIDED.get(new_province_key, {}).get(old_province_district_ward_key, [])
+def get_new_keys(old_unit: AdminUnit, geocoder=None, divided_new_ward_key: str=None):
+    '''
+    Find the 34-province keys of a parsed 63-province address.
+    :param old_unit: AdminUnit object parsed in LEGACY mode, level 3
+    :param geocoder: None (offline), `'ARCGIS'` or a function - See `convert_address_2025()`
+    :param divided_new_ward_key: New ward already chosen for a divided old ward, eg: by a batch
+
+    :return: (new_province_key, new_ward_key) - new_ward_key is None if there is no ward
+    '''
+
+    new_ward_key = None
+
+    new_province_key, old_province_district_ward_key = get_old_ward_key(old_unit)
+
+    # Vẫn cho phép trả về province nếu như không có ward_key mới, thay vì raise error
+    if old_province_district_ward_key:
 
-            # Nếu không có street thì dùng ngay ward mới mặc định
-            if not old_unit.street:
-                new_ward_key = next((ward['newWardKey'] for ward in new_wards if ward['isDefaultNewWard']), None)
+        # 1st attempt: Suy từ old_province_district_ward_key ra new_ward_key, phần lớn các ward cũ không bị chia
+        recorder = instrumentation.RECORDER
+        if recorder:
+            start = perf_counter()
+        new_ward_key = DICT_PROVINCE_OLD_NEW_WARD[new_province_key].get(old_province_district_ward_key)
+        if recorder:
+            recorder.record(DATASET, 'ward_mapping', start, new_ward_key)
 
-            # Nếu có street thì lấy location của địa chỉ cũ để so sánh với polygon và location của các ward mới
-            else:
-                old_location = get_geo_location(old_unit.get_address())
-                old_point = (old_location.latitude, old_location.longitude)
-                
-                # Tạo danh sách
-                containing_points = [] # Location của ward mới mà có Polygon chứa location của ward cũ
-                new_ward_points = [] # Tất cả location của ward cũ
 
-                for ward in new_wards:
-                    new_point = (ward['newWardLat'], ward['newWardLon'])
-                    new_ward_points.append(new_point)
-                    is_contain = check_point_in_polygon(point=old_point, polygon_center=new_point, polygon_area_km2=ward['newWardAreaKm2'])
-                    if is_contain:
-                        containing_points.append(new_point)
+        # 2nd attampt: Các ward cũ bị chia thành nhiều ward mới
+        if not new_ward_key:
+            new_ward_key = divided_new_ward_key or choose_divided_ward(new_province_key, old_province_district_ward_key, old_unit, geocoder=geocoder)
 
-                # Tìm location của ward mới gần với location của ward cũ nhất
-                nearest_point = find_nearest_point(a_point=old_point, list_of_b_points=new_ward_points)
+    return new_province_key, new_ward_key
 
-                # Quyết định:
-                # Nếu chỉ có một ward mới chứa location của ward cũ > chọn ward mới đó
-                if len(containing_points) == 1:
-                    default_ward_point = containing_points[0]
-                
-                # Còn lại thì chọn ward mới gần nhất
-                else:
-                    default_ward_point = nearest_point
 
+def get_new_address(old_unit: AdminUnit, geocoder=None, divided_new_ward_key: str=None):
+    '''
+    Build the 34-province address of a parsed 63-province address.
+    :param old_unit: AdminUnit object parsed in LEGACY mode, level 3
+    :param geocoder: None (offline), `'ARCGIS'` or a function - See `convert_address_2025()`
+    :param divided_new_ward_key: New ward already chosen for a divided old ward, eg: by a batch
 
-                # Suy location của ward mới ra new_ward_key
-                new_ward_key = next((ward['newWardKey'] for ward in new_wards if (ward['newWardLat'], ward['newWardLon']) == default_ward_point), None)
+    :return: (new_address, level) - The new address and the level to parse it
+    '''
 
+    new_province_key, new_ward_key = get_new_keys(old_unit, geocoder=geocoder, divided_new_ward_key=divided_new_ward_key)
 
     # Tạo lại một địa chỉ theo 34-province format để parse lại
     # Lý do vì convert data sẽ không được cập nhật. Khi chính phủ có những thay đổi, parser data và alias keyword của nó được cập nhật
@@ -99,6 +454,126 @@ def convert_address_2025(address: str):
     new_address = ','.join(new_address_components)
 
     level = 2 if new_ward_key else 1
-    new_unit = parse_address(new_address, mode=ParseMode.FROM_2025, keep_street=True, level=level)
 
-    return new_unit
\ No newline at end of file
+    return new_address, level
+
+
+def choose_divided_ward(new_province_key: str, old_province_district_ward_key: str, old_unit: AdminUnit, geocoder=None):
+    '''
+    Choose the new ward of a divided old ward, without any network request unless a geocoder is provided.
+    :param new_province_key: str
+    :param old_province_district_ward_key: str - Key of the old ward in `DICT_PROVINCE_WARD_DIVIDED`
+    :param old_unit: AdminUnit object parsed in LEGACY mode, level 3
+    :param geocoder: None (offline), `'ARCGIS'` or a function that takes an address and returns (latitude, longitude) or None
+
+    :return: new_ward_key or None
+    '''
+
+    new_wards = DICT_PROVINCE_WARD_DIVIDED.get(new_province_key, {}).get(old_province_district_ward_key, [])
+
+    # Ward mới mặc định: ward mới chứa tâm ward cũ, hoặc gần tâm ward cũ nhất (xem s6_choosing_default_new_wards.py)
+    default_new_ward_key = next((ward['newWardKey'] for ward in new_wards if ward['isDefaultNewWard']), None)
+
+    recorder = instrumentation.RECORDER
+
+    # Nếu không có street thì dùng ngay ward mới mặc định
+    if not old_unit.street or not new_wards:
+        if recorder:
+            recorder.record(DATASET, 'default_ward', perf_counter(), default_new_ward_key)
+        return default_new_ward_key
+
+    # 1st attempt: Tìm street trong street index của các ward mới, chỉ chọn khi có đúng một ward mới khớp
+    if recorder:
+        start = perf_counter()
+    new_ward_key = match_street_index(new_province_key, old_province_district_ward_key, street=old_unit.street)
+    if recorder:
+        recorder.record(DATASET, 'street_index', start, new_ward_key)
+    if new_ward_key:
+        return new_ward_key
+
+    # 2nd attempt: Chỉ geocode khi được chọn, lấy location của địa chỉ cũ để so sánh với polygon và location của các ward mới
+    geocoder = get_geocoder(geocoder)
+    if geocoder:
+        if recorder:
+            start = perf_counter()
+        old_point = geocoder(old_unit.get_address())
+        if recorder:
+            recorder.record(DATASET, 'geocode', start, old_point)
+        if old_point:
+            return choose_new_wards_by_points([old_point], [(new_province_key, old_province_district_ward_key)])[0]
+
+    # 3rd attempt: Không xác định được thì dùng ward mới mặc định
+    if recorder:
+        recorder.record(DATASET, 'default_ward', perf_counter(), default_new_ward_key)
+    return default_new_ward_key
+
+
+def match_street_index(new_province_key: str, old_province_district_ward_key: str, street: str):
+    '''
+    :param new_province_key: str
+    :param old_province_district_ward_key: str - Key of the old ward in `DICT_PROVINCE_WARD_DIVIDED`
+    :param street: str
+
+    :return: new_ward_key if exactly one candidate new ward matches the street, else None
+    '''
+    DICT_STREET = get_street_index().get(new_province_key, {}).get(old_province_district_ward_key)
+    if not DICT_STREET:
+        return None
+    matched_new_ward_keys = {DICT_STREET[key] for key in get_street_token_keys(street) if key in DICT_STREET}
+    return matched_new_ward_keys.pop() if len(matched_new_ward_keys) == 1 else None
+
+
+def get_street_token_keys(street: str):
+    '''
+    Keys of every run of whole words in the street, a keyword only matches on word boundaries.
+    Eg: "12 phố Trúc Bạch" gives 'photrucbach' and 'trucbach', but not 'rucbach' or 'ucba'.
+
+    :param street: str
+    :return: set of keys
+    '''
+    keys = set()
+    for part in street.split(','):
+        tokens = [token for token in (key_normalize(word) for word in re.split(r'[\s\-/.]+', part)) if token]
+        for start in range(len(tokens)):
+            for end in range(start + 1, len(tokens) + 1):
+                keys.add(''.join(tokens[start:end]))
+    return keys
+
+
+def choose_new_wards_by_points(points, divided_keys):
+    '''
+    Choose new wards of many geocoded old addresses in one vectorized pass.
+    For each point: if exactly one candidate polygon contains the point, choose it, otherwise choose the nearest candidate (the first one on ties).
+    :param points: List of (latitude, longitude)
+    :param divided_keys: List of (new_province_key, old_province_district_ward_key), same length as points
+
+    :return: List of new_ward_key
+    '''
+    import numpy as np
+
+    candidate_points, candidate_bounds = get_candidate_arrays()
+
+    # Mỗi cặp (point, candidate) là một dòng, các candidate của một point nằm liền nhau
+    starts, sizes = np.array([DICT_DIVIDED_WARD_CANDIDATES[divided_key] for divided_key in divided_keys]).reshape(-1, 2).T
+    point_index = np.repeat(np.arange(len(sizes)), sizes)
+    pair_starts = np.cumsum(sizes) - sizes
+    candidate_index = np.repeat(starts - pair_starts, sizes) + np.arange(sizes.sum())
+
+    points = np.array(points, dtype=float).reshape(-1, 2)
+    latitudes = points[point_index, 0]
+    longitudes = points[point_index, 1]
+
+    is_contain = check_points_in_bounds(latitudes, longitudes, candidate_bounds[candidate_index])
+    distances = approximate_geodesic_distances(latitudes, longitudes, candidate_points[candidate_index, 0], candidate_points[candidate_index, 1])
+
+    # Gần nhất: sắp theo (point, distance), lexsort ổn định nên candidate đứng trước thắng khi bằng nhau
+    order = np.lexsort((distances, point_index))
+    chosen = candidate_index[order[pair_starts]]
+
+    # Nếu chỉ có một ward mới chứa location của ward cũ > chọn ward mới đó
+    contain_counts = np.bincount(point_index, weights=is_contain, minlength=len(sizes))
+    contained_pairs = np.flatnonzero(is_contain)
+    unique = contain_counts[point_index[contained_pairs]] == 1
+    chosen[point_index[contained_pairs[unique]]] = candidate_index[contained_pairs[unique]]
+
+    return [CANDIDATE_NEW_WARD_KEYS[i] for i in chosen]
@@ -0,0 +1,251 @@
+'''
+Persistent geocode cache in SQLite, so a street geocoded in one run is not requested again in the next runs.
+
+```python
+from vietnamadminunits import convert_addresses
+from vietnamadminunits.converter.geocode_cache import GeocodeCache, CachedGeocoder
+
+geocoder = CachedGeocoder('ARCGIS', GeocodeCache('geocode.db', ttl=30 * 86400, max_entries=1_000_000))
+convert_addresses(addresses, geocoder=geocoder)
+```
+'''
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from ..cache import CacheInfo
+from ..parser.normalizer import normalize_text
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS geocodes (
+    query TEXT PRIMARY KEY,
+    latitude REAL,
+    longitude REAL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS geocodes_accessed_at ON geocodes (accessed_at);
+'''
+
+# Khi vượt max_entries, xóa thêm một phần để không phải xóa sau mỗi lần ghi
+EVICTION_RATIO = 0.1
+
+
+def get_query_key(address: str):
+    '''
+    :param address: Query of the geocoder, eg: `old_unit.get_address()`.
+    :return: Normalized query, case and unicode forms are ignored.
+    '''
+    return normalize_text(address).lower()
+
+
+class GeocodeCache:
+    '''
+    Geocode results stored in a SQLite file, `None` results (not found) are cached too.
+
+    Safe to share between threads and processes: each thread of each process opens its own connection, the database uses WAL mode and waits for locks.
+    Entries older than ttl are ignored and removed by `purge()`, least recently used entries are evicted above max_entries.
+    '''
+
+    def __init__(self, path: str, ttl: float=None, max_entries: int=None, timeout: float=30):
+        '''
+        :param path: SQLite file, created if missing.
+        :param ttl: Seconds an entry stays valid. Default `None` for no expiry.
+        :param max_entries: Max number of entries. Default `None` for unbounded.
+        :param timeout: Seconds to wait for a lock held by another process.
+        '''
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0 # Số lần ghi từ lần đếm gần nhất
+        self._room = 0
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Connection không pickle được, process con tự mở lại
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        # Khóa ghi ngay từ đầu, các process khác chờ tối đa timeout giây
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _expired_before(self):
+        return time.time() - self.ttl if self.ttl is not None else None
+
+    def get(self, address: str):
+        '''
+        :param address: Query of the geocoder.
+        :return: `(found, point)`. found is False if the query is not cached or expired, point is (latitude, longitude) or None.
+        '''
+        connection = self._connect()
+        key = get_query_key(address)
+        row = connection.execute('SELECT latitude, longitude, created_at FROM geocodes WHERE query = ?', (key,)).fetchone()
+        expired_before = self._expired_before()
+        if row is None or (expired_before is not None and row[2] < expired_before):
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        if self.max_entries is not None:
+            connection.execute('UPDATE geocodes SET accessed_at = ? WHERE query = ?', (time.time(), key))
+        return True, (row[0], row[1]) if row[0] is not None else None
+
+    def set(self, address: str, point):
+        '''
+        :param address: Query of the geocoder.
+        :param point: (latitude, longitude) or None if not found.
+        '''
+        self.set_many([(address, point)])
+
+    def set_many(self, entries, created_at: float=None):
+        '''
+        :param entries: Iterable of (address, point).
+        :param created_at: Timestamp of the entries. Default now.
+        '''
+        now = time.time()
+        created_at = now if created_at is None else created_at
+        rows = [(get_query_key(address), *(point if point else (None, None)), created_at, now) for address, point in entries]
+        with self._transaction() as connection:
+            connection.executemany('INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?, ?)', rows)
+        self.evict(n_writes=len(rows), force=False)
+
+    def evict(self, n_writes: int=0, force: bool=True):
+        '''
+        Remove least recently used entries if there are more than max_entries.
+
+        :param n_writes: Number of entries just written.
+        :param force: Count entries now. If False, entries are counted only after as many writes as the room left at the last count, so writes stay cheap.
+        '''
+        if self.max_entries is None:
+            return
+        self._writes += n_writes
+        if not force and self._writes <= self._room:
+            return
+        with self._transaction() as connection:
+            count = connection.execute('SELECT COUNT(*) FROM geocodes').fetchone()[0]
+            if count > self.max_entries:
+                n_deletes = count - self.max_entries + int(self.max_entries * EVICTION_RATIO)
+                connection.execute('DELETE FROM geocodes WHERE query IN (SELECT query FROM geocodes ORDER BY accessed_at LIMIT ?)', (n_deletes,))
+                count -= n_deletes
+        self._writes = 0
+        self._room = self.max_entries - count
+
+    def purge(self):
+        '''
+        Remove expired entries.
+
+        :return: Number of removed entries.
+        '''
+        expired_before = self._expired_before()
+        if expired_before is None:
+            return 0
+        with self._transaction() as connection:
+            return connection.execute('DELETE FROM geocodes WHERE created_at < ?', (expired_before,)).rowcount
+
+    def clear(self):
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM geocodes')
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        '''
+        :return: CacheInfo(hits, misses, maxsize, currsize), hits and misses are counted in this process.
+        '''
+        currsize = self._connect().execute('SELECT COUNT(*) FROM geocodes').fetchone()[0]
+        return CacheInfo(self.hits, self.misses, self.max_entries, currsize)
+
+    def export_entries(self, path: str):
+        '''
+        Write valid entries to a JSON Lines file, eg: to ship a warm cache with a job.
+
+        :param path: Output file.
+        :return: Number of exported entries.
+        '''
+        expired_before = self._expired_before()
+        rows = self._connect().execute('SELECT query, latitude, longitude, created_at FROM geocodes WHERE created_at >= ? ORDER BY query', (expired_before if expired_before is not None else float('-inf'),))
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for query, latitude, longitude, created_at in rows:
+                f.write(json.dumps({'query': query, 'latitude': latitude, 'longitude': longitude, 'created_at': created_at}, ensure_ascii=False) + '\n')
+                count += 1
+        return count
+
+    def import_entries(self, path: str, overwrite: bool=False):
+        '''
+        Load entries written by `export_entries()`, keeping their original timestamps for ttl.
+
+        :param path: JSON Lines file.
+        :param overwrite: Replace entries already cached. Default `False` keeps them.
+        :return: Number of imported entries.
+        '''
+        now = time.time()
+        rows = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    rows.append((get_query_key(entry['query']), entry['latitude'], entry['longitude'], entry.get('created_at', now), now))
+
+        with self._transaction() as connection:
+            count = connection.total_changes
+            connection.executemany(f"INSERT OR {'REPLACE' if overwrite else 'IGNORE'} INTO geocodes VALUES (?, ?, ?, ?, ?)", rows)
+            count = connection.total_changes - count
+        self.evict()
+        return count
+
+
+class CachedGeocoder:
+    '''
+    Geocoder reading from a GeocodeCache first, only cache misses call the wrapped geocoder.
+    '''
+
+    def __init__(self, geocoder, cache: GeocodeCache):
+        '''
+        :param geocoder: `'ARCGIS'` or a function `address -> (latitude, longitude)` or None if not found.
+        :param cache: GeocodeCache object or the path of its SQLite file.
+        '''
+        self.geocoder = geocoder
+        self.cache = GeocodeCache(cache) if isinstance(cache, str) else cache
+
+    def __call__(self, address: str):
+        found, point = self.cache.get(address)
+        if found:
+            return point
+
+        from .converter_2025 import get_geocoder
+        point = get_geocoder(self.geocoder)(address)
+        self.cache.set(address, point)
+        return point
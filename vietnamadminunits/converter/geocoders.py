@@ -0,0 +1,81 @@
+'''
+Geocoder backends for divided wards. A geocoder is any function `address -> (latitude, longitude)` or None,
+async APIs also accept coroutine functions. See `GEOCODERS` in converter_2025.py for the named ones.
+'''
+import asyncio
+import json
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from ..parser.utils import key_normalize
+
+
+def is_async_geocoder(geocoder):
+    '''
+    :param geocoder: Function, coroutine function or an object with an async `__call__`.
+    :return: bool
+    '''
+    return asyncio.iscoroutinefunction(geocoder) or asyncio.iscoroutinefunction(getattr(geocoder, '__call__', None))
+
+
+def to_async_geocoder(geocoder, executor=None):
+    '''
+    :param geocoder: Function or coroutine function.
+    :param executor: Thread pool for sync geocoders. Default `None` for the default executor of the event loop.
+    :return: Coroutine function, a sync geocoder runs in a thread so the event loop is not blocked.
+    '''
+    if is_async_geocoder(geocoder):
+        return geocoder
+
+    async def geocode(address):
+        return await asyncio.get_running_loop().run_in_executor(executor, geocoder, address)
+
+    return geocode
+
+
+def to_point(value):
+    '''
+    :param value: `{"latitude": .., "longitude": ..}`, `{"lat": .., "lon": ..}`, `[latitude, longitude]` or None.
+    :return: (latitude, longitude) or None
+    '''
+    if not value:
+        return None
+    if isinstance(value, dict):
+        latitude = value.get('latitude', value.get('lat'))
+        longitude = value.get('longitude', value.get('lon', value.get('lng')))
+        return (float(latitude), float(longitude)) if latitude is not None and longitude is not None else None
+    latitude, longitude = value
+    return float(latitude), float(longitude)
+
+
+class TableGeocoder:
+    '''
+    Offline geocoder from a table of known addresses, eg: locations exported from your own system.
+    Addresses are matched by key, so case, accents and punctuation are ignored.
+    '''
+
+    def __init__(self, table: dict):
+        '''
+        :param table: dict, address -> (latitude, longitude)
+        '''
+        self.points = {key_normalize(address): to_point(point) for address, point in table.items()}
+
+    def __call__(self, address: str):
+        return self.points.get(key_normalize(address))
+
+
+class HTTPGeocoder:
+    '''
+    Geocoder calling a JSON HTTP API with `GET url?{param}=address`, eg: a local stand-in service for tests.
+    The response is `{"latitude": .., "longitude": ..}`, `[latitude, longitude]` or `null`, see `to_point()`.
+    '''
+
+    def __init__(self, url: str, param: str='address', timeout: float=10):
+        self.url = url
+        self.param = param
+        self.timeout = timeout
+
+    def __call__(self, address: str):
+        separator = '&' if '?' in self.url else '?'
+        with urlopen(f'{self.url}{separator}{urlencode({self.param: address})}', timeout=self.timeout) as response:
+            return to_point(json.loads(response.read().decode('utf-8')))
@@ -0,0 +1,64 @@
+from ..parser.parser_from_2025 import parse_address_from_2025, parse_addresses_from_2025
+from ..parser.parser_legacy import get_unit as get_old_unit
+from ..parser.objects import AdminUnit
+from .converter_2025 import DICT_PROVINCE, converter_data
+
+
+# INDEXES: new key -> old keys, xem build_data() trong converter_2025.py
+DICT_PROVINCE_NEW_OLD_WARDS = converter_data['DICT_PROVINCE_NEW_OLD_WARDS']
+
+# (new_province_key, new_ward_key) -> tuple AdminUnit cũ, tạo khi gặp lần đầu
+OLD_UNITS = {}
+
+
+def get_old_units(new_province_key: str, new_ward_key: str=None):
+    '''
+    :param new_province_key: Key of a 34-province province.
+    :param new_ward_key: Key of a new ward in that province, or None for the province only.
+
+    :return: tuple of 63-province AdminUnit objects: the old wards of the new ward, or the old provinces of the new province. Empty if unknown.
+    '''
+    key = (new_province_key, new_ward_key)
+    old_units = OLD_UNITS.get(key)
+    if old_units is None:
+        if new_ward_key:
+            old_province_district_ward_keys = DICT_PROVINCE_NEW_OLD_WARDS.get(new_province_key, {}).get(new_ward_key, [])
+            # Huyện đảo không có ward: 'thanhphohaiphong_huyenbachlongvi_'
+            old_units = tuple(get_old_unit(*(k or None for k in old_key.split('_'))) for old_key in old_province_district_ward_keys)
+        else:
+            old_units = tuple(get_old_unit(old_province_key) for old_province_key in DICT_PROVINCE.get(new_province_key, []))
+        OLD_UNITS[key] = old_units
+    return old_units
+
+
+def reverse_unit(new_unit: AdminUnit):
+    '''
+    :param new_unit: AdminUnit object parsed in FROM_2025 mode.
+
+    :return: tuple of candidate old AdminUnit objects, with the street of new_unit.
+    '''
+    old_units = get_old_units(new_unit.province_key, new_unit.ward_key) if new_unit.province_key else ()
+    if new_unit.street:
+        old_units = tuple(old_unit.with_street(new_unit.street) for old_unit in old_units)
+    return old_units
+
+
+# MAIN FUNCTION
+def reverse_address_2025(address: str):
+    '''
+    Convert an address from the 34-province format back to the 63-province units it was made of.
+    :param address: str - The new address to convert
+
+    :return: tuple of AdminUnit objects, see `reverse_unit()`
+    '''
+    return reverse_unit(parse_address_from_2025(address, keep_street=True, level=2))
+
+
+def reverse_addresses_2025(addresses):
+    '''
+    Convert many addresses back to the 63-province format, duplicated addresses are parsed once.
+    :param addresses: Iterable of new addresses
+
+    :return: List of tuples of AdminUnit objects, in the same order as addresses
+    '''
+    return [reverse_unit(new_unit) for new_unit in parse_addresses_from_2025(addresses, keep_street=True, level=2)]
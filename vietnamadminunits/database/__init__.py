@@ -1 +1 @@
-from .main import get_data, query
\ No newline at end of file
+from .main import get_data, query, iter_data, iter_query, get_data_columnar, find_units, get_connection
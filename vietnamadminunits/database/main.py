@@ -1,38 +1,240 @@
+import os
+import re
 import sqlite3
+import threading
 from pathlib import Path
 
 MODULE_DIR = Path(__file__).parent.parent
+DATABASE_PATH = MODULE_DIR / 'data/dataset.db'
 
+TABLES = ['admin_units', 'admin_units_legacy']
+LEVELS = ['province', 'district', 'ward']
+CODE_LENGTHS = {'province': 2, 'district': 3, 'ward': 5}
 
-def query(sql: str):
+# Một field: tên cột, có thể trong [] hoặc "", và alias tùy chọn, eg: 'provinceCode AS code'
+COLUMN_PATTERN = r'(?:\[(?P<bracketed>[^\]]+)\]|"(?P<quoted>[^"]+)"|(?P<column>\w+)|(?P<star>\*))'
+# Hoặc một hàm tổng hợp của cột, eg: 'COUNT(*) AS n', 'MAX(wardCode)'
+AGGREGATES = ['COUNT', 'MIN', 'MAX']
+FIELD_PATTERN = re.compile(rf"^(?:(?P<aggregate>{'|'.join(AGGREGATES)})\(\s*{COLUMN_PATTERN}\s*\)|{COLUMN_PATTERN.replace('?P<', '?P<plain_')})(?:\s+AS\s+(?P<alias>\w+))?$", re.IGNORECASE)
+
+# Mỗi thread một connection read-only, mở một lần và dùng lại
+_local = threading.local()
+_columns = {}
+
+
+def accented_key(text):
+    '''
+    :param text: Name, eg: `'Phường Ba Đình'`.
+    :return: Key with accents, eg: `'phườngbađình'`. Tone marks are normalized, `'Hoà'` and `'Hòa'` give the same key.
+    '''
+    from ..parser.utils import key_normalize, unicode_normalize, correct_typos, uppercase_first_letters
+
+    if not isinstance(text, str) or not text.strip():
+        return None
+    return key_normalize(correct_typos(uppercase_first_letters(unicode_normalize(text), all_first_letters=True)), decode=False)
+
+
+def get_connection():
+    '''
+    :return: Read-only `sqlite3.Connection` of the current thread, opened on first use.
+    '''
+    connection = getattr(_local, 'connection', None)
+    if connection is None or _local.pid != os.getpid():
+        if not DATABASE_PATH.exists():
+            raise FileNotFoundError(f'{DATABASE_PATH} is missing, build it with scripts/generating_module_data/s12_building_database.py.')
+        connection = sqlite3.connect(f'{DATABASE_PATH.as_uri()}?mode=ro', uri=True)
+        connection.create_function('accented_key', 1, accented_key, deterministic=True)
+        _local.connection = connection
+        _local.pid = os.getpid()
+    return connection
+
+
+def get_columns(table: str):
+    '''
+    :param table: Table name.
+    :return: List of column names.
+    '''
+    if table not in TABLES:
+        raise ValueError(f'Invalid table. Available tables are {TABLES}.')
+    if table not in _columns:
+        _columns[table] = [row[1] for row in get_connection().execute(f'PRAGMA table_info([{table}])')]
+    return _columns[table]
+
+
+def iter_query(sql: str, params=(), chunk_size: int=1000):
+    '''
+    Stream the rows of a query, only chunk_size rows are fetched at a time.
+
+    :param sql: SQL string, use `?` placeholders for values.
+    :param params: Values of the placeholders.
+    :param chunk_size: Rows fetched at a time.
+
+    :return: Generator of JSON-like dictionaries.
+    '''
+    cursor = get_connection().execute(sql, params)
+    columns = [c[0] for c in cursor.description]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def query(sql: str, params=()):
     '''
     Retrieve administrative unit data from the database.
 
-    :param sql: SQL string
+    :param sql: SQL string, use `?` placeholders for values.
+    :param params: Values of the placeholders.
 
     :return: Data as a list of JSON-like dictionaries. It is compatible with `pd.DataFrame`.
     '''
-    with sqlite3.connect(MODULE_DIR / 'data/dataset.db') as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        result = cursor.execute(sql)
-        records = [dict(r) for r in result.fetchall()]
-        return records
+    return list(iter_query(sql, params))
 
 
-def get_data(fields='*', table: str='admin_units', limit: int=None):
+def get_select(field: str, columns: list):
+    '''
+    :param field: Column name, or `COUNT`, `MIN`, `MAX` of a column, optionally with an alias.
+        Eg: `'provinceCode'`, `'provinceCode AS code'`, `'[provinceCode] as code'`, `'COUNT(*) AS n'`, `'MAX(wardCode)'`.
+    :param columns: Column names of the table.
+    :return: The quoted select expression, eg: `'[provinceCode] AS [code]'`, `'COUNT(*) AS [n]'`.
+    '''
+    match = FIELD_PATTERN.match(field)
+    if match and match['aggregate']:
+        column = match['bracketed'] or match['quoted'] or match['column'] or match['star']
+        valid = column in columns or (column == '*' and match['aggregate'].upper() == 'COUNT')
+        expression = f"{match['aggregate'].upper()}({'*' if column == '*' else f'[{column}]'})"
+    else:
+        column = match and (match['plain_bracketed'] or match['plain_quoted'] or match['plain_column'])
+        valid = column in columns
+        expression = f'[{column}]'
+    if not valid:
+        raise ValueError(f"Invalid field {field!r}. Fields are column names, or {AGGREGATES} of a column as 'COUNT(column)', 'COUNT(*)', optionally with an alias as 'column AS alias'. Available fields are {columns}.")
+    return f"{expression} AS [{match['alias']}]" if match['alias'] else expression
+
+
+def build_select(fields='*', table: str='admin_units', limit: int=None, where: dict=None):
+    '''
+    :return: (sql, params). Table and column names are checked against the schema, values are parameters.
+    '''
+    columns = get_columns(table)
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    fields = [f.strip() for f in fields]
+    selects = ['*'] if fields == ['*'] else [get_select(f, columns) for f in fields]
+
+    sql = f"SELECT DISTINCT {', '.join(selects)} FROM [{table}]"
+    params = []
+
+    conditions = []
+    for column, value in (where or {}).items():
+        if column not in columns:
+            raise ValueError(f'Invalid field {column!r}. Available fields are {columns}.')
+        if value is None:
+            conditions.append(f'[{column}] IS NULL')
+        elif isinstance(value, (list, tuple, set)):
+            value = list(value)
+            conditions.append(f"[{column}] IN ({', '.join('?' * len(value))})")
+            params += value
+        else:
+            conditions.append(f'[{column}] = ?')
+            params.append(value)
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+
+    if limit:
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+    return sql, params
+
+
+def get_data(fields='*', table: str='admin_units', limit: int=None, where: dict=None):
     '''
     Retrieve administrative unit data from the database.
 
-    :param fields: Column name(s) to retrieve.
+    :param fields: Column name(s) to retrieve, or `COUNT`, `MIN`, `MAX` of a column, each optionally with an alias. Eg: `'provinceCode AS code, province'`, `'COUNT(*) AS n'`.
     :param table: Table name, either `'admin_units'` (34-province) or `'admin_units_legacy'` (63-province).
+    :param limit: Max number of rows.
+    :param where: Filters, column -> value, or a list of values. Eg: `{'provinceCode': '01'}`.
 
     :return: Data as a list of JSON-like dictionaries. It is compatible with `pd.DataFrame`.
     '''
-    if isinstance(fields, list):
-        fields = ','.join(fields)
-    sql = f'SELECT DISTINCT {fields} FROM [{table}]'
+    return query(*build_select(fields=fields, table=table, limit=limit, where=where))
+
+
+def iter_data(fields='*', table: str='admin_units', limit: int=None, where: dict=None, chunk_size: int=1000):
+    '''
+    Stream administrative unit data, see `get_data()`.
+
+    :param chunk_size: Rows fetched at a time.
+
+    :return: Generator of JSON-like dictionaries.
+    '''
+    sql, params = build_select(fields=fields, table=table, limit=limit, where=where)
+    return iter_query(sql, params, chunk_size=chunk_size)
+
+
+def get_data_columnar(fields='*', table: str='admin_units', limit: int=None, where: dict=None):
+    '''
+    Retrieve administrative unit data as columns, without building a dictionary per row. See `get_data()`.
+
+    :return: dict, column -> list of values. It is compatible with `pd.DataFrame`.
+    '''
+    cursor = get_connection().execute(*build_select(fields=fields, table=table, limit=limit, where=where))
+    columns = [c[0] for c in cursor.description]
+    values = list(zip(*cursor.fetchall())) or [()] * len(columns)
+    return {column: list(v) for column, v in zip(columns, values)}
+
+
+def find_units(name: str=None, code=None, province: str=None, level: str='ward', table: str='admin_units', fields='*', limit: int=None):
+    '''
+    Find administrative units by name or code, using the indexes of the database.
+
+    :param name: Name of the unit at level, with or without type and accents. Eg: `'Phường Ba Đình'`, `'ba dinh'`. A name with accents only matches units with the same accents.
+    :param code: Code of the unit at level, leading zeros are optional. Eg: `'00004'`, `4`.
+    :param province: Name of the province, with or without type and accents.
+    :param level: `'province'`, `'district'` (`'admin_units_legacy'` only) or `'ward'`.
+    :param table: Table name, either `'admin_units'` (34-province) or `'admin_units_legacy'` (63-province).
+    :param fields: Column name(s) to retrieve.
+    :param limit: Max number of rows.
+
+    :return: Data as a list of JSON-like dictionaries.
+    '''
+    from ..parser.utils import key_normalize
+
+    if level not in LEVELS or (level == 'district' and table != 'admin_units_legacy'):
+        raise ValueError(f"Invalid level. Available levels are {LEVELS if table == 'admin_units_legacy' else ['province', 'ward']}.")
+
+    def get_name_condition(level, name):
+        # Key không dấu, hoặc có dấu cho các unit trùng key khi bỏ dấu
+        keys = list({key_normalize(name), key_normalize(name, decode=False)})
+        placeholders = ', '.join('?' * len(keys))
+        condition = f'([{level}Key] IN ({placeholders}) OR [{level}ShortKey] IN ({placeholders}))'
+        params = keys + keys
+        # Tên có dấu chỉ khớp unit cùng dấu: 'Sa Pả' không phải Phường Sa Pa
+        key = accented_key(name)
+        if key != key_normalize(name):
+            condition += f' AND (accented_key([{level}]) = ? OR accented_key([{level}Short]) = ?)'
+            params += [key, key]
+        return f'({condition})', params
+
+    sql, params = build_select(fields=fields, table=table, where={})
+    conditions = []
+    if name is not None:
+        condition, condition_params = get_name_condition(level, name)
+        conditions.append(condition)
+        params += condition_params
+    if province is not None:
+        condition, condition_params = get_name_condition('province', province)
+        conditions.append(condition)
+        params += condition_params
+    if code is not None:
+        conditions.append(f'[{level}Code] = ?')
+        params.append(str(code).zfill(CODE_LENGTHS[level]))
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
     if limit:
-        sql += f' LIMIT {limit}'
-    records = query(sql)
-    return records
\ No newline at end of file
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+    return query(sql, params)
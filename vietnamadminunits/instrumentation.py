@@ -0,0 +1,125 @@
+'''
+Opt-in instrumentation of the parsers and the converter: counts and timings of every stage and fallback tier, and a slow log.
+
+```python
+from vietnamadminunits import instrumentation
+
+instrumentation.enable(slow_threshold_ms=5)
+...
+instrumentation.get_stats()     # {'LEGACY.ward_accented': {'calls': 120, 'hits': 37, 'seconds': 0.004, 'mean_us': 33.3}, ...}
+instrumentation.get_slow_log()  # [{'dataset': 'LEGACY', 'address': '...', 'ms': 7.2}, ...]
+instrumentation.disable()
+```
+
+Disabled by default: the instrumented code only reads `RECORDER` once per call and skips everything when it is None.
+'''
+import threading
+from collections import deque
+from time import perf_counter
+
+
+# Recorder đang bật, None khi tắt
+RECORDER = None
+
+
+class Recorder:
+    '''
+    Aggregate stage events: `(dataset, stage) -> [calls, hits, seconds]`, and keep addresses slower than a threshold.
+    '''
+
+    def __init__(self, slow_threshold_ms: float=None, slow_log_size: int=100, hook=None):
+        self.slow_threshold = slow_threshold_ms / 1000 if slow_threshold_ms is not None else None
+        self.slow_log = deque(maxlen=slow_log_size)
+        self.hook = hook
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, dataset: str, stage: str, start: float, hit=True):
+        '''
+        :param dataset: `'FROM_2025'`, `'LEGACY'` or `'CONVERT_2025'`.
+        :param stage: Stage or tier name, eg: `'province'`, `'ward_accented'`.
+        :param start: `perf_counter()` at the start of the stage.
+        :param hit: Whether the stage found something, eg: a keyword.
+        '''
+        seconds = perf_counter() - start
+        hit = bool(hit)
+        with self._lock:
+            stats = self.stages.get((dataset, stage))
+            if stats is None:
+                stats = self.stages[(dataset, stage)] = [0, 0, 0.0]
+            stats[0] += 1
+            stats[1] += hit
+            stats[2] += seconds
+        if self.hook:
+            self.hook({'dataset': dataset, 'stage': stage, 'seconds': seconds, 'hit': hit})
+
+    def record_address(self, dataset: str, address, start: float):
+        '''
+        Record the total time of an address, and keep it in the slow log if it is slower than the threshold.
+        '''
+        seconds = perf_counter() - start
+        self.record(dataset, 'total', start)
+        if self.slow_threshold is not None and seconds >= self.slow_threshold:
+            with self._lock:
+                self.slow_log.append({'dataset': dataset, 'address': address, 'ms': seconds * 1000})
+
+
+def enable(slow_threshold_ms: float=None, slow_log_size: int=100, hook=None):
+    '''
+    Start recording, previous stats are discarded.
+
+    :param slow_threshold_ms: Keep addresses taking at least this many milliseconds in the slow log. Default `None` for no slow log.
+    :param slow_log_size: Max number of addresses in the slow log, the oldest are dropped first.
+    :param hook: Function called with every event `{'dataset', 'stage', 'seconds', 'hit'}`, eg: to feed a metrics client. It must be fast and thread-safe.
+    '''
+    global RECORDER
+    RECORDER = Recorder(slow_threshold_ms=slow_threshold_ms, slow_log_size=slow_log_size, hook=hook)
+
+
+def disable():
+    '''
+    Stop recording, `get_stats()` returns an empty dict afterwards.
+    '''
+    global RECORDER
+    RECORDER = None
+
+
+def is_enabled():
+    return RECORDER is not None
+
+
+def reset():
+    '''
+    Clear stats and slow log, keeping the current settings.
+    '''
+    recorder = RECORDER
+    if recorder:
+        with recorder._lock:
+            recorder.stages.clear()
+            recorder.slow_log.clear()
+
+
+def get_stats():
+    '''
+    :return: dict, `'DATASET.stage'` -> `{'calls', 'hits', 'seconds', 'mean_us'}`. `calls` counts how often a stage or fallback tier ran, `hits` how often it found something.
+    '''
+    recorder = RECORDER
+    if not recorder:
+        return {}
+    with recorder._lock:
+        stages = {key: list(stats) for key, stats in recorder.stages.items()}
+    return {
+        f'{dataset}.{stage}': {'calls': calls, 'hits': hits, 'seconds': seconds, 'mean_us': seconds / calls * 1e6}
+        for (dataset, stage), (calls, hits, seconds) in sorted(stages.items())
+    }
+
+
+def get_slow_log():
+    '''
+    :return: List of `{'dataset', 'address', 'ms'}`, oldest first.
+    '''
+    recorder = RECORDER
+    if not recorder:
+        return []
+    with recorder._lock:
+        return list(recorder.slow_log)
@@ -1 +1 @@
-from .main import standardize_admin_unit_columns, convert_address_column
\ No newline at end of file
+from .main import standardize_admin_unit_columns, convert_address_column, init_worker
\ No newline at end of file
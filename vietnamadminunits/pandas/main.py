@@ -1,10 +1,213 @@
-from ..parser import parse_address, ParseMode
-from ..converter import convert_address, ConvertMode
+from ..parser import parse_components_many, parse_addresses, ParseMode, warmup
+from ..converter import convert_address, convert_addresses, ConvertMode
+from ..parser.columnar import units_to_columns, DictionaryColumn
+import math
+import os
 import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 from typing import Union
 from tqdm import tqdm
 
-def standardize_admin_unit_columns(df, province: str, district: str=None, ward: str=None, parse_mode: Union[str, ParseMode]=ParseMode.latest(), convert_mode: Union[str, ConvertMode]=None, inplace=False, prefix: str='standardized_', suffix :str='', short_name: bool=True, show_progress: bool=True):
+
+PROGRESS_CHUNK_SIZE = 1000 # Số giá trị xử lý giữa hai lần cập nhật progress bar
+
+DTYPES = ['object', 'category', 'code']
+CODE_ATTRIBUTES = {
+    'province': 'province_code', 'short_province': 'province_code',
+    'district': 'district_code', 'short_district': 'district_code',
+    'ward': 'ward_code', 'short_ward': 'ward_code',
+}
+
+
+# WORKERS
+# Các hàm chạy trong process con phải ở cấp module để pickle được
+
+def init_worker(parse_mode: Union[str, ParseMode]=None, convert_mode: Union[str, ConvertMode]=None):
+    '''
+    Load data and compile patterns once per worker process.
+    '''
+    if convert_mode:
+        from ..converter import converter_2025
+        warmup()
+    else:
+        warmup(parse_mode)
+
+
+def parse_chunk(addresses: list, parse_mode: Union[str, ParseMode], convert_mode: Union[str, ConvertMode], level: int):
+    '''
+    :return: List of AdminUnit objects of a chunk, same as the serial path of `standardize_admin_unit_columns()`.
+    '''
+    if convert_mode:
+        return convert_addresses(addresses, mode=convert_mode)
+    return parse_addresses(addresses, mode=parse_mode, level=level, keep_street=False)
+
+
+def parse_components_chunk(rows: list, parse_mode: Union[str, ParseMode], level: int, given: tuple):
+    '''
+    :param rows: List of (ward, district, province) values.
+    :param given: (ward, district, province) booleans, whether each column is given.
+    :return: List of AdminUnit objects of a chunk, same as the serial path of `standardize_admin_unit_columns()`.
+    '''
+    wards, districts, provinces = [[row[i] for row in rows] if given[i] else None for i in range(3)]
+    return parse_components_many(wards=wards, districts=districts, provinces=provinces, mode=parse_mode, level=level)
+
+
+def convert_chunk(addresses: list, convert_mode: Union[str, ConvertMode], short_name: bool):
+    '''
+    :return: List of new addresses of a chunk, same as the serial path of `convert_address_column()`.
+    '''
+    return [admin_unit.get_address(short_name=short_name) for admin_unit in convert_addresses(addresses, mode=convert_mode)]
+
+
+def get_n_jobs(n_jobs: int):
+    '''
+    :param n_jobs: Number of processes, negative values count back from the number of CPUs (`-1` for all CPUs).
+    :return: int
+    '''
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        n_jobs = (os.cpu_count() or 1) + 1 + n_jobs
+    return max(n_jobs, 1)
+
+
+def apply_in_chunks(func, values: list, args: tuple=(), n_jobs: int=None, executor: Executor=None, initargs: tuple=(), desc: str=None, show_progress: bool=True):
+    '''
+    Apply `func(chunk, *args)` to chunks of values in a process pool, then join the results in the original order.
+
+    :param func: Module-level function returning a list with one item per value of the chunk.
+    :param values: List of values.
+    :param args: Extra arguments passed to func.
+    :param n_jobs: Number of processes, see `get_n_jobs()`. With executor, its number of workers, used to size the chunks, default all CPUs.
+    :param executor: A `concurrent.futures.Executor` to submit the chunks to. It is not shut down and `init_worker()` is not run in it, see `standardize_admin_unit_columns()`.
+    :param initargs: Arguments of `init_worker()` for the pool created with n_jobs.
+    :param desc: Progress bar description.
+    :param show_progress: Display a progress bar aggregated across workers.
+    :return: list
+    '''
+    n_workers = get_n_jobs(-1 if executor and n_jobs is None else n_jobs)
+    chunk_size = max(math.ceil(len(values) / (n_workers * 8)), 1) # Nhiều chunk hơn số worker để cân tải và cập nhật progress bar
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+    pool = executor or ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker, initargs=initargs)
+    try:
+        futures = {pool.submit(func, chunk, *args): i for i, chunk in enumerate(chunks)}
+        results = [None] * len(chunks)
+        with tqdm(total=len(values), desc=desc, disable=not show_progress) as progress_bar:
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                progress_bar.update(len(chunks[i]))
+    finally:
+        if not executor:
+            pool.shutdown()
+
+    return [result for chunk_results in results for result in chunk_results]
+
+
+def get_level(parse_mode: Union[str, ParseMode], convert_mode: Union[str, ConvertMode], district: str=None, ward: str=None):
+    '''
+    :return: Parse level matching the given columns, None in convert mode.
+    '''
+    if convert_mode:
+        return None
+    if parse_mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        return 2 if ward else 1
+    if parse_mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        return 3 if ward else 2 if district else 1
+    return None
+
+
+def can_parse_components(parse_mode: Union[str, ParseMode], convert_mode: Union[str, ConvertMode], district: str=None):
+    '''
+    :return: True if parsing each column separately gives the same units as parsing the joined address.
+    FROM_2025 has no district level, the district column is then matched as a ward in the joined address, eg: "Xã Xuân Đình, Huyện Phúc Thọ, Hà Nội" gives Xã Phúc Thọ.
+    '''
+    if convert_mode:
+        return False
+    return not (parse_mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value] and district)
+
+
+def apply_to_unique(func, values: list, args: tuple=(), n_jobs: int=None, executor: Executor=None, initargs: tuple=(), desc: str=None, show_progress: bool=True):
+    '''
+    Apply `func(chunk, *args)` to unique values, in a process pool if n_jobs or executor is given, see `apply_in_chunks()`.
+
+    :return: list
+    '''
+    if executor or get_n_jobs(n_jobs) > 1:
+        return apply_in_chunks(func, values, args=args, n_jobs=n_jobs, executor=executor, initargs=initargs, desc=desc, show_progress=show_progress)
+
+    results = []
+    with tqdm(total=len(values), desc=desc, disable=not show_progress) as progress_bar:
+        for i in range(0, len(values), PROGRESS_CHUNK_SIZE):
+            results += func(values[i:i + PROGRESS_CHUNK_SIZE], *args)
+            progress_bar.update(len(values[i:i + PROGRESS_CHUNK_SIZE]))
+    return results
+
+
+def factorize_columns(df, columns: list):
+    '''
+    Factorize the combination of columns without building a key column or copying the frame.
+
+    :param df: `pandas.DataFrame` object.
+    :param columns: Column names.
+    :return: (row_codes, first_rows) numpy arrays. `row_codes[i]` is the combination of row i, `first_rows[code]` is the first row of a combination.
+    '''
+    import numpy as np
+    import pandas as pd
+
+    row_codes = np.zeros(len(df), dtype=np.int64)
+    for column in columns:
+        codes, uniques = pd.factorize(df[column]) # NaN là -1 ở mọi phiên bản pandas, cộng 1 để NaN cũng là một giá trị
+        # Factorize lại sau mỗi cột để code không vượt quá số dòng
+        row_codes, _ = pd.factorize(row_codes * (len(uniques) + 1) + codes + 1)
+
+    # Code được đánh theo thứ tự xuất hiện, dòng đầu tiên của một code là dòng mà code vượt max trước đó
+    running_max = np.maximum.accumulate(row_codes)
+    first_rows = np.flatnonzero(np.concatenate([[True], running_max[1:] > running_max[:-1]])) if len(row_codes) else np.empty(0, dtype=np.int64)
+    return row_codes, first_rows
+
+
+def encode_column(column, row_codes, dtype: str):
+    '''
+    :param column: Values of each unique value, numpy array or DictionaryColumn, see `units_to_columns()`.
+    :param row_codes: numpy array, row -> unique value. None to keep one item per unique value.
+    :param dtype: `'object'`, `'category'` or `'code'`.
+    :return: numpy array or `pandas.Categorical`, one item per row.
+    '''
+    import pandas as pd
+
+    if not isinstance(column, DictionaryColumn):
+        return column if row_codes is None else column.take(row_codes)
+    codes = column.codes if row_codes is None else column.codes.take(row_codes)
+    if dtype == 'category':
+        return pd.Categorical.from_codes(codes, categories=column.categories)
+    return DictionaryColumn(codes, column.categories).to_numpy()
+
+
+def encode_units(units: list, target_columns: dict, dtype: str):
+    '''
+    :param units: AdminUnit objects of unique values.
+    :param target_columns: AdminUnit attribute -> target column name.
+    :param dtype: `'object'` or `'category'` for names, `'code'` for int32 codes (-1 if missing).
+    :return: dict, target column -> numpy array or DictionaryColumn, one item per unit.
+    '''
+    attributes = {target_col: CODE_ATTRIBUTES[attr] if dtype == 'code' else attr for attr, target_col in target_columns.items()}
+    columns = units_to_columns(units, columns=list(dict.fromkeys(attributes.values())))
+    return {target_col: columns[attr] for target_col, attr in attributes.items()}
+
+
+def encode_texts(texts: list):
+    '''
+    :return: DictionaryColumn of a list of strings.
+    '''
+    import pandas as pd
+
+    codes, categories = pd.factorize(pd.Series(texts, dtype=object))
+    return DictionaryColumn(codes, categories.to_numpy(dtype=object))
+
+
+def standardize_admin_unit_columns(df, province: str, district: str=None, ward: str=None, parse_mode: Union[str, ParseMode]=ParseMode.latest(), convert_mode: Union[str, ConvertMode]=None, inplace=False, prefix: str='standardized_', suffix :str='', short_name: bool=True, show_progress: bool=True, n_jobs: int=None, executor: Executor=None, low_memory: bool=False, dtype: str='object'):
     '''
     Standardizes administrative unit columns *(province, district, ward)* in a DataFrame.
 
@@ -19,6 +222,10 @@ def standardize_admin_unit_columns(df, province: str, district: str=None, ward:
     :param suffix: Added to new column names if `inplace=False`.
     :param short_name: Use short or full names for administrative units. Default `True`.
     :param show_progress: Display a progress bar during processing. Default `True`.
+    :param n_jobs: Number of processes to parse unique values, `-1` for all CPUs. Default `None` for the current process only.
+    :param executor: A `concurrent.futures.Executor` to use instead of creating a process pool with `n_jobs`, which is then its number of workers. Its workers are not warmed up, create it with `initializer=init_worker, initargs=(parse_mode, convert_mode)` to load data once per worker. Default `None`.
+    :param low_memory: Factorize the columns and map results back with `take`, without copying the frame, adding a key column or merging. The index is kept. Default `False`.
+    :param dtype: `'object'` for names, `'category'` for `pandas.Categorical` names, `'code'` for int32 codes of the units (-1 if missing). Default `'object'`.
 
     :return: `pandas.DataFrame` object.
     '''
@@ -30,6 +237,9 @@ def standardize_admin_unit_columns(df, province: str, district: str=None, ward:
     if not province:
         raise ValueError('The name of the province column must be provided')
 
+    if dtype not in DTYPES:
+        raise ValueError(f'Invalid dtype. Available dtypes are {DTYPES}.')
+
     if convert_mode:
         if not district or not ward:
             warnings.warn('The names of the District or Ward columns are not provided. Therefore, only the Province level will be converted.', UserWarning)
@@ -42,55 +252,77 @@ def standardize_admin_unit_columns(df, province: str, district: str=None, ward:
 
 
 
-    # INITIATIVE VARS
-    df = df.copy()
-    original_columns = df.columns.tolist()
-
+    # SPLIT ADMIN UNIT TO COLUMNS
+    target_columns = {}
+    for col_type, col_name in zip(['province', 'district', 'ward'], [province, district, ward]):
+        if not col_name:
+            continue
+        if col_type == 'district' and convert_mode:
+            continue  # skip if in convert_mode mode
 
-    # CREATE ADDRESS COLUMN, IT IS MERGING KEY
-    df['address'] = ''
-    for column in admin_unit_columns:
-        df['address'] += ',' + df[column].fillna('')
-    df_address = df[['address']].drop_duplicates()
+        attr = f"{'short_' if short_name else ''}{col_type}"
+        target_columns[attr] = col_name if inplace else f"{prefix}{col_name}{suffix}"
 
 
-    # PARSE ADDRESS TO NEW ADMIN UNIT
-    if convert_mode:
-        parser = lambda x: convert_address(address=x, mode=convert_mode)
+    # UNIQUE VALUES
+    if low_memory:
+        # Mỗi tổ hợp giá trị là một code số nguyên, không tạo cột address và không copy df
+        row_codes, first_rows = factorize_columns(df, admin_unit_columns)
+        unique_values = {column: df[column].to_numpy().take(first_rows) for column in admin_unit_columns}
     else:
-        if parse_mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
-            level = 2 if ward else 1
-        elif parse_mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
-            level = 3 if ward else 2 if district else 1
-        parser = lambda x: parse_address(address=x, mode=parse_mode, level=level, keep_street=False)
+        df = df.copy()
+        original_columns = df.columns.tolist()
 
+        # CREATE ADDRESS COLUMN, IT IS MERGING KEY
+        df['address'] = ''
+        for column in admin_unit_columns:
+            df['address'] += ',' + df[column].fillna('')
+        df_address = df[['address'] + admin_unit_columns].drop_duplicates(subset=['address'])
+        unique_values = {column: df_address[column].to_numpy() for column in admin_unit_columns}
 
-    if show_progress:
-        tqdm.pandas(desc="Standardizing unique administrative units")
-        df_address['admin_unit'] = df_address['address'].progress_apply(parser)
-    else:
-        df_address['admin_unit'] = df_address['address'].apply(parser)
 
+    # PARSE ADDRESS TO NEW ADMIN UNIT
+    level = get_level(parse_mode=parse_mode, convert_mode=convert_mode, district=district, ward=ward)
 
-    # SPLIT ADMIN UNIT TO COLUMNS
-    for col_type, col_name in zip(['province', 'district', 'ward'], [province, district, ward]):
-        if not col_name:
-            continue
-        if col_type == 'district' and convert_mode:
-            continue  # skip if in convert_mode mode
+    if not can_parse_components(parse_mode=parse_mode, convert_mode=convert_mode, district=district):
+        # Converter cần địa chỉ cũ đầy đủ, FROM_2025 có cột district thì ghép để giữ kết quả của địa chỉ đầy đủ
+        rows = zip(*[unique_values[column] for column in admin_unit_columns])
+        values = [''.join(',' + (value if isinstance(value, str) else '') for value in row) for row in rows]
+        func, args = parse_chunk, (parse_mode, convert_mode, level)
+    else:
+        # Các cột đã tách sẵn: mỗi cột chỉ so với index của level đó, không ghép rồi quét lại cả địa chỉ
+        given = tuple(bool(column) for column in [ward, district, province])
+        n_unique = len(unique_values[province])
+        values = list(zip(*[unique_values[column].tolist() if column else [None] * n_unique for column in [ward, district, province]]))
+        func, args = parse_components_chunk, (parse_mode, level, given)
 
-        attr = f"{'short_' if short_name else ''}{col_type}"
-        target_col = col_name if inplace else f"{prefix}{col_name}{suffix}"
-        df_address[target_col] = df_address['admin_unit'].apply(lambda x: getattr(x, attr) if x else None)
+    admin_units = apply_to_unique(func, values, args=args, n_jobs=n_jobs, executor=executor, initargs=(parse_mode, convert_mode), desc="Standardizing unique administrative units", show_progress=show_progress)
+
+    # Đọc thuộc tính một lần cho mỗi unit phân biệt, rồi gán cả cột
+    columns = encode_units(admin_units, target_columns, dtype)
 
 
     # ADD NEW ADMIN UNIT COLUMNS TO DF
+    if low_memory:
+        # Copy nông: các cột cũ dùng chung dữ liệu với df, chỉ các cột mới được tạo
+        df = df.copy(deep=False)
+        if inplace:
+            for column in admin_unit_columns:
+                if column not in target_columns.values():
+                    del df[column]
+        for target_col, column in columns.items():
+            df[target_col] = encode_column(column, row_codes, dtype)
+        return df
+
+    for target_col, column in columns.items():
+        df_address[target_col] = encode_column(column, None, dtype)
+
     # Drop original columns (province/district/ward) if inplace
     if inplace:
         df.drop(columns=admin_unit_columns, inplace=True, errors='ignore')
 
     # Merge standardized columns to df
-    df = df.merge(df_address.drop(columns=['admin_unit']), on='address', how='left')
+    df = df.merge(df_address[['address'] + list(target_columns.values())], on='address', how='left')
 
     # Drop address columns
     df.drop(columns=['address'], inplace=True)
@@ -103,7 +335,7 @@ def standardize_admin_unit_columns(df, province: str, district: str=None, ward:
     return df
 
 
-def convert_address_column(df, address: str, convert_mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, inplace=False, prefix: str='converted_', suffix :str='', short_name: bool=True, show_progress: bool=True):
+def convert_address_column(df, address: str, convert_mode: Union[str, ConvertMode]=ConvertMode.CONVERT_2025, inplace=False, prefix: str='converted_', suffix :str='', short_name: bool=True, show_progress: bool=True, n_jobs: int=None, executor: Executor=None, low_memory: bool=False, dtype: str='object'):
     '''
     Convert an address column in a DataFrame.
 
@@ -115,14 +347,32 @@ def convert_address_column(df, address: str, convert_mode: Union[str, ConvertMod
     :param suffix: Added to new column names if `inplace=False`.
     :param short_name: Use short or full names for administrative units. Default `True`.
     :param show_progress: Display a progress bar during processing. Default `True`.
+    :param n_jobs: Number of processes to convert unique addresses, `-1` for all CPUs. Default `None` for the current process only.
+    :param executor: A `concurrent.futures.Executor` to use instead of creating a process pool with `n_jobs`, which is then its number of workers. Its workers are not warmed up, create it with `initializer=init_worker, initargs=(None, convert_mode)` to load data once per worker. Default `None`.
+    :param low_memory: Factorize the column and map results back with `take`, without copying the frame or merging. The index is kept. Default `False`.
+    :param dtype: `'object'` for strings or `'category'` for a `pandas.Categorical` column. Default `'object'`.
 
     :return: `pandas.DataFrame` object.
     '''
 
+    if dtype not in ['object', 'category']:
+        raise ValueError("Invalid dtype. Available dtypes are ['object', 'category'].")
+
     def convert_and_get_address(x):
         admin_unit = convert_address(address=x, mode=convert_mode)
         return admin_unit.get_address(short_name=short_name)
 
+    target_col = address if inplace else f'{prefix}{address}{suffix}'
+
+    # LOW MEMORY: mỗi địa chỉ khác nhau là một code số nguyên, không copy df và không merge
+    if low_memory:
+        row_codes, first_rows = factorize_columns(df, [address])
+        addresses = ['' if not isinstance(value, str) else value for value in df[address].to_numpy().take(first_rows)]
+        new_addresses = apply_to_unique(convert_chunk, addresses, args=(convert_mode, short_name), n_jobs=n_jobs, executor=executor, initargs=(None, convert_mode), desc="Converting unique addresses", show_progress=show_progress)
+        df = df.copy(deep=False)
+        df[target_col] = encode_column(encode_texts(new_addresses), row_codes, dtype)
+        return df
+
     # INITIATIVE VARS
     df = df.copy()
     original_columns = df.columns.tolist()
@@ -131,12 +381,17 @@ def convert_address_column(df, address: str, convert_mode: Union[str, ConvertMod
     df_address = df[[address]].drop_duplicates()
 
     # CONVERT ADDRESS
-    if show_progress:
+    if executor or get_n_jobs(n_jobs) > 1:
+        df_address['new_address'] = apply_in_chunks(convert_chunk, df_address[address].fillna('').tolist(), args=(convert_mode, short_name), n_jobs=n_jobs, executor=executor, initargs=(None, convert_mode), desc="Converting unique addresses", show_progress=show_progress)
+    elif show_progress:
         tqdm.pandas(desc="Converting unique addresses")
         df_address['new_address'] = df_address[address].fillna('').progress_apply(convert_and_get_address)
     else:
         df_address['new_address'] = df_address[address].fillna('').apply(convert_and_get_address)
 
+    if dtype == 'category':
+        df_address['new_address'] = df_address['new_address'].astype('category')
+
     # ADD NEW ADDRESS TO DF
     df = df.merge(df_address, on=address, how='left')
 
@@ -146,6 +401,6 @@ def convert_address_column(df, address: str, convert_mode: Union[str, ConvertMod
         df.rename(columns={'new_address': address}, inplace=True)
         df = df[original_columns]
     else:
-        df.rename(columns={'new_address': f'{prefix}{address}{suffix}'}, inplace=True)
+        df.rename(columns={'new_address': target_col}, inplace=True)
 
-    return df
\ No newline at end of file
+    return df
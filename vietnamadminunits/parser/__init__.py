@@ -1,8 +1,26 @@
-from .parser_from_2025 import parse_address_from_2025
-from .parser_legacy import parse_address_legacy
 from enum import Enum
 from typing import Union
 
+from ..cache import RESULT_CACHES
+
+
+# Dữ liệu của mỗi mode chỉ được load khi dùng lần đầu, để import vietnamadminunits nhanh
+def __getattr__(name):
+    if name == 'parse_address_from_2025':
+        from .parser_from_2025 import parse_address_from_2025
+        return parse_address_from_2025
+    if name == 'parse_address_legacy':
+        from .parser_legacy import parse_address_legacy
+        return parse_address_legacy
+    if name == 'parse_addresses_from_2025':
+        from .parser_from_2025 import parse_addresses_from_2025
+        return parse_addresses_from_2025
+    if name == 'parse_addresses_legacy':
+        from .parser_legacy import parse_addresses_legacy
+        return parse_addresses_legacy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class ParseMode(Enum):
     LEGACY = "LEGACY"
     FROM_2025 = "FROM_2025"
@@ -27,14 +45,206 @@ def parse_address(address: str, mode: Union[str, ParseMode]=ParseMode.latest(),
     :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
     :param keep_street: Keep the street in the result, works only if there are enough commas: 2+ for *FROM_2025* mode, 3+ for *LEGACY* mode.
     :param level: *FROM_2025* mode accepts `1` or `2`. *LEGACY* mode accepts `1`, `2`, or `3`. Default `0` for highest level automatically.
-    :return: AdminUnit object.
+    :return: AdminUnit object. Results are cached per mode, see `cache_info()`.
+    '''
+
+    if mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        from .parser_from_2025 import parse_address_from_2025
+        level = 2 if not level else level
+        return RESULT_CACHES['FROM_2025'].get_or_parse(address, (level, keep_street), lambda x: parse_address_from_2025(x, keep_street=keep_street, level=level))
+    elif mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        from .parser_legacy import parse_address_legacy
+        level = 3 if not level else level
+        return RESULT_CACHES['LEGACY'].get_or_parse(address, (level, keep_street), lambda x: parse_address_legacy(x, keep_street=keep_street, level=level))
+    else:
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
+
+
+def parse_addresses(addresses, mode: Union[str, ParseMode]=ParseMode.latest(), keep_street: bool=True, level: int=0):
+    '''
+    Parse many addresses to AdminUnit objects. Addresses having the same normalized key are parsed only once, so repeated addresses in a big column are cheap.
+
+    :param addresses: Iterable of addresses, see `parse_address()`.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param keep_street: Keep the street in the result, see `parse_address()`.
+    :param level: *FROM_2025* mode accepts `1` or `2`. *LEGACY* mode accepts `1`, `2`, or `3`. Default `0` for highest level automatically.
+    :return: List of AdminUnit objects, in the same order as addresses. Each item is the same as `parse_address()` of that address.
     '''
 
     if mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        from .parser_from_2025 import parse_addresses_from_2025
         level = 2 if not level else level
-        return parse_address_from_2025(address, keep_street=keep_street, level=level)
+        return parse_addresses_from_2025(addresses, keep_street=keep_street, level=level)
     elif mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        from .parser_legacy import parse_addresses_legacy
         level = 3 if not level else level
-        return parse_address_legacy(address, keep_street=keep_street, level=level)
+        return parse_addresses_legacy(addresses, keep_street=keep_street, level=level)
+    else:
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
+
+
+def parse_addresses_columnar(addresses, mode: Union[str, ParseMode]=ParseMode.latest(), keep_street: bool=True, level: int=0, columns: list=None, arrow: bool=False):
+    '''
+    Parse many addresses to columns instead of AdminUnit objects, see `parse_addresses()`.
+
+    :param addresses: Iterable of addresses.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param keep_street: Keep the street in the result, see `parse_address()`.
+    :param level: *FROM_2025* mode accepts `1` or `2`. *LEGACY* mode accepts `1`, `2`, or `3`. Default `0` for highest level automatically.
+    :param columns: AdminUnit attributes to output. Default `None` for all attributes.
+    :param arrow: Return a `pyarrow.Table` (requires pyarrow). Default `False`.
+    :return: dict, column -> numpy array for codes (int32, -1 if missing, `format_codes()` gives back the text codes) and coordinates (float64, NaN if missing), `DictionaryColumn(codes, categories)` for text. Or a `pyarrow.Table` with dictionary-encoded text columns.
+    '''
+    from .columnar import pairs_to_columns
+
+    # Điền cột trực tiếp từ unit dùng chung của mỗi key và street, không tạo AdminUnit cho từng dòng
+    if mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        from .parser_from_2025 import iter_addresses_from_2025
+        pairs = iter_addresses_from_2025(addresses, keep_street=keep_street, level=2 if not level else level)
+    elif mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        from .parser_legacy import iter_addresses_legacy
+        pairs = iter_addresses_legacy(addresses, keep_street=keep_street, level=3 if not level else level)
+    else:
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
+    return pairs_to_columns(pairs, columns=columns, arrow=arrow)
+
+
+def parse_components(ward: str=None, district: str=None, province: str=None, mode: Union[str, ParseMode]=ParseMode.latest(), level: int=0):
+    '''
+    Parse an administrative unit given as separate fields, each field is matched against its own level only.
+
+    :param ward: Ward name, eg: `'P. Ba Đình'`. Default `None` if not given.
+    :param district: District name, used in *LEGACY* mode only. Default `None` if not given.
+    :param province: Province name, eg: `'Hà Nội'`. At least one field must be given.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param level: *FROM_2025* mode accepts `1` or `2`. *LEGACY* mode accepts `1`, `2`, or `3`. Default `0` for highest level automatically.
+    :return: AdminUnit object without street. If a field is ambiguous, the same as `parse_address()` of the fields joined with commas. An empty AdminUnit if every field is empty, like `parse_address('')`.
+    '''
+    return parse_components_many(
+        wards=None if ward is None else [ward],
+        districts=None if district is None else [district],
+        provinces=None if province is None else [province],
+        mode=mode, level=level,
+    )[0]
+
+
+def parse_components_many(wards=None, districts=None, provinces=None, mode: Union[str, ParseMode]=ParseMode.latest(), level: int=0):
+    '''
+    Parse many administrative units given as separate fields, see `parse_components()`. Repeated rows are parsed only once.
+
+    :param wards: Iterable of ward names, eg: a pandas Series. Default `None` if not given.
+    :param districts: Iterable of district names, used in *LEGACY* mode only. Default `None` if not given.
+    :param provinces: Iterable of province names, same length as the other fields. At least one field must be given.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param level: *FROM_2025* mode accepts `1` or `2`. *LEGACY* mode accepts `1`, `2`, or `3`. Default `0` for highest level automatically.
+    :return: List of AdminUnit objects, in the same order as the fields. A row whose fields are all None or NaN gives an empty AdminUnit.
+    '''
+    from .components import parse_rows
+
+    if mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        mode, level = 'FROM_2025', level or 2
+        if level not in [1, 2]:
+            raise ValueError('Level must be 1, or 2')
+    elif mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        mode, level = 'LEGACY', level or 3
+        if level not in [1, 2, 3]:
+            raise ValueError('Level must be 1, 2, or 3')
+    else:
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
+
+    if wards is None and districts is None and provinces is None:
+        raise ValueError('At least one field is required.')
+
+    fields = [list(values) if values is not None else None for values in (wards, districts, provinces)]
+    lengths = {len(values) for values in fields if values is not None}
+    if len(lengths) > 1:
+        raise ValueError('wards, districts and provinces must have the same length.')
+    n_rows = lengths.pop() if lengths else 0
+
+    columns = [[(value, True) for value in values] if values is not None else [(None, False)] * n_rows for values in fields]
+    return parse_rows(zip(*columns), mode=mode, level=level)
+
+
+def locate(latitude: float, longitude: float, mode: Union[str, ParseMode]=ParseMode.latest(), max_distance_km: float=None):
+    '''
+    Find the ward of a coordinate: the ward whose centroid is nearest, using a prebuilt spatial index.
+    This is an approximation, not a point-in-ward test: ward boundaries are not used, so a point near a boundary may get the neighbouring ward.
+
+    :param latitude: float
+    :param longitude: float
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param max_distance_km: Return None if the nearest ward centroid is farther than this, in km, eg: `5` to reject points at sea or across the border. It limits the distance to a centroid, not to the ward boundary. Default `None` for no limit.
+    :return: AdminUnit object of the nearest ward centroid, the same as `parse_address()` of that ward. None for missing coordinates and points more than about 50 km beyond the outermost centroids.
+    '''
+    return locate_many([latitude], [longitude], mode=mode, max_distance_km=max_distance_km)[0]
+
+
+def locate_many(latitudes, longitudes, mode: Union[str, ParseMode]=ParseMode.latest(), max_distance_km: float=None):
+    '''
+    Find the wards of many coordinates in one vectorized pass, see `locate()`. Results are the nearest ward centroids, not point-in-ward tests.
+
+    :param latitudes: Array-like of latitudes, eg: a numpy array or a pandas Series.
+    :param longitudes: Array-like of longitudes, same length as latitudes.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param max_distance_km: Return None if the nearest ward centroid is farther than this, in km, see `locate()`. Default `None` for no limit.
+    :return: List of AdminUnit objects or None, in the same order.
+    '''
+    from .locator import locate_points
+
+    if mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        return locate_points(latitudes, longitudes, mode='FROM_2025', max_distance_km=max_distance_km)
+    elif mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        return locate_points(latitudes, longitudes, mode='LEGACY', max_distance_km=max_distance_km)
     else:
-        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
\ No newline at end of file
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
+
+
+def lookup_by_code(code, mode: Union[str, ParseMode]=ParseMode.latest(), level: int=0):
+    '''
+    Get the AdminUnit of a GSO code, without parsing any text.
+
+    :param code: Code of the unit at level, leading zeros are optional. Eg: `'00004'`, `4`.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param level: Level of the code. *FROM_2025* mode accepts `1` (province) or `2` (ward). *LEGACY* mode accepts `1` (province), `2` (district), or `3` (ward). Default `0` for ward.
+    :return: AdminUnit object, the same as `parse_address()` of that unit. None if the code is unknown.
+    '''
+    return lookup_by_codes([code], mode=mode, level=level)[0]
+
+
+def lookup_by_codes(codes, mode: Union[str, ParseMode]=ParseMode.latest(), level: int=0):
+    '''
+    Get the AdminUnit objects of many GSO codes in one vectorized lookup, see `lookup_by_code()`.
+
+    :param codes: Array-like of codes, eg: a list, a numpy array or a pandas Series. Integer arrays are looked up without conversion.
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `ParseMode.latest()`.
+    :param level: See `lookup_by_code()`.
+    :return: List of AdminUnit objects or None, in the same order as codes.
+    '''
+    from .codes import lookup_codes, LEVELS
+
+    if mode in [ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        mode = 'FROM_2025'
+    elif mode in [ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        mode = 'LEGACY'
+    else:
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
+    level = LEVELS[mode][-1] if not level else level
+    if level not in LEVELS[mode]:
+        raise ValueError(f'Invalid level. {mode} mode accepts {LEVELS[mode]}.')
+    return lookup_codes(codes, mode=mode, level=level)
+
+
+def warmup(mode: Union[str, ParseMode]=None):
+    '''
+    Compile ward patterns ahead of the first call, useful before a batch job or forking workers.
+
+    :param mode: `'FROM_2025'` (34-province) or `'LEGACY'` (63-province). Default `None` for all modes.
+    '''
+    if mode in [None, ParseMode.FROM_2025, ParseMode.FROM_2025.value]:
+        from . import parser_from_2025
+        parser_from_2025.warmup()
+    if mode in [None, ParseMode.LEGACY, ParseMode.LEGACY.value]:
+        from . import parser_legacy
+        parser_legacy.warmup()
+    if mode not in [None] + ParseMode.available() + ParseMode.available(value=True):
+        raise ValueError(f"Invalid mode. Available modes are {ParseMode.available(value=True)}.")
@@ -0,0 +1,137 @@
+'''
+Lookup by administrative code: code -> AdminUnit, without parsing any text.
+
+GSO codes are unique per level, so each (mode, level) has a table indexed by the integer code.
+Tables are built once from the parser data on first use, a lookup is a single array access, and many codes are looked up in one numpy `take`.
+'''
+# (mode, level) -> numpy array of AdminUnit, indexed by int(code). Phần tử cuối là None cho các code không tồn tại
+_tables = {}
+
+
+def iter_units_from_2025(level: int):
+    '''
+    :param level: `1` (province) or `2` (ward).
+    :return: Generator of (code, AdminUnit), the same unit as `parse_address()` at that level.
+    '''
+    from . import parser_from_2025 as parser
+
+    for province_key, province in parser.DICT_PROVINCE.items():
+        if level == 1:
+            yield province['provinceCode'], parser.get_unit(province_key)
+            continue
+        for DICT_WARD in [parser.DICT_PROVINCE_WARD_NO_ACCENTED.get(province_key, {}), parser.DICT_PROVINCE_WARD_ACCENTED.get(province_key, {})]:
+            for ward_key, ward in DICT_WARD.items():
+                yield ward['wardCode'], parser.get_unit(province_key, ward_key)
+
+
+def iter_units_legacy(level: int):
+    '''
+    :param level: `1` (province), `2` (district) or `3` (ward).
+    :return: Generator of (code, AdminUnit), the same unit as `parse_address()` at that level.
+    '''
+    from . import parser_legacy as parser
+
+    for province_key, province in parser.DICT_PROVINCE.items():
+        if level == 1:
+            yield province['provinceCode'], parser.get_unit(province_key)
+            continue
+        for district_key, district in parser.DICT_PROVINCE_DISTRICT[province_key].items():
+            if level == 2:
+                yield district['districtCode'], parser.get_unit(province_key, district_key)
+                continue
+            for DICT_WARD in [parser.DICT_PROVINCE_DISTRICT_WARD_NO_ACCENTED.get(province_key, {}).get(district_key, {}), parser.DICT_PROVINCE_DISTRICT_WARD_ACCENTED.get(province_key, {}).get(district_key, {})]:
+                for ward_key, ward in DICT_WARD.items():
+                    if isinstance(ward['wardCode'], str): # Huyện đảo có một ward rỗng
+                        yield ward['wardCode'], parser.get_unit(province_key, district_key, ward_key)
+
+
+BUILDS = {
+    'FROM_2025': iter_units_from_2025,
+    'LEGACY': iter_units_legacy,
+}
+
+LEVELS = {
+    'FROM_2025': [1, 2],
+    'LEGACY': [1, 2, 3],
+}
+
+
+def build_table(code_units):
+    '''
+    :param code_units: Iterable of (code, AdminUnit or None).
+    :return: numpy object array, `table[int(code)]` is the unit of that code, the last element is None.
+    '''
+    import numpy as np
+
+    code_units = [(int(code), unit) for code, unit in code_units]
+    table = np.full(max(code for code, _ in code_units) + 2, None, dtype=object)
+    for code, unit in code_units:
+        table[code] = unit
+    return table
+
+
+def get_table(mode: str, level: int, build=None):
+    '''
+    :param mode: `'FROM_2025'`, `'LEGACY'`, or another name together with build.
+    :param level: Level of the codes.
+    :param build: Function level -> iterable of (code, AdminUnit). Default the parser data of mode.
+    :return: numpy object array, see `build_table()`. Built once per mode and level.
+    '''
+    table = _tables.get((mode, level))
+    if table is None:
+        table = _tables[(mode, level)] = build_table((build or BUILDS[mode])(level))
+    return table
+
+
+def to_position(code, size: int):
+    '''
+    :param code: `'00004'`, `4`, `4.0`, None or NaN.
+    :param size: Length of the table.
+    :return: int, position of code in the table, `size - 1` (None) if missing or invalid.
+    '''
+    try:
+        position = int(code)
+    except (TypeError, ValueError, OverflowError):
+        return size - 1 # None, NaN, chuỗi không phải số
+    if isinstance(code, float) and position != code:
+        return size - 1
+    return position if 0 <= position < size - 1 else size - 1
+
+
+def get_positions(codes, size: int):
+    '''
+    :param codes: Array-like of codes, eg: a list, a numpy array or a pandas Series.
+    :param size: Length of the table.
+    :return: numpy int64 array of positions in the table, see `to_position()`.
+    '''
+    import numpy as np
+
+    values = np.asarray(codes)
+    if values.dtype.kind in 'iu':
+        positions = values.astype(np.int64).ravel()
+    elif values.dtype.kind == 'f':
+        values = values.ravel()
+        with np.errstate(invalid='ignore'):
+            positions = np.where(np.isfinite(values) & (values == np.floor(values)), values, -1).astype(np.int64)
+    else:
+        # Mỗi code khác nhau chỉ chuyển một lần, cột lớn thường lặp lại nhiều
+        uniques = {}
+        inverse = np.fromiter((uniques.setdefault(code, len(uniques)) for code in values.ravel().tolist()), dtype=np.int64, count=values.size)
+        positions = np.array([to_position(code, size) for code in uniques], dtype=np.int64)[inverse] if uniques else np.empty(0, dtype=np.int64)
+    return np.where((positions >= 0) & (positions < size - 1), positions, size - 1)
+
+
+def lookup_code(code, mode: str, level: int, build=None):
+    '''
+    :return: AdminUnit object or None, see `get_table()`.
+    '''
+    table = get_table(mode, level, build=build)
+    return table[to_position(code, len(table))]
+
+
+def lookup_codes(codes, mode: str, level: int, build=None):
+    '''
+    :return: List of AdminUnit objects or None, in the same order as codes.
+    '''
+    table = get_table(mode, level, build=build)
+    return table.take(get_positions(codes, len(table))).tolist()
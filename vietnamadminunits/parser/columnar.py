@@ -0,0 +1,161 @@
+from collections import namedtuple
+
+from .objects import BASE_FIELDS
+
+
+# Các cột số: code là số nguyên (-1 nếu không có), tọa độ là float (NaN nếu không có)
+CODE_COLUMNS = ['province_code', 'district_code', 'ward_code']
+# Số chữ số của code theo GSO, dùng để thêm lại các số 0 ở đầu, eg: 4 -> '00004'
+CODE_WIDTHS = {'province_code': 2, 'district_code': 3, 'ward_code': 5}
+FLOAT_COLUMNS = ['latitude', 'longitude']
+
+DEFAULT_COLUMNS = [
+    'province', 'district', 'ward', 'street',
+    'short_province', 'short_district', 'short_ward',
+    'district_type', 'ward_type',
+    'province_code', 'district_code', 'ward_code',
+    'latitude', 'longitude',
+    'province_key', 'district_key', 'ward_key',
+]
+
+
+class DictionaryColumn(namedtuple('DictionaryColumn', ['codes', 'categories'])):
+    '''
+    Dictionary-encoded text column: `categories[codes[i]]` is the value of row i, code `-1` is None.
+    '''
+
+    __slots__ = ()
+
+    def to_numpy(self):
+        '''
+        :return: numpy object array of values, None where code is -1.
+        '''
+        import numpy as np
+
+        values = np.empty(len(self.categories) + 1, dtype=object)
+        values[:-1] = self.categories
+        return values[self.codes] # -1 lấy phần tử cuối là None
+
+    def to_pandas(self):
+        '''
+        :return: `pandas.Categorical`
+        '''
+        import pandas as pd
+
+        return pd.Categorical.from_codes(self.codes, categories=self.categories)
+
+    def to_arrow(self):
+        '''
+        :return: `pyarrow.DictionaryArray`
+        '''
+        import pyarrow as pa
+
+        return pa.DictionaryArray.from_arrays(pa.array(self.codes, mask=self.codes < 0), pa.array(self.categories, type=pa.string()))
+
+
+def to_code(value):
+    '''
+    :param value: Code, eg: `'27007'`.
+    :return: int, -1 if missing.
+    '''
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def format_codes(values, column: str):
+    '''
+    Convert an int code column back to the codes of AdminUnit, with leading zeros.
+
+    :param values: Int codes, eg: `units_to_columns(units)['ward_code']`, -1 for missing.
+    :param column: `'province_code'`, `'district_code'` or `'ward_code'`.
+    :return: numpy object array, eg: `['00004', None]`.
+    '''
+    import numpy as np
+
+    if column not in CODE_WIDTHS:
+        raise ValueError(f"Invalid column {column!r}. Available columns are {CODE_COLUMNS}.")
+    width = CODE_WIDTHS[column]
+    return np.array([str(v).zfill(width) if v >= 0 else None for v in np.asarray(values).tolist()], dtype=object)
+
+
+def encode_values(values: list, row_index, dtype):
+    '''
+    Encode one value per unit base, then expand to rows.
+
+    :param values: Values of each distinct base.
+    :param row_index: numpy array, row -> base index.
+    :param dtype: `'code'`, `'float'` or `'text'`.
+    :return: numpy array or DictionaryColumn
+    '''
+    import numpy as np
+
+    if dtype == 'code':
+        return np.array([to_code(v) for v in values], dtype=np.int32)[row_index]
+    if dtype == 'float':
+        return np.array([v if v is not None else np.nan for v in values], dtype=np.float64)[row_index]
+
+    categories = {}
+    codes = np.array([categories.setdefault(v, len(categories)) if v is not None else -1 for v in values], dtype=np.int32)
+    return DictionaryColumn(codes[row_index], np.array(list(categories), dtype=object))
+
+
+def units_to_columns(units, columns: list=None, arrow: bool=False):
+    '''
+    Convert AdminUnit objects to columns. Attributes are read once per distinct unit, rows only carry indexes.
+
+    :param units: Iterable of AdminUnit objects, see `parse_addresses()`. None is a row where every column is missing.
+    :param columns: Attributes to output, default `DEFAULT_COLUMNS`.
+    :param arrow: Return a `pyarrow.Table` instead of a dict.
+    :return: See `pairs_to_columns()`.
+    '''
+    return pairs_to_columns(((unit, None if unit is None else unit.street) for unit in units), columns=columns, arrow=arrow)
+
+
+def pairs_to_columns(pairs, columns: list=None, arrow: bool=False):
+    '''
+    Fill columns from (unit, street) rows, without an AdminUnit per row.
+
+    :param pairs: Iterable of (AdminUnit, street), see `iter_addresses_legacy()`. A unit is usually shared by many rows. None unit is a row where every column is missing.
+    :param columns: Attributes to output, default `DEFAULT_COLUMNS`.
+    :param arrow: Return a `pyarrow.Table` instead of a dict.
+    :return: dict, column -> numpy array or DictionaryColumn (text). Codes are int32 with -1 for None, leading zeros are lost, see `format_codes()`. Coordinates are float64 with NaN for None.
+    '''
+    import numpy as np
+
+    columns = DEFAULT_COLUMNS if columns is None else columns
+    for column in columns:
+        if column not in BASE_FIELDS and column != 'street':
+            raise ValueError(f"Invalid column {column!r}. Available columns are {DEFAULT_COLUMNS}.")
+
+    # Base của AdminUnit được chia sẻ, nên chỉ cần đánh index theo base
+    bases = {}
+    streets = {}
+    base_indexes = []
+    street_indexes = []
+    missing_base = (None,) * len(BASE_FIELDS) # Unit None (locate_many(), lookup_by_codes() không tìm thấy) là một dòng trống
+    for unit, street in pairs:
+        base = missing_base if unit is None else unit._base
+        base_indexes.append(bases.setdefault(id(base), (len(bases), base))[0])
+        street_indexes.append(streets.setdefault(street, len(streets)) if street is not None else -1)
+    base_values = [base for _, base in bases.values()]
+    base_indexes = np.array(base_indexes, dtype=np.intp)
+
+    result = {}
+    for column in columns:
+        if column == 'street':
+            result[column] = DictionaryColumn(np.array(street_indexes, dtype=np.int32), np.array(list(streets), dtype=object))
+            continue
+        i = BASE_FIELDS.index(column)
+        dtype = 'code' if column in CODE_COLUMNS else 'float' if column in FLOAT_COLUMNS else 'text'
+        result[column] = encode_values([base[i] for base in base_values], base_indexes, dtype)
+
+    if arrow:
+        import pyarrow as pa
+
+        return pa.table({
+            column: values.to_arrow() if isinstance(values, DictionaryColumn) else pa.array(values, mask=(values < 0) if column in CODE_COLUMNS else None)
+            for column, values in result.items()
+        })
+    return result
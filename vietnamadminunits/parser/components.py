@@ -0,0 +1,67 @@
+'''
+Parse administrative units given as separate fields, eg: ward, district and province columns.
+
+Each field is matched against its own index only: the province field against provinces, the district field against the districts of that province, and so on.
+A field that is ambiguous (no match, several comma separated parts, a divided district...) falls back to parsing the joined address, so results never get worse than `parse_addresses()`.
+'''
+from .utils import normalize_address
+
+
+def get_field_keys(value, field_keys: dict):
+    '''
+    :param value: Field value, None or NaN for an empty field.
+    :param field_keys: Cache value -> keys, shared by a batch.
+    :return: (key, key_accented), None if the field is empty.
+    '''
+    if not isinstance(value, str):
+        return None
+    keys = field_keys.get(value)
+    if keys is None:
+        _, key, key_accented = normalize_address(value)
+        keys = field_keys[value] = (key, key_accented) if key else ()
+    return keys or None
+
+
+def join_fields(row: tuple):
+    '''
+    :param row: (ward, district, province), a column that is not given is None.
+    :return: The joined address parsed as a fallback, the same as `standardize_admin_unit_columns()` builds.
+    '''
+    return ''.join(',' + (value if isinstance(value, str) else '') for value, given in row if given)
+
+
+def parse_rows(rows, mode: str, level: int):
+    '''
+    :param rows: Iterable of ((ward, given), (district, given), (province, given)).
+    :param mode: `'FROM_2025'` or `'LEGACY'`.
+    :param level: Parse level.
+    :return: List of AdminUnit objects, in the same order as rows.
+    '''
+    from . import parse_addresses
+
+    if mode == 'FROM_2025':
+        from .parser_from_2025 import parse_components_key
+        parse_key = lambda ward_keys, district_keys, province_keys: parse_components_key(ward_keys, province_keys, level=level)
+    else:
+        from .parser_legacy import parse_components_key
+        parse_key = lambda ward_keys, district_keys, province_keys: parse_components_key(ward_keys, district_keys, province_keys, level=level)
+
+    # Mỗi bộ field khác nhau chỉ parse một lần, mỗi giá trị của field chỉ normalize một lần
+    unique_rows = {}
+    positions = [unique_rows.setdefault(row, len(unique_rows)) for row in rows]
+
+    field_keys = {}
+    units = []
+    fallbacks = {}
+    for i, row in enumerate(unique_rows):
+        unit = parse_key(*(get_field_keys(value, field_keys) if given else None for value, given in row))
+        units.append(unit)
+        if unit is None:
+            fallbacks[i] = join_fields(row)
+
+    # Các field không rõ ràng thì parse cả địa chỉ như cũ
+    if fallbacks:
+        for i, unit in zip(fallbacks, parse_addresses(list(fallbacks.values()), mode=mode, keep_street=False, level=level)):
+            units[i] = unit
+
+    return [units[i] for i in positions]
@@ -0,0 +1,262 @@
+'''
+Reverse geocoding: coordinates -> AdminUnit of the ward whose centroid is nearest.
+This is not a point-in-polygon test: ward boundaries are not used, so a point near a boundary may get the neighbouring ward whose centroid is closer.
+
+Centroids are projected on a sinusoidal projection centered on Vietnam, then bucketed in a grid of CELL_SIZE_KM cells.
+Each cell keeps the only wards that can be nearest to a point inside it, so a lookup compares a point with a few dozen centroids.
+The grid is built once per mode from the parser data and kept in a binary snapshot, see `snapshot.load_data()`.
+'''
+import math
+
+from ..snapshot import load_data
+from .objects import AdminUnit, intern_admin_unit
+
+
+EARTH_RADIUS_KM = 6371.0088
+CENTRAL_LONGITUDE = 106.0 # Kinh tuyến giữa của Việt Nam, sai số của phép chiếu nhỏ nhất quanh đây
+CELL_SIZE_KM = 10
+GRID_MARGIN_KM = 50 # Ngoài vùng này (biển xa, nước ngoài) trả về None
+CHUNK_SIZE = 100_000 # Số điểm xử lý một lần, giới hạn bộ nhớ của các cặp (point, candidate)
+
+SOURCES = {
+    'FROM_2025': 'parser_from_2025',
+    'LEGACY': 'parser_legacy',
+}
+
+_indexes = {}
+
+
+def project(latitudes, longitudes):
+    '''
+    :param latitudes: numpy array
+    :param longitudes: numpy array
+    :return: (x, y) numpy arrays in km
+    '''
+    import numpy as np
+
+    lat = np.radians(latitudes)
+    x = EARTH_RADIUS_KM * np.radians(np.asarray(longitudes, dtype=float) - CENTRAL_LONGITUDE) * np.cos(lat)
+    y = EARTH_RADIUS_KM * lat
+    return x, y
+
+
+def is_point(latitude, longitude):
+    return isinstance(latitude, float) and isinstance(longitude, float) and not (math.isnan(latitude) or math.isnan(longitude))
+
+
+def iter_units_from_2025(parser_data: dict):
+    '''
+    :param parser_data: Content of `parser_from_2025.json`.
+    :return: Generator of (AdminUnit, latitude, longitude), one per ward, the same unit as `parse_address()` at level 2.
+    '''
+    for province_key, province in parser_data['DICT_PROVINCE'].items():
+        for DICT_WARD in [parser_data['DICT_PROVINCE_WARD_NO_ACCENTED'].get(province_key, {}), parser_data['DICT_PROVINCE_WARD_ACCENTED'].get(province_key, {})]:
+            for ward_key, ward in DICT_WARD.items():
+                if not is_point(ward['wardLat'], ward['wardLon']):
+                    continue
+                unit = intern_admin_unit(
+                    province_key=province_key, province=province['province'], short_province=province['provinceShort'], province_code=province['provinceCode'],
+                    ward_key=ward_key, ward=ward['ward'], short_ward=ward['wardShort'], ward_type=ward['wardType'], ward_code=ward['wardCode'],
+                    latitude=ward['wardLat'], longitude=ward['wardLon'],
+                )
+                yield unit, ward['wardLat'], ward['wardLon']
+
+
+def iter_units_legacy(parser_data: dict):
+    '''
+    :param parser_data: Content of `parser_legacy.json`.
+    :return: Generator of (AdminUnit, latitude, longitude), one per ward, the same unit as `parse_address()` at level 3.
+    Island districts without wards are skipped, their centroid is not on the island.
+    '''
+    for province_key, province in parser_data['DICT_PROVINCE'].items():
+        for district_key, district in parser_data['DICT_PROVINCE_DISTRICT'][province_key].items():
+            for DICT_WARD in [parser_data['DICT_PROVINCE_DISTRICT_WARD_NO_ACCENTED'].get(province_key, {}).get(district_key, {}), parser_data['DICT_PROVINCE_DISTRICT_WARD_ACCENTED'].get(province_key, {}).get(district_key, {})]:
+                for ward_key, ward in DICT_WARD.items():
+                    if not is_point(ward['wardLat'], ward['wardLon']):
+                        continue
+                    unit = intern_admin_unit(
+                        province_key=province_key, province=province['province'], short_province=province['provinceShort'], province_code=province['provinceCode'],
+                        district_key=district_key, district=district['district'], short_district=district['districtShort'], district_type=district['districtType'], district_code=district['districtCode'],
+                        ward_key=ward_key, ward=ward['ward'], short_ward=ward['wardShort'], ward_type=ward['wardType'], ward_code=ward['wardCode'],
+                        latitude=ward['wardLat'], longitude=ward['wardLon'],
+                        show_district=True,
+                    )
+                    yield unit, ward['wardLat'], ward['wardLon']
+
+
+def build_grid(x, y):
+    '''
+    Candidates of each cell: wards whose distance to the cell is at most U, U being the smallest distance that covers the whole cell from one ward.
+    The nearest ward of any point in the cell is always a candidate.
+
+    :param x: numpy array of projected centroids, km
+    :param y: numpy array of projected centroids, km
+    :return: dict with the grid geometry, `cell_starts` and `cell_candidates` (CSR: candidates of cell c are `cell_candidates[cell_starts[c]:cell_starts[c + 1]]`).
+    '''
+    import numpy as np
+
+    x0, y0 = x.min() - GRID_MARGIN_KM, y.min() - GRID_MARGIN_KM
+    nx = int(np.ceil((x.max() + GRID_MARGIN_KM - x0) / CELL_SIZE_KM))
+    ny = int(np.ceil((y.max() + GRID_MARGIN_KM - y0) / CELL_SIZE_KM))
+
+    # Xếp ward theo cell chứa nó, ward của một dãy cell liền nhau nằm liền nhau
+    ward_cells = ((y - y0) // CELL_SIZE_KM).astype(np.int64) * nx + ((x - x0) // CELL_SIZE_KM).astype(np.int64)
+    order = np.argsort(ward_cells, kind='stable')
+    bucket_starts = np.searchsorted(ward_cells[order], np.arange(nx * ny + 1))
+
+    def gather(iy, ix, radius):
+        ix_start, ix_stop = max(ix - radius, 0), min(ix + radius, nx - 1) + 1
+        slices = [order[bucket_starts[row * nx + ix_start]:bucket_starts[row * nx + ix_stop]] for row in range(max(iy - radius, 0), min(iy + radius, ny - 1) + 1)]
+        return np.concatenate(slices)
+
+    def get_distances(wards, iy, ix):
+        # Khoảng cách gần nhất và xa nhất từ mỗi ward tới hình vuông của cell
+        left, bottom = x0 + ix * CELL_SIZE_KM, y0 + iy * CELL_SIZE_KM
+        dx_near = np.maximum(np.maximum(left - x[wards], x[wards] - left - CELL_SIZE_KM), 0)
+        dy_near = np.maximum(np.maximum(bottom - y[wards], y[wards] - bottom - CELL_SIZE_KM), 0)
+        dx_far = np.maximum(np.abs(x[wards] - left), np.abs(x[wards] - left - CELL_SIZE_KM))
+        dy_far = np.maximum(np.abs(y[wards] - bottom), np.abs(y[wards] - bottom - CELL_SIZE_KM))
+        return np.hypot(dx_near, dy_near), np.hypot(dx_far, dy_far)
+
+    # Cận trên U của mỗi cell: từ các cell có ward, lan ra các cell lân cận (chamfer distance transform)
+    upper = np.full(nx * ny, np.inf)
+    occupied = np.flatnonzero(np.diff(bucket_starts))
+    for cell in occupied:
+        _, far = get_distances(order[bucket_starts[cell]:bucket_starts[cell + 1]], cell // nx, cell % nx)
+        upper[cell] = far.min()
+    upper = upper.reshape(ny, nx)
+    steps = [(dy, dx, CELL_SIZE_KM * math.hypot(dy, dx)) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+    while True:
+        relaxed = upper.copy()
+        for dy, dx, step in steps:
+            target = relaxed[max(dy, 0):ny + min(dy, 0), max(dx, 0):nx + min(dx, 0)]
+            source = upper[max(-dy, 0):ny + min(-dy, 0), max(-dx, 0):nx + min(-dx, 0)]
+            np.minimum(target, source + step, out=target)
+        if np.array_equal(relaxed, upper):
+            break
+        upper = relaxed
+
+    # Candidate: ward có khoảng cách gần nhất tới cell không vượt quá U
+    cell_candidates = []
+    cell_starts = np.zeros(nx * ny + 1, dtype=np.int64)
+    for iy in range(ny):
+        for ix in range(nx):
+            wards = gather(iy, ix, int(np.ceil(upper[iy, ix] / CELL_SIZE_KM)))
+            near, far = get_distances(wards, iy, ix)
+            candidates = np.sort(wards[near <= far.min()])
+            cell_candidates.append(candidates)
+            cell_starts[iy * nx + ix + 1] = len(candidates)
+
+    return {
+        'x0': float(x0),
+        'y0': float(y0),
+        'nx': nx,
+        'ny': ny,
+        'cell_starts': np.cumsum(cell_starts),
+        'cell_candidates': np.concatenate(cell_candidates).astype(np.int32),
+    }
+
+
+def build_index(units_points):
+    '''
+    :param units_points: Iterable of (AdminUnit, latitude, longitude).
+    :return: dict, the index kept in the snapshot.
+    '''
+    import numpy as np
+
+    units, latitudes, longitudes = zip(*units_points)
+    x, y = project(np.array(latitudes), np.array(longitudes))
+    return {'units': list(units), 'x': x, 'y': y, **build_grid(x, y)}
+
+
+# Tăng khi build_index() thay đổi, snapshot cũ sẽ được build lại
+BUILD_VERSION = 1
+
+# Version ghi trong header của snapshot: grid đã build chỉ dùng được với đúng các hằng số này
+INDEX_VERSION = {
+    'build': BUILD_VERSION,
+    'CELL_SIZE_KM': CELL_SIZE_KM,
+    'GRID_MARGIN_KM': GRID_MARGIN_KM,
+    'CENTRAL_LONGITUDE': CENTRAL_LONGITUDE,
+    'EARTH_RADIUS_KM': EARTH_RADIUS_KM,
+}
+
+BUILDS = {
+    'FROM_2025': lambda parser_data: build_index(iter_units_from_2025(parser_data)),
+    'LEGACY': lambda parser_data: build_index(iter_units_legacy(parser_data)),
+}
+
+
+def get_index(mode: str):
+    '''
+    :param mode: `'FROM_2025'` or `'LEGACY'`.
+    :return: dict, see `build_index()`. Loaded once per mode.
+    '''
+    if mode not in _indexes:
+        import numpy as np
+
+        index = load_data(f'locator_{SOURCES[mode]}', BUILDS[mode], source=SOURCES[mode], version=INDEX_VERSION)
+        index['unit_array'] = np.array(index['units'] + [None], dtype=object) # Phần tử cuối là None cho các điểm không tìm được
+        _indexes[mode] = index
+    return _indexes[mode]
+
+
+def locate_points(latitudes, longitudes, mode: str, max_distance_km: float=None):
+    '''
+    :param latitudes: Array-like of latitudes.
+    :param longitudes: Array-like of longitudes, same length as latitudes.
+    :param mode: `'FROM_2025'` or `'LEGACY'`.
+    :param max_distance_km: Return None for points farther than this from the nearest ward centroid, measured on the projection (close to the great-circle distance). Default `None` for no limit.
+    :return: List of AdminUnit of the nearest ward centroid or None, in the same order. None for missing coordinates and points outside the grid (more than GRID_MARGIN_KM beyond the outermost centroids).
+    '''
+    import numpy as np
+
+    index = get_index(mode)
+    latitudes = np.asarray(latitudes, dtype=float).ravel()
+    longitudes = np.asarray(longitudes, dtype=float).ravel()
+    if latitudes.shape != longitudes.shape:
+        raise ValueError('latitudes and longitudes must have the same length.')
+
+    chosen = np.full(len(latitudes), len(index['units']), dtype=np.int64) # Mặc định là None
+    for start in range(0, len(latitudes), CHUNK_SIZE):
+        chosen[start:start + CHUNK_SIZE] = locate_chunk(index, latitudes[start:start + CHUNK_SIZE], longitudes[start:start + CHUNK_SIZE], max_distance_km)
+    return index['unit_array'][chosen].tolist()
+
+
+def locate_chunk(index: dict, latitudes, longitudes, max_distance_km: float=None):
+    '''
+    :return: numpy array of unit positions in `index['units']`, `len(index['units'])` if not found.
+    '''
+    import numpy as np
+
+    n_units = len(index['units'])
+    chosen = np.full(len(latitudes), n_units, dtype=np.int64)
+
+    with np.errstate(invalid='ignore'):
+        x, y = project(latitudes, longitudes)
+        ix = np.floor((x - index['x0']) / CELL_SIZE_KM)
+        iy = np.floor((y - index['y0']) / CELL_SIZE_KM)
+        inside = (ix >= 0) & (ix < index['nx']) & (iy >= 0) & (iy < index['ny'])
+    points = np.flatnonzero(inside)
+    if not len(points):
+        return chosen
+
+    # Mỗi cặp (point, candidate) là một dòng, các candidate của một point nằm liền nhau
+    cells = iy[points].astype(np.int64) * index['nx'] + ix[points].astype(np.int64)
+    starts = index['cell_starts'][cells]
+    sizes = index['cell_starts'][cells + 1] - starts
+    point_index = np.repeat(np.arange(len(points)), sizes)
+    pair_starts = np.cumsum(sizes) - sizes
+    candidates = index['cell_candidates'][np.repeat(starts - pair_starts, sizes) + np.arange(sizes.sum())]
+
+    distances = (index['x'][candidates] - x[points][point_index]) ** 2 + (index['y'][candidates] - y[points][point_index]) ** 2
+
+    # Gần nhất, candidate đứng trước (ward index nhỏ hơn) thắng khi bằng nhau
+    nearest = np.minimum.reduceat(distances, pair_starts)
+    is_nearest = np.flatnonzero(distances == nearest[point_index])
+    first = is_nearest[np.r_[True, point_index[is_nearest][1:] != point_index[is_nearest][:-1]]]
+    chosen[points] = candidates[first]
+
+    if max_distance_km is not None:
+        chosen[points[np.sqrt(nearest) > max_distance_km]] = n_units
+    return chosen
@@ -0,0 +1,105 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    '''
+    Aho–Corasick automaton to match many literal keywords in one pass.
+
+    It reproduces the semantics of `re.compile('|'.join(sorted(keywords, key=len, reverse=True)), flags=re.IGNORECASE)`
+    scanned with `finditer`: matches do not overlap, the leftmost match is taken first and the longest keyword wins at a position.
+    '''
+
+    __slots__ = ('goto', 'fail', 'lengths')
+
+    def __init__(self, keywords):
+        '''
+        :param keywords: Iterable of keywords, case is ignored.
+        '''
+        goto = [{}] # goto[node][char] -> node
+        lengths = [()] # Độ dài các keyword kết thúc tại node, gồm cả keyword của các node fail
+
+        # Dựng trie
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            node = 0
+            for char in keyword:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    lengths.append(())
+                node = next_node
+            lengths[node] = (len(keyword),)
+
+        # Dựng fail link theo BFS, node cha luôn được xử lý trước node con
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in goto[node].items():
+                queue.append(next_node)
+                f = fail[node]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(char, 0)
+                fail[next_node] = f
+                if lengths[f]:
+                    lengths[next_node] = lengths[next_node] + lengths[f]
+
+        self.goto = goto
+        self.fail = fail
+        self.lengths = lengths
+
+    def _longest_by_start(self, text: str):
+        '''
+        :return: dict, start position -> length of the longest keyword starting there.
+        '''
+        goto = self.goto
+        fail = self.fail
+        lengths = self.lengths
+
+        longest = {}
+        node = 0
+        for i, char in enumerate(text.lower(), 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length in lengths[node]:
+                start = i - length
+                if longest.get(start, 0) < length:
+                    longest[start] = length
+        return longest
+
+    def finditer(self, text: str):
+        '''
+        Find non-overlapping keywords from left to right.
+
+        :param text: Text to search.
+        :return: Generator of (start, end).
+        '''
+        longest = self._longest_by_start(text)
+        end = 0
+        for start in sorted(longest):
+            if start >= end:
+                end = start + longest[start]
+                yield start, end
+
+    def find_first(self, text: str):
+        '''
+        :param text: Text to search.
+        :return: The leftmost keyword found in text, or None.
+        '''
+        return next((text[start:end] for start, end in self.finditer(text)), None)
+
+    def find_last(self, text: str):
+        '''
+        :param text: Text to search.
+        :return: The rightmost keyword found in text, or None.
+        '''
+        start = end = None
+        for start, end in self.finditer(text):
+            pass
+        return text[start:end] if start is not None else None
@@ -0,0 +1,108 @@
+'''
+Single-pass normalizer for addresses.
+
+`normalize_address()` gives the same result as `unicode_normalize()` followed by `key_normalize(keep=[','])` with and without accents,
+but splits the text once and decodes each distinct token once.
+'''
+from functools import lru_cache
+import re
+import unicodedata
+
+from unidecode import unidecode
+
+
+# Fix quote đặc biệt, tách dash dính liền.
+# str.replace() nhanh hơn str.translate() nhiều lần với chuỗi có dấu, vì translate() phải duyệt từng ký tự trong Python dict
+REPLACEMENTS = (
+    ('’', "'"),
+    ('‘', "'"),
+    ('“', '"'),
+    ('”', '"'),
+    ('-', ' - '),
+)
+
+# Giống key_normalize(keep=[',']): bỏ tất cả ký tự không phải chữ/số/_/dấu phẩy
+REMOVE_NON_KEY = re.compile(r'[^\w,]+').sub
+# Giống key_normalize(): bỏ cả dấu phẩy
+REMOVE_NON_WORD = re.compile(r'[^\w]+').sub
+
+TOKEN_CACHE_SIZE = 65536
+
+
+def normalize_text(text):
+    '''
+    Same as `utils.unicode_normalize()`.
+
+    :param text: str
+    :return: str or the input if it is not a str
+    '''
+    if not isinstance(text, str):
+        return text
+    return join_tokens(split_tokens(text))
+
+
+def split_tokens(text: str):
+    '''
+    :param text: str
+    :return: list of tokens after NFC, quote and dash fixes, split by whitespace.
+    '''
+    text = unicodedata.normalize('NFC', text)
+    for old, new in REPLACEMENTS:
+        if old in text:
+            text = text.replace(old, new)
+    return text.split()
+
+
+def join_tokens(tokens: list):
+    # Không có khoảng trắng sau dấu nháy đơn, eg: "Ea H' Đinh" -> "Ea H'Đinh"
+    return ' '.join(tokens).replace("' ", "'")
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_token(token: str):
+    '''
+    :param token: Token from `split_tokens()`.
+    :return: (key_part, key_part_accented), not lowercased yet.
+    '''
+    return REMOVE_NON_KEY('', unidecode(token)), REMOVE_NON_KEY('', token)
+
+
+def normalize_address(address: str):
+    '''
+    Normalize an address once for parsing.
+
+    :param address: str
+    :return: (address, address_key, address_key_accented). address is unicode normalized, the keys keep commas, address_key has no accents.
+    '''
+    if not isinstance(address, str):
+        return address, address, address
+
+    tokens = split_tokens(address)
+    parts = [normalize_token(token) for token in tokens]
+
+    # lower() trên cả chuỗi như key_normalize(), vì lower() của vài ký tự phụ thuộc ký tự bên cạnh
+    address_key = ''.join([part[0] for part in parts]).lower()
+    address_key_accented = ''.join([part[1] for part in parts]).lower()
+    return join_tokens(tokens), address_key, address_key_accented
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_char(char: str):
+    # unidecode trả về ASCII nên lower() không phụ thuộc ký tự bên cạnh, key của từng ký tự ghép lại bằng key của cả chuỗi
+    return REMOVE_NON_WORD('', unidecode(char)).lower()
+
+
+def key_normalize_with_offsets(text: str):
+    '''
+    Same key as `utils.key_normalize(text)`, with a map from key positions back to text positions.
+
+    :param text: str
+    :return: (key, offsets). `offsets[i]` is the length of the key of `text[:i]`, so offsets is non-decreasing and has `len(text) + 1` items.
+    '''
+    pieces = [normalize_char(char) for char in text]
+    offsets = [0]
+    length = 0
+    for piece in pieces:
+        length += len(piece)
+        offsets.append(length)
+    return ''.join(pieces), offsets
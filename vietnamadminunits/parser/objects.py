@@ -1,4 +1,77 @@
+# Tất cả thuộc tính trừ street, được chia sẻ giữa các kết quả cùng một đơn vị hành chính
+BASE_FIELDS = (
+    'address',
+    'province',
+    'district',
+    'ward',
+
+    'short_province',
+    'short_district',
+    'short_ward',
+
+    'district_type',
+    'ward_type',
+
+    'province_code',
+    'district_code',
+    'ward_code',
+
+    'latitude',
+    'longitude',
+
+    'province_key',
+    'district_key',
+    'ward_key',
+
+    'show_district',
+)
+
+FIELDS = BASE_FIELDS + ('street',)
+
+# Flyweight: mỗi base chỉ tồn tại một lần, eg: 3.321 ward mới và ~10k ward cũ
+# Chỉ unit dựng từ dữ liệu của package được intern, nên BASES có giới hạn; unit do người dùng tạo không được giữ lại
+BASES = {}
+
+
+def intern_base(base: tuple):
+    '''
+    :param base: Values of `BASE_FIELDS`, built from package data.
+    :return: The shared tuple equal to base.
+    '''
+    return BASES.setdefault(base, base)
+
+
+def intern_admin_unit(street=None, **values):
+    '''
+    Build an AdminUnit from package data, used by the parsers. Its base is shared by every unit of the same administrative unit.
+
+    :param values: Attributes of `BASE_FIELDS`, see `AdminUnit`.
+    :return: AdminUnit object.
+    '''
+    unit = AdminUnit(street=street, **values)
+    object.__setattr__(unit, '_base', intern_base(unit._base))
+    return unit
+
+
+def restore_admin_unit(base: tuple, street=None):
+    '''
+    Rebuild an AdminUnit from its pickle form, the base is shared again after unpickling if it is already interned.
+    '''
+    unit = object.__new__(AdminUnit)
+    object.__setattr__(unit, '_base', BASES.get(base, base))
+    object.__setattr__(unit, 'street', street)
+    return unit
+
+
 class AdminUnit:
+    '''
+    Immutable administrative unit. Everything except `street` lives in a shared tuple, so results of the same unit cost only one small object each.
+    Use `with_street()` or `replace()` to get a modified copy.
+    Units are compared and hashed by value: two units with the same attributes are equal, even if they are different objects.
+    '''
+
+    __slots__ = ('_base', 'street')
+
     def __init__(self,
                  address=None,
                  province=None,
@@ -26,31 +99,95 @@ class AdminUnit:
 
                  show_district = False
                  ):
-        self.address = address
-        self.province = province
-        self.district = district
-        self.ward = ward
-        self.street = street
-
-        self.short_province = short_province
-        self.short_district = short_district
-        self.short_ward = short_ward
-
-        self.district_type = district_type
-        self.ward_type = ward_type
-
-        self.province_code = province_code
-        self.district_code = district_code
-        self.ward_code = ward_code
-
-        self.latitude = latitude
-        self.longitude = longitude
-
-        self.province_key = province_key
-        self.district_key = district_key
-        self.ward_key = ward_key
-
-        self.show_district = show_district
+        base = (
+            address,
+            province,
+            district,
+            ward,
+
+            short_province,
+            short_district,
+            short_ward,
+
+            district_type,
+            ward_type,
+
+            province_code,
+            district_code,
+            ward_code,
+
+            latitude,
+            longitude,
+
+            province_key,
+            district_key,
+            ward_key,
+
+            show_district,
+        )
+        object.__setattr__(self, '_base', base)
+        object.__setattr__(self, 'street', street)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"AdminUnit is immutable, use with_street() or replace() instead of setting {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"AdminUnit is immutable, can not delete {name!r}")
+
+    def __reduce__(self):
+        # Pickle gọn: base được memo một lần cho mỗi lần dump, nên một list kết quả chỉ chứa mỗi base một lần
+        return restore_admin_unit, (self._base, self.street)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, AdminUnit):
+            return NotImplemented
+        return self._base == other._base and self.street == other.street
+
+    def __hash__(self):
+        return hash((self._base, self.street))
+
+    def with_street(self, street=None):
+        '''
+        :param street: New street.
+        :return: AdminUnit sharing the same base.
+        '''
+        if street == self.street:
+            return self
+        return restore_admin_unit(self._base, street)
+
+    def replace(self, **changes):
+        '''
+        :param changes: New values of attributes, eg: `ward='Phường Tân Sơn'`.
+        :return: AdminUnit
+        '''
+        values = self.to_dict()
+        values.update(changes)
+        return AdminUnit(**values)
+
+    def to_tuple(self):
+        '''
+        :return: tuple of values in `FIELDS` order.
+        '''
+        return self._base + (self.street,)
+
+    def to_dict(self):
+        '''
+        :return: dict, attribute -> value.
+        '''
+        values = dict(zip(BASE_FIELDS, self._base))
+        values['street'] = self.street
+        return values
+
+    @property
+    def __dict__(self):
+        # Tương thích ngược: vars(unit) và unit.__dict__ vẫn cho dict thuộc tính như trước khi dùng __slots__, nhưng là một bản sao
+        return self.to_dict()
 
     def get_address(self, short_name=False):
         components = [self.street,  self.short_ward, self.short_district, self.short_province] if short_name else [self.street, self.ward, self.district, self.province]
@@ -76,4 +213,10 @@ class AdminUnit:
         for attr in attributes:
             lines.append(f"{attr:<15} | {safe_format(getattr(self, attr)):<25}")
 
-        return f"Admin Unit: {self.get_address()}\n" + '\n'.join(lines)
\ No newline at end of file
+        return f"Admin Unit: {self.get_address()}\n" + '\n'.join(lines)
+
+
+# Thuộc tính trong base là property chỉ đọc
+for _i, _field in enumerate(BASE_FIELDS):
+    setattr(AdminUnit, _field, property(lambda self, _i=_i: self._base[_i]))
+del _i, _field
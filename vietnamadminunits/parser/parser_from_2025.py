@@ -1,15 +1,67 @@
-import json
-from pathlib import Path
-import re
+from .utils import normalize_address, extract_street, replace_from_right, parse_addresses_by_key, iter_parsed_addresses
+from .objects import AdminUnit, intern_admin_unit
+from .patterns import PATTERN_REGISTRY, compile_keywords, collect_keywords, index_keywords, find_last_keyword, match_field
+from ..snapshot import load_data, dump_pattern
+from .. import instrumentation
+from time import perf_counter
 
-from .utils import key_normalize, extract_street, replace_from_right, unicode_normalize
-from .objects import AdminUnit
+
+DATASET = 'FROM_2025'
+
+# Các bộ ward theo tier, dùng làm key của PATTERN_REGISTRY
+UNIQUE_WARD_TIERS = {
+    'NO_ACCENTED': 'DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED',
+    'ACCENTED': 'DICT_UNIQUE_WARD_PROVINCE_ACCENTED',
+}
+WARD_TIERS = {
+    'NO_ACCENTED': 'DICT_PROVINCE_WARD_NO_ACCENTED',
+    'ACCENTED': 'DICT_PROVINCE_WARD_ACCENTED',
+    'SHORT_ACCENTED': 'DICT_PROVINCE_WARD_SHORT_ACCENTED',
+}
+
+
+def iter_pattern_sources(parser_data: dict):
+    '''
+    :param parser_data: Parser data.
+    :return: Generator of `(registry_key, DICT_UNIT, field)` for every pattern kept in PATTERN_REGISTRY.
+    '''
+    for tier, name in UNIQUE_WARD_TIERS.items():
+        yield (DATASET, None, None, f'UNIQUE_WARD_{tier}'), parser_data[name], 'wardKeywords'
+
+    for tier, name in WARD_TIERS.items():
+        for province_key, DICT_WARD in parser_data[name].items():
+            yield (DATASET, province_key, None, tier), DICT_WARD, 'wardKeywords'
+
+
+# Tăng khi build_data() thay đổi, snapshot cũ sẽ được build lại
+BUILD_VERSION = 1
+
+
+def build_data(parser_data: dict):
+    '''
+    Derive indexes and patterns from `parser_from_2025.json`, the result is kept in a binary snapshot.
+
+    :param parser_data: Content of `parser_from_2025.json`.
+    :return: dict
+    '''
+    # CREATE INDEXES: keyword -> key
+    parser_data['DICT_PROVINCE_KEYWORD'] = index_keywords(parser_data['DICT_PROVINCE'], 'provinceKeywords')
+    parser_data['DICT_UNIQUE_WARD_KEYWORD_NO_ACCENTED'] = index_keywords(parser_data['DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED'], 'wardKeywords')
+    parser_data['DICT_UNIQUE_WARD_KEYWORD_ACCENTED'] = index_keywords(parser_data['DICT_UNIQUE_WARD_PROVINCE_ACCENTED'], 'wardKeywords')
+    parser_data['DICT_TIER_PROVINCE_WARD_KEYWORD'] = {
+        tier: {province_key: index_keywords(DICT_WARD, 'wardKeywords') for province_key, DICT_WARD in parser_data[name].items()}
+        for tier, name in WARD_TIERS.items()
+    }
+
+    # CREATE PATTERNS
+    parser_data['PATTERN_PROVINCE'] = compile_keywords(collect_keywords(parser_data['DICT_PROVINCE'], 'provinceKeywords'))
+    parser_data['COMPILED_PATTERNS'] = {key: dump_pattern(compile_keywords(collect_keywords(DICT_UNIT, field))) for key, DICT_UNIT, field in iter_pattern_sources(parser_data)}
+
+    return parser_data
 
 
 # LOAD DATA
-MODULE_DIR = Path(__file__).parent.parent
-with open(MODULE_DIR / 'data/parser_from_2025.json', 'r') as f:
-    parser_data = json.load(f)
+parser_data = load_data('parser_from_2025', build_data, version=BUILD_VERSION)
 
 DICT_PROVINCE = parser_data['DICT_PROVINCE']
 DICT_PROVINCE_WARD_NO_ACCENTED = parser_data['DICT_PROVINCE_WARD_NO_ACCENTED']
@@ -18,16 +70,87 @@ DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED = parser_data['DICT_UNIQUE_WARD_PROVINCE_N
 DICT_UNIQUE_WARD_PROVINCE_ACCENTED = parser_data['DICT_UNIQUE_WARD_PROVINCE_ACCENTED']
 DICT_PROVINCE_WARD_SHORT_ACCENTED = parser_data['DICT_PROVINCE_WARD_SHORT_ACCENTED']
 
+DICT_TIER_UNIQUE_WARD_PROVINCE = {tier: parser_data[name] for tier, name in UNIQUE_WARD_TIERS.items()}
+DICT_TIER_PROVINCE_WARD = {tier: parser_data[name] for tier, name in WARD_TIERS.items()}
+
+
+# INDEXES: keyword -> key
+DICT_PROVINCE_KEYWORD = parser_data['DICT_PROVINCE_KEYWORD']
+DICT_UNIQUE_WARD_KEYWORD_NO_ACCENTED = parser_data['DICT_UNIQUE_WARD_KEYWORD_NO_ACCENTED']
+DICT_UNIQUE_WARD_KEYWORD_ACCENTED = parser_data['DICT_UNIQUE_WARD_KEYWORD_ACCENTED']
+DICT_TIER_PROVINCE_WARD_KEYWORD = parser_data['DICT_TIER_PROVINCE_WARD_KEYWORD']
+
+
+# PATTERNS: ward patterns được deserialize khi dùng lần đầu
+PATTERN_PROVINCE = parser_data['PATTERN_PROVINCE']
+PATTERN_REGISTRY.add_compiled(parser_data['COMPILED_PATTERNS'])
+
+
+def get_unique_ward_pattern(tier: str):
+    '''
+    Get the compiled pattern of wards whose name is unique in the country.
+
+    :param tier: `'NO_ACCENTED'` or `'ACCENTED'`.
+    :return: KeywordMatcher
+    '''
+    return PATTERN_REGISTRY.get((DATASET, None, None, f'UNIQUE_WARD_{tier}'), DICT_TIER_UNIQUE_WARD_PROVINCE[tier], 'wardKeywords')
+
+
+def get_ward_pattern(province_key: str, tier: str):
+    '''
+    Get the compiled ward pattern of a province from the shared registry.
+
+    :param province_key: Province key.
+    :param tier: `'NO_ACCENTED'`, `'ACCENTED'` or `'SHORT_ACCENTED'`.
+    :return: KeywordMatcher
+    '''
+    DICT_WARD = DICT_TIER_PROVINCE_WARD[tier][province_key]
+    return PATTERN_REGISTRY.get((DATASET, province_key, None, tier), DICT_WARD, 'wardKeywords')
 
-# CREATE PATTERNS
-province_keywords = sorted(sum([DICT_PROVINCE[k]['provinceKeywords'] for k in DICT_PROVINCE], []), key=len, reverse=True)
-PATTERN_PROVINCE = re.compile('|'.join(province_keywords), flags=re.IGNORECASE)
 
-unique_ward_no_accented_keywords = sorted(sum([DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED[k]['wardKeywords'] for k in DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED], []), key=len, reverse=True)
-PATTERN_UNIQUE_WARD_PROVINCE_NO_ACCENTED = re.compile('|'.join(unique_ward_no_accented_keywords), flags=re.IGNORECASE)
+def warmup():
+    '''
+    Compile all ward patterns ahead of the first call.
+    '''
+    for key, DICT_UNIT, field in iter_pattern_sources(parser_data):
+        PATTERN_REGISTRY.get(key, DICT_UNIT, field)
+
+
+def get_unit(province_key: str, ward_key: str=None) -> AdminUnit:
+    '''
+    Build the AdminUnit of known keys without parsing, the same object as `parse_address_from_2025()` of that unit.
+
+    :param province_key: Key in `DICT_PROVINCE`.
+    :param ward_key: Key of a ward in that province, or None for level 1.
 
-unique_ward_accented_keywords = sorted(sum([DICT_UNIQUE_WARD_PROVINCE_ACCENTED[k]['wardKeywords'] for k in DICT_UNIQUE_WARD_PROVINCE_ACCENTED], []), key=len, reverse=True)
-PATTERN_UNIQUE_WARD_PROVINCE_ACCENTED = re.compile('|'.join(unique_ward_accented_keywords), flags=re.IGNORECASE)
+    :return: AdminUnit object, or None if a key is unknown.
+    '''
+    province = DICT_PROVINCE.get(province_key)
+    if not province:
+        return None
+    unit_info = {
+        'province_key': province_key,
+        'province': province['province'],
+        'short_province': province['provinceShort'],
+        'province_code': province['provinceCode'],
+        'latitude': province['provinceLat'],
+        'longitude': province['provinceLon'],
+    }
+
+    if ward_key:
+        # Ward trùng key khi bỏ dấu nằm trong bộ có dấu
+        ward = DICT_PROVINCE_WARD_NO_ACCENTED.get(province_key, {}).get(ward_key) or DICT_PROVINCE_WARD_ACCENTED.get(province_key, {}).get(ward_key)
+        if not ward:
+            return None
+        unit_info['ward_key'] = ward_key
+        unit_info['ward'] = ward['ward']
+        unit_info['short_ward'] = ward['wardShort']
+        unit_info['ward_type'] = ward['wardType']
+        unit_info['ward_code'] = ward['wardCode']
+        unit_info['latitude'] = ward['wardLat']
+        unit_info['longitude'] = ward['wardLon']
+
+    return intern_admin_unit(**unit_info)
 
 
 # MAIN FUNCTION
@@ -45,36 +168,114 @@ def parse_address_from_2025(address: str, keep_street :bool=True, level: int=2)
     if level not in [1, 2]:
         raise ValueError('Level must be 1, or 2')
 
-    unit = AdminUnit()
+    recorder = instrumentation.RECORDER
+    if recorder:
+        start = perf_counter()
+
+    raw_address = address
+    address, address_key, address_key_accented = normalize_address(address)
+    if recorder:
+        recorder.record(DATASET, 'normalize', start)
+
+    unit, street_key, ward_keyword = parse_address_key(address_key, address_key_accented, level=level)
+
+    # ----- STREET -----
+    if keep_street and street_key is not None:
+        if recorder:
+            street_start = perf_counter()
+        street = extract_street(address=address, address_key=street_key, highest_level_keyword=ward_keyword)
+        if recorder:
+            recorder.record(DATASET, 'street', street_start, street)
+        if street:
+            unit = unit.with_street(street)
+
+    if recorder:
+        recorder.record_address(DATASET, raw_address, start)
+
+    return unit
+
+
+def parse_addresses_from_2025(addresses, keep_street :bool=True, level :int=2) -> list:
+    '''
+    Parse many 34-province addresses, duplicated addresses are parsed only once.
+
+    :param addresses: Iterable of addresses.
+    :param keep_street: boolean.
+    :param level: [1,2]
+
+    :return: List of AdminUnit objects, in the same order as addresses.
+    '''
+
+    if level not in [1, 2]:
+        raise ValueError('Level must be 1, or 2')
+
+    return parse_addresses_by_key(addresses, parse_address_key, keep_street=keep_street, level=level, dataset=DATASET)
+
+
+def iter_addresses_from_2025(addresses, keep_street :bool=True, level :int=2):
+    '''
+    Same as `parse_addresses_from_2025()` without one AdminUnit per address, for columnar output.
+
+    :param addresses: Iterable of addresses.
+    :param keep_street: boolean.
+    :param level: [1,2]
+
+    :return: Generator of (AdminUnit, street), see `iter_parsed_addresses()`.
+    '''
+
+    if level not in [1, 2]:
+        raise ValueError('Level must be 1, or 2')
+
+    return iter_parsed_addresses(addresses, parse_address_key, keep_street=keep_street, level=level, dataset=DATASET)
+
+
+def parse_address_key(address_key: str, address_key_accented: str, level: int=2):
+    '''
+    Parse the normalized keys of a 34-province address, except the street.
+    The result only depends on the keys, so it can be shared between addresses having the same keys.
+
+    :param address_key: Address key without accents, see `utils.normalize_address()`.
+    :param address_key_accented: Address key with accents.
+    :param level: [1,2]
+
+    :return: (AdminUnit, street_key, ward_keyword). street_key is the address key left for `extract_street()`, None if the address has no street.
+    '''
+
+    unit_info = {} # Thuộc tính của unit, AdminUnit là immutable nên tạo ở cuối
 
-    address = unicode_normalize(address)
-    address_key = key_normalize(address, keep=[','])
-    address_key_accented = key_normalize(address, keep=[','], decode=False)
     ward_keyword = None
     ward_key = None
-    street = None
+
+    recorder = instrumentation.RECORDER
 
 
     # ----- PARSE PROVINCE -----
 
     # 1st attempt: Tìm province_keyword
-    province_keyword = next((m.group() for m in reversed(list(PATTERN_PROVINCE.finditer(address_key)))), None)
+    if recorder:
+        start = perf_counter()
+    province_keyword = find_last_keyword(PATTERN_PROVINCE, address_key)
 
     # Suy province_keyword ra province_key
-    province_key = next((k for k, v in DICT_PROVINCE.items() if province_keyword and province_keyword in [kw for kw in v['provinceKeywords']]), None)
+    province_key = DICT_PROVINCE_KEYWORD.get(province_keyword)
 
     # Nếu tìm ra province_keyword thì lặp tức xóa nó khỏi địa chỉ để tránh các level sau bắt nhầm từ khóa
     if province_keyword:
         address_key_accented = replace_from_right(text=address_key, old=province_keyword, new='', for_text=address_key_accented) #  Ưu tiên address_key_accented trước vì address_key là tham số
         address_key = replace_from_right(text=address_key, old=province_keyword, new='')
 
+    if recorder:
+        recorder.record(DATASET, 'province', start, province_key)
+
 
     # 2nd attempt: Nếu không tìm được province_keyword thì tìm ward_keyword (NO_ACCENTED), đây là những ward mà tên của nó là duy nhất, có thể suy ra được province
     if not province_key:
-        ward_keyword = next((m.group() for m in reversed(list(PATTERN_UNIQUE_WARD_PROVINCE_NO_ACCENTED.finditer(address_key)))), None)
+        if recorder:
+            start = perf_counter()
+        ward_keyword = find_last_keyword(get_unique_ward_pattern('NO_ACCENTED'), address_key)
 
         # Suy ward_keyword ra ward_key
-        ward_key = next((k for k, v in DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED.items() if ward_keyword and ward_keyword in [kw for kw in v['wardKeywords']]), None)
+        ward_key = DICT_UNIQUE_WARD_KEYWORD_NO_ACCENTED.get(ward_keyword)
 
         # Suy ward_key ra province_key
         province_key = DICT_UNIQUE_WARD_PROVINCE_NO_ACCENTED.get(ward_key, {}).get('provinceKey')
@@ -82,13 +283,18 @@ def parse_address_from_2025(address: str, keep_street :bool=True, level: int=2)
         if province_key:
             DICT_WARD = DICT_PROVINCE_WARD_NO_ACCENTED.get(province_key) # Không dấu
 
+        if recorder:
+            recorder.record(DATASET, 'unique_ward_no_accented', start, province_key)
+
 
     # 3rd attempt: Nếu không tìm được province_keyword thì tìm ward_keyword (ACCENTED), đây là những ward mà tên của nó là duy nhất, có thể suy ra được province
     if not province_key:
-        ward_keyword = next((m.group() for m in reversed(list(PATTERN_UNIQUE_WARD_PROVINCE_ACCENTED.finditer(address_key_accented)))), None)
+        if recorder:
+            start = perf_counter()
+        ward_keyword = find_last_keyword(get_unique_ward_pattern('ACCENTED'), address_key_accented)
 
         # Suy ward_keyword ra ward_key
-        ward_key = next((k for k, v in DICT_UNIQUE_WARD_PROVINCE_ACCENTED.items() if ward_keyword and ward_keyword in [kw for kw in v['wardKeywords']]), None)
+        ward_key = DICT_UNIQUE_WARD_KEYWORD_ACCENTED.get(ward_keyword)
 
         # Suy ward_key ra province_key
         province_key = DICT_UNIQUE_WARD_PROVINCE_ACCENTED.get(ward_key, {}).get('provinceKey')
@@ -96,15 +302,18 @@ def parse_address_from_2025(address: str, keep_street :bool=True, level: int=2)
         if province_key:
             DICT_WARD = DICT_PROVINCE_WARD_ACCENTED.get(province_key) # Có dấu
 
+        if recorder:
+            recorder.record(DATASET, 'unique_ward_accented', start, province_key)
+
 
     # Gán thông tin của province vào unit
     if province_key:
-        unit.province_key = province_key
-        unit.province = DICT_PROVINCE[province_key]['province']
-        unit.short_province = DICT_PROVINCE[province_key]['provinceShort']
-        unit.province_code = DICT_PROVINCE[province_key]['provinceCode']
-        unit.latitude = DICT_PROVINCE[province_key]['provinceLat']
-        unit.longitude = DICT_PROVINCE[province_key]['provinceLon']
+        unit_info['province_key'] = province_key
+        unit_info['province'] = DICT_PROVINCE[province_key]['province']
+        unit_info['short_province'] = DICT_PROVINCE[province_key]['provinceShort']
+        unit_info['province_code'] = DICT_PROVINCE[province_key]['provinceCode']
+        unit_info['latitude'] = DICT_PROVINCE[province_key]['provinceLat']
+        unit_info['longitude'] = DICT_PROVINCE[province_key]['provinceLon']
 
 
     # ----- PARSE WARD -----
@@ -116,52 +325,92 @@ def parse_address_from_2025(address: str, keep_street :bool=True, level: int=2)
         DICT_WARD_SHORT_ACCENTED = DICT_PROVINCE_WARD_SHORT_ACCENTED.get(province_key) # Các ward này khi không dấu mà có type thì không sao, nhưng khi không có type thì không phân biệt được
         
         # Tạo một hàm vì tái sử dụng nhiều lần
-        def find_ward(address_key, DICT_WARD):
+        def find_ward(address_key, tier):
+            if recorder:
+                start = perf_counter()
 
-            # Tìm ward_keyword
-            ward_keywords = sorted(sum([DICT_WARD[k]['wardKeywords'] for k in DICT_WARD], []), key=len, reverse=True)
-            PATTERN_WARD = re.compile('|'.join(ward_keywords), flags=re.IGNORECASE)
-            ward_keyword = next((m.group() for m in reversed(list(PATTERN_WARD.finditer(address_key)))), None)
+            # Tìm ward_keyword, pattern được compile một lần và dùng lại
+            PATTERN_WARD = get_ward_pattern(province_key, tier)
+            ward_keyword = find_last_keyword(PATTERN_WARD, address_key)
 
             # Suy ward_keyword ra ward_key
-            ward_key = next((k for k, v in DICT_WARD.items() if ward_keyword and ward_keyword in [kw for kw in v['wardKeywords']]), None)
+            ward_key = DICT_TIER_PROVINCE_WARD_KEYWORD[tier][province_key].get(ward_keyword)
+
+            if recorder:
+                recorder.record(DATASET, f'ward_{tier.lower()}', start, ward_key)
             return ward_keyword, ward_key
 
 
         # 1st attempt: Tìm không dấu trước vì nó là đa số
         if not ward_key and DICT_WARD_NO_ACCENTED:
-            ward_keyword, ward_key = find_ward(address_key, DICT_WARD_NO_ACCENTED)
+            ward_keyword, ward_key = find_ward(address_key, 'NO_ACCENTED')
             if ward_key:
                 DICT_WARD = DICT_WARD_NO_ACCENTED
 
         # 2nd attempt: Tìm có dấu
         if not ward_key and DICT_WARD_ACCENTED:
-            ward_keyword, ward_key = find_ward(address_key_accented, DICT_WARD_ACCENTED)
+            ward_keyword, ward_key = find_ward(address_key_accented, 'ACCENTED')
             if ward_key:
                 DICT_WARD = DICT_WARD_ACCENTED
 
         # 3rd attempt: Tìm có dấu với tên ngắn
         if not ward_key and DICT_WARD_SHORT_ACCENTED:
-            ward_keyword, ward_key = find_ward(address_key_accented, DICT_WARD_SHORT_ACCENTED)
+            ward_keyword, ward_key = find_ward(address_key_accented, 'SHORT_ACCENTED')
             if ward_key:
                 DICT_WARD = DICT_WARD_SHORT_ACCENTED
 
 
         # Gán thông tin ward vào unit
         if ward_key:
-            unit.ward_key = ward_key
-            unit.ward = DICT_WARD[ward_key]['ward']
-            unit.short_ward = DICT_WARD[ward_key]['wardShort']
-            unit.ward_type = DICT_WARD[ward_key]['wardType']
-            unit.ward_code = DICT_WARD[ward_key]['wardCode']
-            unit.latitude = DICT_WARD[ward_key]['wardLat']
-            unit.longitude = DICT_WARD[ward_key]['wardLon']
+            unit_info['ward_key'] = ward_key
+            unit_info['ward'] = DICT_WARD[ward_key]['ward']
+            unit_info['short_ward'] = DICT_WARD[ward_key]['wardShort']
+            unit_info['ward_type'] = DICT_WARD[ward_key]['wardType']
+            unit_info['ward_code'] = DICT_WARD[ward_key]['wardCode']
+            unit_info['latitude'] = DICT_WARD[ward_key]['wardLat']
+            unit_info['longitude'] = DICT_WARD[ward_key]['wardLon']
 
 
     # ----- STREET -----
-    if keep_street and (ward_key or address_key.count(',') >= 2):
-        street = extract_street(address=address, address_key=address_key, highest_level_keyword=ward_keyword)
-    if street:
-        unit.street = street
+    street_key = address_key if ward_key or address_key.count(',') >= 2 else None
+
+    unit = intern_admin_unit(**unit_info)
+
+    return unit, street_key, ward_keyword
+
+
+def parse_components_key(ward_keys: tuple, province_keys: tuple, level: int=2):
+    '''
+    Parse the separate fields of a 34-province unit, each field is matched against its own index only.
+
+    :param ward_keys: (key, key_accented) of the ward field, see `utils.normalize_address()`. None if the field is empty.
+    :param province_keys: (key, key_accented) of the province field.
+    :param level: [1,2]
+
+    :return: AdminUnit object, or None if a field is ambiguous and the joined address must be parsed instead.
+    '''
+
+    recorder = instrumentation.RECORDER
+    if recorder:
+        start = perf_counter()
+
+    unit = None
+    province_key = match_field(PATTERN_PROVINCE, DICT_PROVINCE_KEYWORD, province_keys[0]) if province_keys else None
+
+    if province_key and (level == 1 or not ward_keys):
+        unit = get_unit(province_key)
+
+    elif province_key:
+        # Thứ tự các bộ ward như parse_address_key()
+        for tier, ward_field_key in [('NO_ACCENTED', ward_keys[0]), ('ACCENTED', ward_keys[1]), ('SHORT_ACCENTED', ward_keys[1])]:
+            if not DICT_TIER_PROVINCE_WARD[tier].get(province_key):
+                continue
+            ward_key = match_field(get_ward_pattern(province_key, tier), DICT_TIER_PROVINCE_WARD_KEYWORD[tier][province_key], ward_field_key)
+            if ward_key:
+                unit = get_unit(province_key, ward_key)
+                break
+
+    if recorder:
+        recorder.record(DATASET, 'components', start, unit)
 
-    return unit
\ No newline at end of file
+    return unit
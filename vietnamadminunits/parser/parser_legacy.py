@@ -1,14 +1,90 @@
-import json
-from pathlib import Path
-import re
+from .utils import normalize_address, extract_street, replace_from_right, parse_addresses_by_key, iter_parsed_addresses
+from .objects import AdminUnit, intern_admin_unit
+from .patterns import PATTERN_REGISTRY, compile_keywords, collect_keywords, index_keywords, find_last_keyword, match_field
+from ..snapshot import load_data, dump_pattern
+from .. import instrumentation
+from time import perf_counter
+
+
+DATASET = 'LEGACY'
+
+# Các bộ ward theo tier, dùng làm key của PATTERN_REGISTRY
+WARD_TIERS = {
+    'NO_ACCENTED': 'DICT_PROVINCE_DISTRICT_WARD_NO_ACCENTED',
+    'ACCENTED': 'DICT_PROVINCE_DISTRICT_WARD_ACCENTED',
+    'SHORT_ACCENTED': 'DICT_PROVINCE_DISTRICT_WARD_SHORT_ACCENTED',
+}
+
+# Tạm ẩn một số phường của Huế vì nó gây nhiễu, nhầm từ khóa
+# Nếu có từ khóa này nó sẽ nhầm vào các quận của Huế trong trường hợp district là Thành phố Huế (cũ)
+TMP_HIDDEN_KEYWORDS = [
+    'phuongthuanhoa', # Quận Thuận Hóa, Thành phố Huế
+    'phuongthuybieu', # Thị xã Hương Thủy, Thành phố Huế
+    'phuongthuyvan', # Thị xã Hương Thủy, Thành phố Huế
+    'phuongthuyxuan', # Thị xã Hương Thủy, Thành phố Huế
+]
+PATTERN_TMP_HIDDEN = compile_keywords(TMP_HIDDEN_KEYWORDS)
+PATTERN_TMP_HIDDEN_THUANHOA = compile_keywords(TMP_HIDDEN_KEYWORDS + ['thuanhoa']) # VN chỉ có duy nhất một district là thuanhoa thôi
+
+
+def iter_pattern_sources(parser_data: dict):
+    '''
+    :param parser_data: Parser data.
+    :return: Generator of `(registry_key, DICT_UNIT, field)` for every pattern kept in PATTERN_REGISTRY.
+    '''
+    yield (DATASET, None, None, 'UNIQUE_DISTRICT'), parser_data['DICT_UNIQUE_DISTRICT_PROVINCE'], 'districtKeywords'
+
+    for province_key, DICT_DISTRICT in parser_data['DICT_PROVINCE_DISTRICT'].items():
+        yield (DATASET, province_key, None, 'DISTRICT'), DICT_DISTRICT, 'districtKeywords'
+
+    for province_key, DICT_DISTRICT_DIVIDED in parser_data['DICT_PROVINCE_DISTRICT_DIVIDED'].items():
+        yield (DATASET, province_key, None, 'DISTRICT_DIVIDED'), DICT_DISTRICT_DIVIDED, 'dividedDistrictKeywords'
+        for divided_district_key, v in DICT_DISTRICT_DIVIDED.items():
+            yield (DATASET, province_key, divided_district_key, 'DIVIDED_WARD'), v['districts'], 'wardKeywords'
+
+    for tier, name in WARD_TIERS.items():
+        for province_key, DICT_DISTRICT_WARD in parser_data[name].items():
+            for district_key, DICT_WARD in DICT_DISTRICT_WARD.items():
+                yield (DATASET, province_key, district_key, tier), DICT_WARD, 'wardKeywords'
+
+
+# Tăng khi build_data() thay đổi, snapshot cũ sẽ được build lại
+BUILD_VERSION = 1
+
+
+def build_data(parser_data: dict):
+    '''
+    Derive indexes and patterns from `parser_legacy.json`, the result is kept in a binary snapshot.
+
+    :param parser_data: Content of `parser_legacy.json`.
+    :return: dict
+    '''
+    # CREATE INDEXES: keyword -> key
+    parser_data['DICT_PROVINCE_KEYWORD'] = index_keywords(parser_data['DICT_PROVINCE'], 'provinceKeywords')
+    parser_data['DICT_UNIQUE_DISTRICT_KEYWORD'] = index_keywords(parser_data['DICT_UNIQUE_DISTRICT_PROVINCE'], 'districtKeywords')
+    parser_data['DICT_PROVINCE_DISTRICT_KEYWORD'] = {province_key: index_keywords(DICT_DISTRICT, 'districtKeywords') for province_key, DICT_DISTRICT in parser_data['DICT_PROVINCE_DISTRICT'].items()}
+    parser_data['DICT_PROVINCE_DISTRICT_DIVIDED_KEYWORD'] = {province_key: index_keywords(DICT_DISTRICT_DIVIDED, 'dividedDistrictKeywords') for province_key, DICT_DISTRICT_DIVIDED in parser_data['DICT_PROVINCE_DISTRICT_DIVIDED'].items()}
+    parser_data['DICT_PROVINCE_DISTRICT_DIVIDED_WARD_KEYWORD'] = { # ward_keyword -> district_key trong một divided district
+        province_key: {divided_district_key: index_keywords(v['districts'], 'wardKeywords') for divided_district_key, v in DICT_DISTRICT_DIVIDED.items()}
+        for province_key, DICT_DISTRICT_DIVIDED in parser_data['DICT_PROVINCE_DISTRICT_DIVIDED'].items()
+    }
+    parser_data['DICT_TIER_PROVINCE_DISTRICT_WARD_KEYWORD'] = {
+        tier: {
+            province_key: {district_key: index_keywords(DICT_WARD, 'wardKeywords') for district_key, DICT_WARD in DICT_DISTRICT_WARD.items()}
+            for province_key, DICT_DISTRICT_WARD in parser_data[name].items()
+        }
+        for tier, name in WARD_TIERS.items()
+    }
+
+    # CREATE PATTERNS
+    parser_data['PATTERN_PROVINCE'] = compile_keywords(collect_keywords(parser_data['DICT_PROVINCE'], 'provinceKeywords'))
+    parser_data['COMPILED_PATTERNS'] = {key: dump_pattern(compile_keywords(collect_keywords(DICT_UNIT, field))) for key, DICT_UNIT, field in iter_pattern_sources(parser_data)}
+
+    return parser_data
 
-from .utils import key_normalize, extract_street, replace_from_right, unicode_normalize
-from .objects import AdminUnit
 
 # LOAD DATA
-MODULE_DIR = Path(__file__).parent.parent
-with open(MODULE_DIR / 'data/parser_legacy.json', 'r') as f:
-    parser_data = json.load(f)
+parser_data = load_data('parser_legacy', build_data, version=BUILD_VERSION)
 
 DICT_PROVINCE = parser_data['DICT_PROVINCE']
 DICT_PROVINCE_DISTRICT = parser_data['DICT_PROVINCE_DISTRICT']
@@ -18,13 +94,134 @@ DICT_PROVINCE_DISTRICT_WARD_ACCENTED = parser_data['DICT_PROVINCE_DISTRICT_WARD_
 DICT_PROVINCE_DISTRICT_WARD_SHORT_ACCENTED = parser_data['DICT_PROVINCE_DISTRICT_WARD_SHORT_ACCENTED']
 DICT_PROVINCE_DISTRICT_DIVIDED = parser_data['DICT_PROVINCE_DISTRICT_DIVIDED']
 
+DICT_TIER_PROVINCE_DISTRICT_WARD = {tier: parser_data[name] for tier, name in WARD_TIERS.items()}
+
+
+# INDEXES: keyword -> key
+DICT_PROVINCE_KEYWORD = parser_data['DICT_PROVINCE_KEYWORD']
+DICT_UNIQUE_DISTRICT_KEYWORD = parser_data['DICT_UNIQUE_DISTRICT_KEYWORD']
+DICT_PROVINCE_DISTRICT_KEYWORD = parser_data['DICT_PROVINCE_DISTRICT_KEYWORD']
+DICT_PROVINCE_DISTRICT_DIVIDED_KEYWORD = parser_data['DICT_PROVINCE_DISTRICT_DIVIDED_KEYWORD']
+DICT_PROVINCE_DISTRICT_DIVIDED_WARD_KEYWORD = parser_data['DICT_PROVINCE_DISTRICT_DIVIDED_WARD_KEYWORD']
+DICT_TIER_PROVINCE_DISTRICT_WARD_KEYWORD = parser_data['DICT_TIER_PROVINCE_DISTRICT_WARD_KEYWORD']
+
+
+# PATTERNS: district/ward patterns được deserialize khi dùng lần đầu
+PATTERN_PROVINCE = parser_data['PATTERN_PROVINCE']
+PATTERN_REGISTRY.add_compiled(parser_data['COMPILED_PATTERNS'])
+
+
+def get_unique_district_pattern():
+    '''
+    Get the compiled pattern of districts whose name is unique in the country.
+    It is only used when no province is found, so it is compiled on first use.
+
+    :return: KeywordMatcher
+    '''
+    return PATTERN_REGISTRY.get((DATASET, None, None, 'UNIQUE_DISTRICT'), DICT_UNIQUE_DISTRICT_PROVINCE, 'districtKeywords')
+
+
+def get_district_pattern(province_key: str):
+    '''
+    Get the compiled district pattern of a province from the shared registry.
+
+    :param province_key: Province key.
+    :return: KeywordMatcher
+    '''
+    return PATTERN_REGISTRY.get((DATASET, province_key, None, 'DISTRICT'), DICT_PROVINCE_DISTRICT[province_key], 'districtKeywords')
+
+
+def get_divided_district_pattern(province_key: str):
+    '''
+    Get the compiled divided district pattern of a province from the shared registry.
+
+    :param province_key: Province key.
+    :return: KeywordMatcher
+    '''
+    return PATTERN_REGISTRY.get((DATASET, province_key, None, 'DISTRICT_DIVIDED'), DICT_PROVINCE_DISTRICT_DIVIDED[province_key], 'dividedDistrictKeywords')
+
+
+def get_divided_ward_pattern(province_key: str, divided_district_key: str):
+    '''
+    Get the compiled ward pattern used to choose a district of a divided district.
 
-# CREATE PATTERNS
-province_keywords = sorted(sum([DICT_PROVINCE[k]['provinceKeywords'] for k in DICT_PROVINCE], []), key=len, reverse=True)
-PATTERN_PROVINCE = re.compile('|'.join(province_keywords), flags=re.IGNORECASE)
+    :param province_key: Province key.
+    :param divided_district_key: Divided district key.
+    :return: KeywordMatcher
+    '''
+    DICT_DISTRICT_WARD = DICT_PROVINCE_DISTRICT_DIVIDED[province_key][divided_district_key]['districts']
+    return PATTERN_REGISTRY.get((DATASET, province_key, divided_district_key, 'DIVIDED_WARD'), DICT_DISTRICT_WARD, 'wardKeywords')
 
-unique_district_keys = sorted(sum([DICT_UNIQUE_DISTRICT_PROVINCE[k]['districtKeywords'] for k in DICT_UNIQUE_DISTRICT_PROVINCE], []), key=len, reverse=True)
-PATTERN_UNIQUE_DISTRICT = re.compile('|'.join(unique_district_keys), flags=re.IGNORECASE)
+
+def get_ward_pattern(province_key: str, district_key: str, tier: str):
+    '''
+    Get the compiled ward pattern of a district from the shared registry.
+
+    :param province_key: Province key.
+    :param district_key: District key.
+    :param tier: `'NO_ACCENTED'`, `'ACCENTED'` or `'SHORT_ACCENTED'`.
+    :return: KeywordMatcher
+    '''
+    DICT_WARD = DICT_TIER_PROVINCE_DISTRICT_WARD[tier][province_key][district_key]
+    return PATTERN_REGISTRY.get((DATASET, province_key, district_key, tier), DICT_WARD, 'wardKeywords')
+
+
+def warmup():
+    '''
+    Compile all district and ward patterns ahead of the first call.
+    '''
+    for key, DICT_UNIT, field in iter_pattern_sources(parser_data):
+        PATTERN_REGISTRY.get(key, DICT_UNIT, field)
+
+
+def get_unit(province_key: str, district_key: str=None, ward_key: str=None) -> AdminUnit:
+    '''
+    Build the AdminUnit of known keys without parsing, the same object as `parse_address_legacy()` of that unit.
+
+    :param province_key: Key in `DICT_PROVINCE`.
+    :param district_key: Key in `DICT_PROVINCE_DISTRICT[province_key]`, or None for level 1.
+    :param ward_key: Key of the ward in that district, or None for level 2.
+
+    :return: AdminUnit object, or None if a key is unknown.
+    '''
+    province = DICT_PROVINCE.get(province_key)
+    if not province:
+        return None
+    unit_info = {
+        'province_key': province_key,
+        'province': province['province'],
+        'short_province': province['provinceShort'],
+        'province_code': province['provinceCode'],
+        'latitude': province['provinceLat'],
+        'longitude': province['provinceLon'],
+    }
+
+    if district_key:
+        district = DICT_PROVINCE_DISTRICT[province_key].get(district_key)
+        if not district:
+            return None
+        unit_info['district_key'] = district_key
+        unit_info['district'] = district['district']
+        unit_info['short_district'] = district['districtShort']
+        unit_info['district_type'] = district['districtType']
+        unit_info['district_code'] = district['districtCode']
+        unit_info['latitude'] = district['districtLat']
+        unit_info['longitude'] = district['districtLon']
+
+        if ward_key:
+            # Ward trùng key khi bỏ dấu nằm trong bộ có dấu
+            ward = DICT_PROVINCE_DISTRICT_WARD_NO_ACCENTED.get(province_key, {}).get(district_key, {}).get(ward_key) or DICT_PROVINCE_DISTRICT_WARD_ACCENTED.get(province_key, {}).get(district_key, {}).get(ward_key)
+            if not ward:
+                return None
+            unit_info['ward_key'] = ward_key
+            unit_info['ward'] = ward['ward']
+            unit_info['short_ward'] = ward['wardShort']
+            unit_info['ward_type'] = ward['wardType']
+            unit_info['ward_code'] = ward['wardCode']
+            unit_info['latitude'] = ward['wardLat']
+            unit_info['longitude'] = ward['wardLon']
+
+    return intern_admin_unit(show_district=True, **unit_info)
 
 
 # MAIN FUNCTION
@@ -42,18 +239,88 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
     if level not in [1, 2, 3]:
         raise ValueError('Level must be 1, 2, or 3')
 
-    unit = AdminUnit(show_district=True)
+    recorder = instrumentation.RECORDER
+    if recorder:
+        start = perf_counter()
+
+    raw_address = address
+    address, address_key, address_key_accented = normalize_address(address)
+    if recorder:
+        recorder.record(DATASET, 'normalize', start)
+
+    unit, street_key, ward_keyword = parse_address_key(address_key, address_key_accented, level=level)
+
+    # ----- STREET -----
+    if keep_street and street_key is not None:
+        if recorder:
+            street_start = perf_counter()
+        street = extract_street(address=address, address_key=street_key, highest_level_keyword=ward_keyword)
+        if recorder:
+            recorder.record(DATASET, 'street', street_start, street)
+        if street:
+            unit = unit.with_street(street)
+
+    if recorder:
+        recorder.record_address(DATASET, raw_address, start)
+
+    return unit
 
-    address = unicode_normalize(address)
-    address_key = key_normalize(address, keep=[','])
-    address_key_accented = key_normalize(address, keep=[','], decode=False)
+
+def parse_addresses_legacy(addresses, keep_street :bool=True, level :int=3) -> list:
+    '''
+    Parse many 63-province addresses, duplicated addresses are parsed only once.
+
+    :param addresses: Iterable of addresses.
+    :param keep_street: boolean.
+    :param level: [1,2,3]
+
+    :return: List of AdminUnit objects, in the same order as addresses.
+    '''
+
+    if level not in [1, 2, 3]:
+        raise ValueError('Level must be 1, 2, or 3')
+
+    return parse_addresses_by_key(addresses, parse_address_key, keep_street=keep_street, level=level, dataset=DATASET)
+
+
+def iter_addresses_legacy(addresses, keep_street :bool=True, level :int=3):
+    '''
+    Same as `parse_addresses_legacy()` without one AdminUnit per address, for columnar output.
+
+    :param addresses: Iterable of addresses.
+    :param keep_street: boolean.
+    :param level: [1,2,3]
+
+    :return: Generator of (AdminUnit, street), see `iter_parsed_addresses()`.
+    '''
+
+    if level not in [1, 2, 3]:
+        raise ValueError('Level must be 1, 2, or 3')
+
+    return iter_parsed_addresses(addresses, parse_address_key, keep_street=keep_street, level=level, dataset=DATASET)
+
+
+def parse_address_key(address_key: str, address_key_accented: str, level: int=3):
+    '''
+    Parse the normalized keys of a 63-province address, except the street.
+    The result only depends on the keys, so it can be shared between addresses having the same keys.
+
+    :param address_key: Address key without accents, see `utils.normalize_address()`.
+    :param address_key_accented: Address key with accents.
+    :param level: [1,2,3]
+
+    :return: (AdminUnit, street_key, ward_keyword). street_key is the address key left for `extract_street()`, None if the address has no street.
+    '''
+
+    unit_info = {} # Thuộc tính của unit, AdminUnit là immutable nên tạo ở cuối
 
     district_key = None
     ward_key = None
     ward_keyword = None
-    street = None
     tmp_hidden_keyword = None
 
+    recorder = instrumentation.RECORDER
+
 
     # ----- PARSE PROVINCE -----
 
@@ -64,23 +331,30 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
     
 
     # 1st attempt: Tìm province_keyword
-    province_keyword = next((m.group() for m in reversed(list(PATTERN_PROVINCE.finditer(address_key)))), None)
+    if recorder:
+        start = perf_counter()
+    province_keyword = find_last_keyword(PATTERN_PROVINCE, address_key)
 
     # Suy province_keyword ra province_key
-    province_key = next((k for k, v in DICT_PROVINCE.items() if province_keyword and province_keyword in [kw for kw in v['provinceKeywords']]), None)
+    province_key = DICT_PROVINCE_KEYWORD.get(province_keyword)
 
     # Nếu tìm ra province_keyword thì lặp tức xóa nó khỏi địa chỉ để tránh các level sau bắt nhầm từ khóa
     if province_keyword:
         address_key_accented = replace_from_right(text=address_key, old=province_keyword, new='', for_text=address_key_accented) # Ưu tiên address_key_accented trước vì address_key là tham số
         address_key = replace_from_right(text=address_key, old=province_keyword, new='')
 
+    if recorder:
+        recorder.record(DATASET, 'province', start, province_key)
+
     
     # 2nd attempt: Nếu không tìm được province_keyword thì tìm district_keyword, đây là những district mà tên của nó là duy nhất, có thể suy ra được province.
     if not province_key:
-        district_keyword = next((m.group() for m in reversed(list(PATTERN_UNIQUE_DISTRICT.finditer(address_key)))), None)
+        if recorder:
+            start = perf_counter()
+        district_keyword = find_last_keyword(get_unique_district_pattern(), address_key)
 
         # Suy district_keyword ra district_key
-        district_key = next((k for k, v in DICT_UNIQUE_DISTRICT_PROVINCE.items() if district_keyword and district_keyword in [kw for kw in v['districtKeywords']]), None)
+        district_key = DICT_UNIQUE_DISTRICT_KEYWORD.get(district_keyword)
 
         # Suy district_key ra province_key
         province_key = DICT_UNIQUE_DISTRICT_PROVINCE.get(district_key, {}).get('provinceKey')
@@ -90,15 +364,18 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
             address_key_accented = replace_from_right(text=address_key, old=district_keyword, new='', for_text=address_key_accented)
             address_key = replace_from_right(text=address_key, old=district_keyword, new='')
 
+        if recorder:
+            recorder.record(DATASET, 'unique_district', start, province_key)
+
         
     # Gán thông tin của province vào unit
     if province_key:
-        unit.province_key = province_key
-        unit.province = DICT_PROVINCE[province_key]['province']
-        unit.short_province = DICT_PROVINCE[province_key]['provinceShort']
-        unit.province_code = DICT_PROVINCE[province_key]['provinceCode']
-        unit.latitude = DICT_PROVINCE[province_key]['provinceLat']
-        unit.longitude = DICT_PROVINCE[province_key]['provinceLon']
+        unit_info['province_key'] = province_key
+        unit_info['province'] = DICT_PROVINCE[province_key]['province']
+        unit_info['short_province'] = DICT_PROVINCE[province_key]['provinceShort']
+        unit_info['province_code'] = DICT_PROVINCE[province_key]['provinceCode']
+        unit_info['latitude'] = DICT_PROVINCE[province_key]['provinceLat']
+        unit_info['longitude'] = DICT_PROVINCE[province_key]['provinceLon']
 
 
     # ----- PARSE DISTRICT -----
@@ -106,37 +383,36 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
         
         if province_key == 'thanhphohue':
             # Tạm ẩn một số phường vì nó gây nhiễu, nhầm từ khóa
-            tmp_hidden_keywords = [ # Nếu có từ khóa này nó sẽ nhầm vào các quận của Huế trong trường hợp district là Thành phố Huế (cũ)
-                'phuongthuanhoa', # Quận Thuận Hóa, Thành phố Huế
-                'phuongthuybieu', # Thị xã Hương Thủy, Thành phố Huế
-                'phuongthuyvan', # Thị xã Hương Thủy, Thành phố Huế
-                'phuongthuyxuan', # Thị xã Hương Thủy, Thành phố Huế
-            ]
             if any(word in address_key_accented for word in ['thuậnhòa', 'thuậnhoà']): # Quận Thuận Hóa, Thành phố Huế
-                tmp_hidden_keywords.append('thuanhoa') # VN chỉ có duy nhất một district là thuanhoa thôi
+                PATTERN_HIDDEN = PATTERN_TMP_HIDDEN_THUANHOA
+            else:
+                PATTERN_HIDDEN = PATTERN_TMP_HIDDEN
 
-            PATTERN_TMP_HIDDEN = re.compile('|'.join(re.escape(k) for k in tmp_hidden_keywords), flags=re.IGNORECASE)
-            tmp_hidden_keyword = next((m.group() for m in list(PATTERN_TMP_HIDDEN.finditer(address_key))), None) # No need to reverse because it is a ward keyword
+            tmp_hidden_keyword = PATTERN_HIDDEN.find_first(address_key) # No need to reverse because it is a ward keyword
             if tmp_hidden_keyword:
                 address_key = address_key.replace(tmp_hidden_keyword, 'TMP_HIDDEN_KEYWORD')
 
         # 1st attempt: Bắt đầu một cách đơn giản nhất cho phần lớn district
         DICT_DISTRICT = DICT_PROVINCE_DISTRICT[province_key]
         if not district_key:
+            if recorder:
+                start = perf_counter()
 
             # Tìm district_keyword
-            district_keywords = sorted(sum([DICT_DISTRICT[k]['districtKeywords'] for k in DICT_DISTRICT], []), key=len, reverse=True)
-            PATTERN_DISTRICT = re.compile('|'.join(re.escape(k) for k in district_keywords), flags=re.IGNORECASE)
-            district_keyword = next((m.group() for m in reversed(list(PATTERN_DISTRICT.finditer(address_key)))), None)
+            PATTERN_DISTRICT = get_district_pattern(province_key)
+            district_keyword = find_last_keyword(PATTERN_DISTRICT, address_key)
 
             # Suy district_keyword ra district_key
-            district_key = next((k for k, v in DICT_DISTRICT.items() if district_keyword and district_keyword in [kw for kw in v['districtKeywords']]), None)
+            district_key = DICT_PROVINCE_DISTRICT_KEYWORD[province_key].get(district_keyword)
 
             # Nếu tìm ra district_keyword thì lặp tức xóa nó khỏi địa chỉ để tránh level sau bắt nhầm từ khóa
             if district_keyword:
                 address_key_accented = replace_from_right(text=address_key, old=district_keyword, new='', for_text=address_key_accented)
                 address_key = replace_from_right(text=address_key, old=district_keyword, new='')
 
+            if recorder:
+                recorder.record(DATASET, 'district', start, district_key)
+
             
         # 2nd attempt: Trường hợp không tìm được district_keyword vì tên cũ không còn trong bản mới nhất, district cũ bị chia thành 2 district mới.
         # Lưu ý: Nếu để phần này ở trên sẽ bị sai với 'Xã Thạch Hạ, Thành Phố Hà Tĩnh, Hà Tĩnh'. Nó bắt trúng 'thachha' của ward mà nhầm của district
@@ -145,10 +421,11 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
             
             # Tìm divided_district_key
             if DICT_DISTRICT_DIVIDED:
-                divided_district_keywords = sorted(sum([DICT_DISTRICT_DIVIDED[k]['dividedDistrictKeywords'] for k in DICT_DISTRICT_DIVIDED], []), key=len, reverse=True)
-                PATTERN_DISTRICT_DIVIDED = re.compile('|'.join(re.escape(k) for k in divided_district_keywords), flags=re.IGNORECASE)
-                divided_district_keyword = next((m.group() for m in reversed(list(PATTERN_DISTRICT_DIVIDED.finditer(address_key)))), None)
-                divided_district_key = next((k for k, v in DICT_DISTRICT_DIVIDED.items() if divided_district_keyword and divided_district_keyword in [kw for kw in v['dividedDistrictKeywords']]), None)
+                if recorder:
+                    start = perf_counter()
+                PATTERN_DISTRICT_DIVIDED = get_divided_district_pattern(province_key)
+                divided_district_keyword = find_last_keyword(PATTERN_DISTRICT_DIVIDED, address_key)
+                divided_district_key = DICT_PROVINCE_DISTRICT_DIVIDED_KEYWORD[province_key].get(divided_district_keyword)
 
                 # Nếu tìm ra divided_district_keyword thì lặp tức xóa nó khỏi địa chỉ để tránh level sau bắt nhầm từ khóa
                 if divided_district_key:
@@ -162,20 +439,24 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
 
                     # Nếu có divided_district_key, dựa vào ward_keyword để chọn district_key
                     DICT_DISTRICT_WARD = DICT_DISTRICT_DIVIDED[divided_district_key]['districts']
-                    ward_keywords = sorted(sum([DICT_DISTRICT_WARD[k]['wardKeywords'] for k in DICT_DISTRICT_WARD], []), key=len, reverse=True)
-                    PATTERN_WARD = re.compile('|'.join(ward_keywords), flags=re.IGNORECASE)
-                    ward_keyword = next((m.group() for m in reversed(list(PATTERN_WARD.finditer(address_key)))), None)
-                    district_key = next((k for k, v in DICT_DISTRICT_WARD.items() if ward_keyword and ward_keyword in [kw for kw in v['wardKeywords']]), None)
+                    PATTERN_WARD = get_divided_ward_pattern(province_key, divided_district_key)
+                    ward_keyword = find_last_keyword(PATTERN_WARD, address_key)
+                    district_key = DICT_PROVINCE_DISTRICT_DIVIDED_WARD_KEYWORD[province_key][divided_district_key].get(ward_keyword)
                     
                     # Nếu không có ward, chọn district mặc định
                     if not district_key:
                         district_key = next((k for k in DICT_DISTRICT_WARD if DICT_DISTRICT_WARD[k]['districtDefault'] == True), None)
 
+                if recorder:
+                    recorder.record(DATASET, 'divided_district', start, district_key)
+
 
         # Xử lý các case đặc biệt:
         # District vẫn còn nhưng vài ward bị đem wa district khác
         # District có tên ngắn bị trùng, chỉ khác type
         elif district_key in DICT_DISTRICT_DIVIDED:
+            if recorder:
+                start = perf_counter()
             
             # Đưa giá trị của district_key cho divided_district_key
             divided_district_key = district_key
@@ -188,25 +469,27 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
 
             # Dựa vào ward_keyword để chọn district_key
             DICT_DISTRICT_WARD = DICT_DISTRICT_DIVIDED[divided_district_key]['districts']
-            ward_keywords = sorted(sum([DICT_DISTRICT_WARD[k]['wardKeywords'] for k in DICT_DISTRICT_WARD], []), key=len, reverse=True)
-            PATTERN_WARD = re.compile('|'.join(ward_keywords), flags=re.IGNORECASE)
-            ward_keyword = next((m.group() for m in reversed(list(PATTERN_WARD.finditer(address_key)))), None)
-            district_key = next((k for k, v in DICT_DISTRICT_WARD.items() if ward_keyword and ward_keyword in [kw for kw in v['wardKeywords']]), None)
+            PATTERN_WARD = get_divided_ward_pattern(province_key, divided_district_key)
+            ward_keyword = find_last_keyword(PATTERN_WARD, address_key)
+            district_key = DICT_PROVINCE_DISTRICT_DIVIDED_WARD_KEYWORD[province_key][divided_district_key].get(ward_keyword)
 
             # Nếu không có ward, chọn district mặc định
             if not district_key:
                 district_key = next((k for k in DICT_DISTRICT_WARD if DICT_DISTRICT_WARD[k]['districtDefault'] == True), None)
 
+            if recorder:
+                recorder.record(DATASET, 'divided_district_ward', start, ward_keyword)
+
 
         # Gán thông tin của district vào unit
         if district_key:
-            unit.district_key = district_key
-            unit.district = DICT_DISTRICT[district_key]['district']
-            unit.short_district = DICT_DISTRICT[district_key]['districtShort']
-            unit.district_type = DICT_DISTRICT[district_key]['districtType']
-            unit.district_code = DICT_DISTRICT[district_key]['districtCode']
-            unit.latitude = DICT_DISTRICT[district_key]['districtLat']
-            unit.longitude = DICT_DISTRICT[district_key]['districtLon']
+            unit_info['district_key'] = district_key
+            unit_info['district'] = DICT_DISTRICT[district_key]['district']
+            unit_info['short_district'] = DICT_DISTRICT[district_key]['districtShort']
+            unit_info['district_type'] = DICT_DISTRICT[district_key]['districtType']
+            unit_info['district_code'] = DICT_DISTRICT[district_key]['districtCode']
+            unit_info['latitude'] = DICT_DISTRICT[district_key]['districtLat']
+            unit_info['longitude'] = DICT_DISTRICT[district_key]['districtLon']
 
 
     # ----- PARSE WARD -----
@@ -223,54 +506,106 @@ def parse_address_legacy(address: str, keep_street :bool=True, level :int=3) ->
         DICT_WARD_SHORT_ACCENTED = DICT_PROVINCE_DISTRICT_WARD_SHORT_ACCENTED.get(province_key, {}).get(district_key) # Các ward này khi không dấu mà có type thì không sao, nhưng khi không có type thì không phân biệt được, ví dụ: Thị trấn Ba Tơ và Xã Ba Tô
 
         # Tạo một hàm vì tái sử dụng nhiều lần
-        def find_ward(address_key, DICT_WARD):
+        def find_ward(address_key, tier):
+            if recorder:
+                start = perf_counter()
 
-            # Tìm ward_keyword
-            ward_keywords = sorted(sum([DICT_WARD[k]['wardKeywords'] for k in DICT_WARD], []), key=len, reverse=True)
-            PATTERN_WARD = re.compile('|'.join(ward_keywords), flags=re.IGNORECASE)
-            ward_keyword = next((m.group() for m in reversed(list(PATTERN_WARD.finditer(address_key)))), None)
+            # Tìm ward_keyword, pattern được compile một lần và dùng lại
+            PATTERN_WARD = get_ward_pattern(province_key, district_key, tier)
+            ward_keyword = find_last_keyword(PATTERN_WARD, address_key)
 
             # Suy ward_keyword ra ward_key
-            ward_key = next((k for k, v in DICT_WARD.items() if ward_keyword and ward_keyword in [kw for kw in v['wardKeywords']]), None)
+            ward_key = DICT_TIER_PROVINCE_DISTRICT_WARD_KEYWORD[tier][province_key][district_key].get(ward_keyword)
+
+            if recorder:
+                recorder.record(DATASET, f'ward_{tier.lower()}', start, ward_key)
             return ward_keyword, ward_key
         
 
         # 1st attempt: Tìm không dấu trước vì nó là đa số
         if DICT_WARD_NO_ACCENTED:
-            ward_keyword, ward_key = find_ward(address_key=address_key, DICT_WARD=DICT_WARD_NO_ACCENTED)
+            ward_keyword, ward_key = find_ward(address_key=address_key, tier='NO_ACCENTED')
             if ward_key:
                 DICT_WARD = DICT_WARD_NO_ACCENTED
 
         # 2nd attempt: Tìm có dấu
         if not ward_key and DICT_WARD_ACCENTED:
-            ward_keyword, ward_key = find_ward(address_key=address_key_accented, DICT_WARD=DICT_WARD_ACCENTED)
+            ward_keyword, ward_key = find_ward(address_key=address_key_accented, tier='ACCENTED')
             if ward_key:
                 DICT_WARD = DICT_WARD_ACCENTED
 
         # 3rd attempt: Tìm có dấu với tên ngắn
         if not ward_key and DICT_WARD_SHORT_ACCENTED:
-            ward_keyword, ward_key = find_ward(address_key=address_key_accented, DICT_WARD=DICT_WARD_SHORT_ACCENTED)
+            ward_keyword, ward_key = find_ward(address_key=address_key_accented, tier='SHORT_ACCENTED')
             if ward_key:
                 DICT_WARD = DICT_WARD_SHORT_ACCENTED
 
 
         # Gán thông tin ward vào unit
         if ward_key:
-            unit.ward_key = ward_key
-            unit.ward = DICT_WARD[ward_key]['ward']
-            unit.short_ward = DICT_WARD[ward_key]['wardShort']
-            unit.ward_type = DICT_WARD[ward_key]['wardType']
-            unit.ward_code = DICT_WARD[ward_key]['wardCode']
-            unit.latitude = DICT_WARD[ward_key]['wardLat']
-            unit.longitude = DICT_WARD[ward_key]['wardLon']
+            unit_info['ward_key'] = ward_key
+            unit_info['ward'] = DICT_WARD[ward_key]['ward']
+            unit_info['short_ward'] = DICT_WARD[ward_key]['wardShort']
+            unit_info['ward_type'] = DICT_WARD[ward_key]['wardType']
+            unit_info['ward_code'] = DICT_WARD[ward_key]['wardCode']
+            unit_info['latitude'] = DICT_WARD[ward_key]['wardLat']
+            unit_info['longitude'] = DICT_WARD[ward_key]['wardLon']
 
 
     # ----- STREET -----
     special_zone = ['huyenbachlongvi', 'huyenconco', 'huyenhoangsa', 'huyenlyson', 'huyencondao'] # Mấy cái đảo thì không có ward
 
-    if keep_street and (ward_key or (address_key.count(',') >= 3) or (district_key in special_zone)):
-        street = extract_street(address=address, address_key=address_key, highest_level_keyword=ward_keyword)
-    if street:
-        unit.street = street
+    street_key = address_key if ward_key or (address_key.count(',') >= 3) or (district_key in special_zone) else None
+
+    unit = intern_admin_unit(show_district=True, **unit_info)
+
+    return unit, street_key, ward_keyword
+
+
+def parse_components_key(ward_keys: tuple, district_keys: tuple, province_keys: tuple, level: int=3):
+    '''
+    Parse the separate fields of a 63-province unit, each field is matched against its own index only.
+
+    :param ward_keys: (key, key_accented) of the ward field, see `utils.normalize_address()`. None if the field is empty.
+    :param district_keys: (key, key_accented) of the district field.
+    :param province_keys: (key, key_accented) of the province field.
+    :param level: [1,2,3]
+
+    :return: AdminUnit object, or None if a field is ambiguous and the joined address must be parsed instead.
+    '''
+
+    recorder = instrumentation.RECORDER
+    if recorder:
+        start = perf_counter()
+
+    unit = None
+    province_key = match_field(PATTERN_PROVINCE, DICT_PROVINCE_KEYWORD, province_keys[0]) if province_keys else None
+    district_key = None
+
+    if province_key and (level == 1 or not (district_keys or ward_keys)):
+        unit = get_unit(province_key)
+
+    # Ward không có district thì để parser tìm trên cả địa chỉ
+    elif province_key and district_keys:
+        district_key = match_field(get_district_pattern(province_key), DICT_PROVINCE_DISTRICT_KEYWORD[province_key], district_keys[0])
+        # District bị chia cần ward để chọn district, tên cũ không nằm trong index
+        if district_key in DICT_PROVINCE_DISTRICT_DIVIDED.get(province_key, {}):
+            district_key = None
+
+    if district_key and (level == 2 or not ward_keys):
+        unit = get_unit(province_key, district_key)
+
+    elif district_key:
+        # Thứ tự các bộ ward như parse_address_key()
+        for tier, ward_field_key in [('NO_ACCENTED', ward_keys[0]), ('ACCENTED', ward_keys[1]), ('SHORT_ACCENTED', ward_keys[1])]:
+            if not DICT_TIER_PROVINCE_DISTRICT_WARD[tier].get(province_key, {}).get(district_key):
+                continue
+            ward_key = match_field(get_ward_pattern(province_key, district_key, tier), DICT_TIER_PROVINCE_DISTRICT_WARD_KEYWORD[tier][province_key][district_key], ward_field_key)
+            if ward_key:
+                unit = get_unit(province_key, district_key, ward_key)
+                break
+
+    if recorder:
+        recorder.record(DATASET, 'components', start, unit)
 
-    return unit
\ No newline at end of file
+    return unit
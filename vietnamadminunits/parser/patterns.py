@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from itertools import chain
+
+from .matcher import KeywordMatcher
+from ..snapshot import load_pattern
+
+
+def compile_keywords(keywords):
+    '''
+    Compile keywords to one matcher, the longest keyword wins at a position and case is ignored.
+
+    :param keywords: Iterable of keywords.
+    :return: KeywordMatcher
+    '''
+    return KeywordMatcher(keywords)
+
+
+def collect_keywords(DICT_UNIT, field):
+    '''
+    Flatten keywords of all units in a dictionary, keep dictionary order.
+
+    :param DICT_UNIT: Dictionary of units, eg: `{'phuongcaikhe': {'wardKeywords': [...]}}`.
+    :param field: Keyword field, eg: `'wardKeywords'`.
+    :return: list
+    '''
+    return list(chain.from_iterable(v[field] for v in DICT_UNIT.values()))
+
+
+def index_keywords(DICT_UNIT, field):
+    '''
+    Build a reverse index from keyword to unit key. If a keyword belongs to many units, the first unit wins.
+
+    :param DICT_UNIT: Dictionary of units, eg: `{'phuongcaikhe': {'wardKeywords': [...]}}`.
+    :param field: Keyword field, eg: `'wardKeywords'`.
+    :return: dict, eg: `{'phuongcaikhe': 'phuongcaikhe', 'caikhe': 'phuongcaikhe'}`.
+    '''
+    index = {}
+    for k, v in DICT_UNIT.items():
+        for keyword in v[field]:
+            index.setdefault(keyword, k)
+    return index
+
+
+def find_last_keyword(pattern, text):
+    '''
+    Find the rightmost keyword matched by a pattern.
+
+    :param pattern: KeywordMatcher
+    :param text: Address key.
+    :return: str or None
+    '''
+    return pattern.find_last(text)
+
+
+
+def match_field(pattern, DICT_KEYWORD: dict, field_key: str):
+    '''
+    Find the unit of a field holding one administrative unit, eg: a ward column.
+
+    :param pattern: KeywordMatcher of the units the field can hold.
+    :param DICT_KEYWORD: Index keyword -> key of the same units.
+    :param field_key: Key of the field, see `utils.normalize_address()`.
+    :return: key or None. None if the field is empty or holds several parts separated by commas.
+    '''
+    if not field_key or ',' in field_key:
+        return None
+    # Cả field là một keyword thì tra thẳng index, không cần pattern
+    return DICT_KEYWORD.get(field_key) or DICT_KEYWORD.get(find_last_keyword(pattern, field_key))
+
+class PatternRegistry:
+    '''
+    LRU registry of compiled keyword patterns (KeywordMatcher).
+
+    Key is `(dataset, province_key, district_key, tier)`, eg: `('LEGACY', 'thanhphohanoi', 'quanbadinh', 'NO_ACCENTED')`.
+    '''
+
+    def __init__(self, maxsize: int=2048):
+        self.maxsize = maxsize
+        self._patterns = OrderedDict()
+        self._compiled = {} # Pattern đã compile sẵn trong snapshot, dạng bytes
+
+    def add_compiled(self, compiled: dict):
+        '''
+        Register precompiled patterns from a snapshot, they are deserialized on first use.
+
+        :param compiled: dict, key -> output of `snapshot.dump_pattern()`.
+        '''
+        self._compiled.update(compiled)
+
+    def get(self, key: tuple, DICT_UNIT: dict, field: str):
+        '''
+        Get a compiled pattern, compile it from `DICT_UNIT` if it is not in the registry.
+
+        :param key: `(dataset, province_key, district_key, tier)`.
+        :param DICT_UNIT: Dictionary of units to collect keywords.
+        :param field: Keyword field.
+        :return: KeywordMatcher
+        '''
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            self._patterns.move_to_end(key)
+            return pattern
+
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            pattern = load_pattern(compiled)
+        else:
+            pattern = compile_keywords(collect_keywords(DICT_UNIT, field))
+        self._patterns[key] = pattern
+        if self.maxsize is not None:
+            while len(self._patterns) > self.maxsize:
+                self._patterns.popitem(last=False)
+        return pattern
+
+    def resize(self, maxsize: int):
+        '''
+        :param maxsize: Max number of patterns, `None` for unbounded.
+        '''
+        self.maxsize = maxsize
+        if maxsize is not None:
+            while len(self._patterns) > maxsize:
+                self._patterns.popitem(last=False)
+
+    def clear(self):
+        self._patterns.clear()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __contains__(self, key):
+        return key in self._patterns
+
+
+PATTERN_REGISTRY = PatternRegistry()
@@ -1,25 +1,64 @@
-from shapely.geometry import Polygon, Point
-from geopy.distance import distance
-from geopy.geocoders import ArcGIS
-from geopy.distance import geodesic
-
+from bisect import bisect_right
+from collections import OrderedDict
+from time import perf_counter
 from unidecode import unidecode
 import re
 import unicodedata
 
-geolocator = ArcGIS()
+# normalize_address được import từ đây bởi các parser
+from .normalizer import normalize_address, normalize_text, key_normalize_with_offsets
+from .. import instrumentation
+
+
+# Số entry tối đa của mỗi memo trong parse_addresses_by_key, để bộ nhớ không tăng theo số dòng
+BATCH_MEMO_SIZE = 65536
+
+
+# shapely, geopy và ArcGIS chỉ được import/khởi tạo khi cần, để import vietnamadminunits nhanh
+_geolocator = None
+
+
+def get_geolocator():
+    '''
+    :return: geopy.geocoders.ArcGIS, created on first use.
+    '''
+    global _geolocator
+    if _geolocator is None:
+        from geopy.geocoders import ArcGIS
+        _geolocator = ArcGIS()
+    return _geolocator
+
+
+def __getattr__(name):
+    # Giữ tương thích với `from vietnamadminunits.parser.utils import geolocator`
+    if name == 'geolocator':
+        return get_geolocator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_geo_location(address):
-    return geolocator.geocode(address)
+    return get_geolocator().geocode(address)
 
 
-def generate_square_polygon(center: tuple, area_km2: float):
+def geocode_arcgis(address: str):
+    '''
+    Geocode an address with ArcGIS, it is a network request.
+
+    :param address: str
+    :return: (latitude, longitude) or None if the address is not found.
+    '''
+    location = get_geo_location(address)
+    return (location.latitude, location.longitude) if location else None
+
+
+def compute_square_bounds(center: tuple, area_km2: float):
     '''
     :param center: (latitude, longitude)
     :param area_km2: float
-    :return: shapely.geometry.Polygon in (longitude, latitude) order
+    :return: (south, north, west, east) of a square around center
     '''
+    from geopy.distance import distance
+
     side_km = area_km2 ** 0.5
     half_side_km = side_km / 2
 
@@ -29,6 +68,19 @@ def generate_square_polygon(center: tuple, area_km2: float):
     east  = distance(kilometers=half_side_km).destination(center, 90).longitude
     west  = distance(kilometers=half_side_km).destination(center, 270).longitude
 
+    return south, north, west, east
+
+
+def generate_square_polygon(center: tuple, area_km2: float):
+    '''
+    :param center: (latitude, longitude)
+    :param area_km2: float
+    :return: shapely.geometry.Polygon in (longitude, latitude) order
+    '''
+    from shapely.geometry import Polygon
+
+    south, north, west, east = compute_square_bounds(center=center, area_km2=area_km2)
+
     # Theo thứ tự (lon, lat) nếu dùng GeoJSON hoặc shapely
     polygon_coords = [
         (west, south),
@@ -48,6 +100,8 @@ def check_point_in_polygon(point: tuple, polygon_center: tuple, polygon_area_km2
     :param polygon_area_km2: float
     :return: boolean
     '''
+    from shapely.geometry import Point
+
     polygon = generate_square_polygon(center=polygon_center, area_km2=polygon_area_km2)
     point = Point(point[1], point[0])
     return polygon.contains(point)
@@ -59,9 +113,53 @@ def find_nearest_point(a_point: tuple, list_of_b_points: list):
     :param list_of_b_points: list of tuples (latitude, longitude)
     :return: (latitude, longitude)
     '''
+    from geopy.distance import geodesic
+
     return min(list_of_b_points, key=lambda b: geodesic(a_point, b).meters)
 
 
+def check_points_in_bounds(latitudes, longitudes, bounds):
+    '''
+    Vectorized `check_point_in_polygon()` for square polygons, points on the edges are outside like `Polygon.contains()`.
+
+    :param latitudes: numpy array
+    :param longitudes: numpy array
+    :param bounds: numpy array of shape (n, 4), rows are (south, north, west, east) from `compute_square_bounds()`
+    :return: numpy array of booleans
+    '''
+    return (
+        (latitudes > bounds[:, 0]) & (latitudes < bounds[:, 1]) &
+        (longitudes > bounds[:, 2]) & (longitudes < bounds[:, 3])
+    )
+
+
+def approximate_geodesic_distances(latitudes_a, longitudes_a, latitudes_b, longitudes_b):
+    '''
+    Vectorized approximation of `geodesic()` on the WGS-84 ellipsoid, accurate to a few meters at the scale of a province.
+    It projects both points on the plane tangent at their mean latitude, using the meridional and prime vertical radii.
+
+    :param latitudes_a: numpy array
+    :param longitudes_a: numpy array
+    :param latitudes_b: numpy array
+    :param longitudes_b: numpy array
+    :return: numpy array of distances in meters
+    '''
+    import numpy as np
+
+    a = 6378137.0 # WGS-84
+    e2 = 6.69437999014e-3
+
+    lat_a, lon_a, lat_b, lon_b = map(np.radians, (latitudes_a, longitudes_a, latitudes_b, longitudes_b))
+    sin_lat = np.sin((lat_a + lat_b) / 2)
+    w = 1 - e2 * sin_lat ** 2
+    meridional_radius = a * (1 - e2) / w ** 1.5
+    prime_vertical_radius = a / np.sqrt(w)
+
+    dy = meridional_radius * (lat_b - lat_a)
+    dx = prime_vertical_radius * np.cos((lat_a + lat_b) / 2) * (lon_b - lon_a)
+    return np.hypot(dx, dy)
+
+
 def correct_typos(text):
     '''
     :param text: str
@@ -166,23 +264,96 @@ def extract_street(address: str, address_key: str, highest_level_keyword=None):
         street_key_part = address_key.split(',')[0].strip()
 
     # Chuẩn hóa để so sánh
-    address_norm = key_normalize(address)
+    address_norm, offsets = key_normalize_with_offsets(address)
     street_key_norm = key_normalize(street_key_part)
 
     # Tìm phần giao đầu (common prefix) giữa address_norm và street_key_norm
-    common_prefix = ''.join(
-        address_norm[i] for i in range(min(len(address_norm), len(street_key_norm)))
-        if address_norm[i] == street_key_norm[i]
-    )
+    common_prefix = ''.join(a for a, b in zip(address_norm, street_key_norm) if a == b)
 
-    # Dùng common_prefix để dò lại chuỗi gốc tương ứng trong address
-    match_result = ''
-    for char in address:
-        temp = match_result + char
-        if key_normalize(temp) == common_prefix[:len(key_normalize(temp))]:
-            match_result = temp
-        else:
+    # Độ dài phần đầu của address_norm khớp với common_prefix
+    matched_length = 0
+    for a, b in zip(address_norm, common_prefix):
+        if a != b:
             break
+        matched_length += 1
+
+    # Dùng offsets để dò lại chuỗi gốc tương ứng trong address: prefix dài nhất có key nằm trong phần khớp
+    match_result = address[:bisect_right(offsets, matched_length) - 1]
 
     # Xóa dấu phẩy & khoảng trắng cuối, chuẩn hóa lại chữ
-    return re.sub(r'[\s,.]+$', '', match_result).strip().title() if match_result else None
\ No newline at end of file
+    return re.sub(r'[\s,.]+$', '', match_result).strip().title() if match_result else None
+
+
+def store_memo(memo: OrderedDict, key, value):
+    '''
+    Store a value in a memo of `parse_addresses_by_key()`, the oldest entry is dropped past `BATCH_MEMO_SIZE`.
+
+    :return: value.
+    '''
+    memo[key] = value
+    if len(memo) > BATCH_MEMO_SIZE:
+        memo.popitem(last=False)
+    return value
+
+
+def iter_parsed_addresses(addresses, parse_address_key, keep_street: bool=True, level: int=None, dataset: str=None):
+    '''
+    Parse many addresses, each distinct address key is parsed only once.
+    Memos are bounded by `BATCH_MEMO_SIZE`, a duplicate seen after its entry was dropped is parsed again with the same result.
+
+    :param addresses: Iterable of addresses.
+    :param parse_address_key: `parse_address_key()` of a parser module.
+    :param keep_street: boolean.
+    :param level: Level passed to parse_address_key.
+    :param dataset: Name of the parser in instrumentation stats, eg: `'LEGACY'`.
+    :return: Generator of (AdminUnit, street), in the same order as addresses. The unit has no street and is shared by rows of the same address key, street is None if there is none.
+    '''
+    normalized_addresses = OrderedDict() # address -> (normalized_address, address_key, address_key_accented)
+    parsed_keys = OrderedDict() # (address_key, address_key_accented) -> (unit, street_key, ward_keyword)
+    streets = OrderedDict() # (normalized_address, address_key, address_key_accented) -> street, các address chỉ khác khoảng trắng dùng chung
+
+    recorder = instrumentation.RECORDER
+
+    for address in addresses:
+        normalized = normalized_addresses.get(address)
+        # Chỉ đo lần đầu gặp address, các dòng trùng lấy lại kết quả
+        measured = recorder and normalized is None
+        if measured:
+            start = perf_counter()
+
+        if normalized is None:
+            normalized = store_memo(normalized_addresses, address, normalize_address(address))
+            if measured:
+                recorder.record(dataset, 'normalize', start)
+        normalized_address, address_key, address_key_accented = normalized
+
+        key = (address_key, address_key_accented)
+        parsed = parsed_keys.get(key)
+        if parsed is None:
+            parsed = store_memo(parsed_keys, key, parse_address_key(address_key, address_key_accented, level=level))
+        parsed_unit, street_key, ward_keyword = parsed
+
+        street = None
+        if keep_street and street_key is not None:
+            street = streets.get(normalized, False)
+            if street is False:
+                if measured:
+                    street_start = perf_counter()
+                street = store_memo(streets, normalized, extract_street(address=normalized_address, address_key=street_key, highest_level_keyword=ward_keyword))
+                if measured:
+                    recorder.record(dataset, 'street', street_start, street)
+
+        if measured:
+            recorder.record_address(dataset, address, start)
+
+        yield parsed_unit, street or None
+
+
+def parse_addresses_by_key(addresses, parse_address_key, keep_street: bool=True, level: int=None, dataset: str=None):
+    '''
+    Parse many addresses, see `iter_parsed_addresses()`.
+
+    :return: List of AdminUnit objects, in the same order as addresses.
+    '''
+    # AdminUnit là immutable nên các dòng trùng key dùng chung một object, chỉ street là riêng
+    return [unit.with_street(street) if street else unit for unit, street in iter_parsed_addresses(addresses, parse_address_key, keep_street=keep_street, level=level, dataset=dataset)]
@@ -0,0 +1,165 @@
+import gc
+import hashlib
+import os
+import pickle
+import warnings
+from pathlib import Path
+
+
+MODULE_DIR = Path(__file__).parent
+DATA_DIR = MODULE_DIR / 'data'
+
+# Tăng version khi định dạng snapshot thay đổi (header, dump_pattern, ...). Thay đổi của một hàm build thì tăng version của builder đó
+SNAPSHOT_VERSION = 4
+SNAPSHOT_PROTOCOL = 4
+
+# Các snapshot đã cảnh báo không ghi được, mỗi process chỉ cảnh báo một lần
+_unwritable = set()
+
+
+def get_json_path(name: str):
+    return DATA_DIR / f'{name}.json'
+
+
+def get_cache_dir():
+    '''
+    :return: Directory of snapshots built at runtime: `$VIETNAMADMINUNITS_CACHE_DIR`, else `$XDG_CACHE_HOME/vietnamadminunits`, else `~/.cache/vietnamadminunits`.
+    '''
+    cache_dir = os.environ.get('VIETNAMADMINUNITS_CACHE_DIR')
+    if cache_dir:
+        return Path(cache_dir)
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'vietnamadminunits'
+
+
+def get_snapshot_path(name: str, directory=None):
+    '''
+    :param name: Dataset name, eg: `'parser_legacy'`.
+    :param directory: Directory of the snapshot. Default `get_cache_dir()`, snapshots shipped with the package are in `DATA_DIR`.
+    :return: Path
+    '''
+    return Path(directory or get_cache_dir()) / f'{name}.pickle'
+
+
+def get_header(checksum: str, version):
+    '''
+    :param checksum: Checksum of the JSON source.
+    :param version: Version of the build function, see `load_data()`.
+    :return: dict written before the data, a snapshot is used only if its header is equal.
+    '''
+    return {'version': SNAPSHOT_VERSION, 'build': version, 'checksum': checksum}
+
+
+def get_checksum(json_bytes: bytes):
+    '''
+    :param json_bytes: Content of the JSON source.
+    :return: Checksum written in the snapshot header.
+    '''
+    return hashlib.sha256(json_bytes).hexdigest()
+
+
+def read_snapshot(path: Path, header: dict):
+    '''
+    Read a snapshot if it is built from the same JSON source by the same build version.
+
+    :param path: Snapshot path.
+    :param header: Expected header, see `get_header()`.
+    :return: Built data, or None if the snapshot is missing or stale.
+    '''
+    gc_enabled = gc.isenabled()
+    try:
+        with open(path, 'rb') as f:
+            if pickle.load(f) != header:
+                return None
+
+            # Tắt gc khi load rất nhiều object nhỏ, nhanh hơn đáng kể
+            gc.disable()
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def write_snapshot(path: Path, header: dict, data: dict):
+    '''
+    Write a snapshot. The file is replaced atomically, so concurrent workers never read a partial file.
+
+    :param path: Snapshot path, its directory is created if needed.
+    :param header: Header, see `get_header()`.
+    :param data: Built data.
+    :return: Snapshot path, or None if the directory is not writable.
+    '''
+    import tempfile
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.stem}.', suffix='.tmp')
+    except OSError:
+        return None
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(header, f, protocol=SNAPSHOT_PROTOCOL)
+            pickle.dump(data, f, protocol=SNAPSHOT_PROTOCOL)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    return path
+
+
+def load_data(name: str, build, rebuild: bool=False, source: str=None, version=0, directory=None):
+    '''
+    Load module data from its binary snapshot. If the snapshot is missing or stale, build it from the JSON source and save it.
+
+    Snapshots shipped in the package data directory are only read. Snapshots built at runtime are written to the user cache directory, see `get_cache_dir()`,
+    a warning is issued if it is not writable and the data is then built again in every process.
+
+    :param name: Dataset name, eg: `'parser_legacy'` for `data/parser_legacy.json`.
+    :param build: Function that takes the parsed JSON and returns the data to keep in the snapshot.
+    :param rebuild: Ignore the existing snapshots.
+    :param source: Name of the JSON source if it is not name, eg: an index derived from `'parser_legacy'`.
+    :param version: Version of build, increase it when build changes. Any picklable value, eg: a tuple of the build parameters.
+    :param directory: Write the snapshot there instead of the cache directory, eg: `DATA_DIR` to ship it with the package.
+    :return: dict
+    '''
+    with open(get_json_path(source or name), 'rb') as f:
+        json_bytes = f.read()
+    header = get_header(get_checksum(json_bytes), version)
+
+    path = get_snapshot_path(name, directory)
+    if not rebuild:
+        for read_path in ([] if directory else [get_snapshot_path(name, DATA_DIR)]) + [path]:
+            data = read_snapshot(read_path, header)
+            if data is not None:
+                return data
+
+    import json
+    data = build(json.loads(json_bytes))
+    if write_snapshot(path, header, data) is None and path not in _unwritable:
+        _unwritable.add(path)
+        warnings.warn(f'Can not write the snapshot {path}, {name!r} will be built again in every process. Set VIETNAMADMINUNITS_CACHE_DIR to a writable directory.', RuntimeWarning, stacklevel=2)
+    return data
+
+
+def dump_pattern(pattern):
+    '''
+    Serialize a compiled pattern, it is only deserialized when the pattern is used.
+
+    :param pattern: KeywordMatcher
+    :return: bytes
+    '''
+    return pickle.dumps(pattern, protocol=SNAPSHOT_PROTOCOL)
+
+
+def load_pattern(pattern_bytes: bytes):
+    '''
+    :param pattern_bytes: Output of `dump_pattern()`.
+    :return: KeywordMatcher
+    '''
+    return pickle.loads(pattern_bytes)